@@ -0,0 +1,52 @@
+"""add fetch failure tracking to feed
+
+Revision ID: 1a6864b9cebd
+Revises: 5e964bd77ee7
+Create Date: 2026-10-18 10:03:17.552840
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "1a6864b9cebd"
+down_revision: Union[str, None] = "5e964bd77ee7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "feeds",
+        sa.Column(
+            "consecutive_failures", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+    op.add_column("feeds", sa.Column("last_error", sa.Text(), nullable=True))
+    op.add_column(
+        "feeds",
+        sa.Column("last_failure_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "feeds", sa.Column("next_retry_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column(
+        "feeds",
+        sa.Column(
+            "circuit_state", sa.String(16), nullable=False, server_default="closed"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("feeds", "circuit_state")
+    op.drop_column("feeds", "next_retry_at")
+    op.drop_column("feeds", "last_failure_at")
+    op.drop_column("feeds", "last_error")
+    op.drop_column("feeds", "consecutive_failures")
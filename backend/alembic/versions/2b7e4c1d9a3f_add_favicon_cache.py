@@ -0,0 +1,43 @@
+"""add favicon cache
+
+Revision ID: 2b7e4c1d9a3f
+Revises: fdbaeb2c66ec
+Create Date: 2026-10-18 17:46:03.512877
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2b7e4c1d9a3f"
+down_revision: Union[str, None] = "fdbaeb2c66ec"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "favicons",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("domain", sa.String(), nullable=False),
+        sa.Column("icon_url", sa.String(), nullable=True),
+        sa.Column("content_type", sa.String(), nullable=True),
+        sa.Column("content_hash", sa.String(64), nullable=True),
+        sa.Column("data", sa.LargeBinary(), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_favicons_id", "favicons", ["id"], unique=False)
+    op.create_index("ix_favicons_domain", "favicons", ["domain"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_favicons_domain", table_name="favicons")
+    op.drop_index("ix_favicons_id", table_name="favicons")
+    op.drop_table("favicons")
@@ -0,0 +1,38 @@
+"""add article timeline indexes
+
+Revision ID: 46a4f287c72d
+Revises: 5886b5dd2820
+Create Date: 2026-10-18 11:20:08.904512
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "46a4f287c72d"
+down_revision: Union[str, None] = "5886b5dd2820"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The composite index also serves plain published_at range scans
+    op.drop_index("ix_articles_published_at", table_name="articles")
+    op.create_index("ix_articles_published_at_id", "articles", ["published_at", "id"])
+    op.create_index(
+        "ix_articles_feed_id_published_at_id",
+        "articles",
+        ["feed_id", "published_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_articles_feed_id_published_at_id", table_name="articles")
+    op.drop_index("ix_articles_published_at_id", table_name="articles")
+    op.create_index("ix_articles_published_at", "articles", ["published_at"])
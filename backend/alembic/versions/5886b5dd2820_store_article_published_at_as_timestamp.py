@@ -0,0 +1,107 @@
+"""store article published_at as timestamp
+
+Revision ID: 5886b5dd2820
+Revises: 1a6864b9cebd
+Create Date: 2026-10-18 10:41:55.207316
+
+"""
+
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5886b5dd2820"
+down_revision: Union[str, None] = "1a6864b9cebd"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+articles = sa.table(
+    "articles",
+    sa.column("id", sa.Integer),
+    sa.column("pub_date", sa.String),
+    sa.column("published_at", sa.String),
+    sa.column("published_at_ts", sa.DateTime(timezone=True)),
+    sa.column("created_at", sa.DateTime),
+)
+
+
+def _parse(value):
+    """Parse the text timestamps older code stored (ISO 8601 or RFC 822)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "articles",
+        sa.Column("published_at_ts", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # Backfill in id order so memory stays bounded on large tables
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(
+                articles.c.id,
+                articles.c.published_at,
+                articles.c.pub_date,
+                articles.c.created_at,
+            )
+            .where(articles.c.id > last_id)
+            .order_by(articles.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        updates = [
+            {
+                "row_id": row.id,
+                "value": _parse(row.published_at)
+                or _parse(row.pub_date)
+                or row.created_at,
+            }
+            for row in rows
+        ]
+        connection.execute(
+            articles.update()
+            .where(articles.c.id == sa.bindparam("row_id"))
+            .values(published_at_ts=sa.bindparam("value")),
+            updates,
+        )
+        last_id = rows[-1].id
+
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.drop_column("published_at")
+        batch_op.alter_column("published_at_ts", new_column_name="published_at")
+    op.create_index("ix_articles_published_at", "articles", ["published_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_articles_published_at", table_name="articles")
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.alter_column(
+            "published_at",
+            type_=sa.String(),
+            existing_type=sa.DateTime(timezone=True),
+            postgresql_using="published_at::text",
+        )
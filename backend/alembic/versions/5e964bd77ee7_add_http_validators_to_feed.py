@@ -0,0 +1,33 @@
+"""add http validators to feed
+
+Revision ID: 5e964bd77ee7
+Revises: d32797f05ef7
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e964bd77ee7"
+down_revision: Union[str, None] = "d32797f05ef7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("feeds", sa.Column("etag", sa.String(), nullable=True))
+    op.add_column("feeds", sa.Column("last_modified", sa.String(), nullable=True))
+    op.add_column("feeds", sa.Column("content_hash", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("feeds", "content_hash")
+    op.drop_column("feeds", "last_modified")
+    op.drop_column("feeds", "etag")
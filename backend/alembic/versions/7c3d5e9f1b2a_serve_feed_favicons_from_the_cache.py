@@ -0,0 +1,33 @@
+"""serve feed favicons from the cache
+
+Revision ID: 7c3d5e9f1b2a
+Revises: 2b7e4c1d9a3f
+Create Date: 2026-10-18 21:12:40.218374
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c3d5e9f1b2a"
+down_revision: Union[str, None] = "2b7e4c1d9a3f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Point discovered feed icons at the cached icon endpoint."""
+    # The remote URLs are looked up again by the favicon cache on demand
+    op.execute(
+        "UPDATE feeds SET favicon = '/api/v1/feeds/' || id || '/icon' "
+        "WHERE favicon LIKE 'http://%' OR favicon LIKE 'https://%'"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The remote icon URLs are not kept on feeds any more
+    pass
@@ -0,0 +1,98 @@
+"""add article counters to feeds and folders
+
+Revision ID: c5587f5369f1
+Revises: 46a4f287c72d
+Create Date: 2026-10-18 14:05:27.604113
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5587f5369f1"
+down_revision: Union[str, None] = "46a4f287c72d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+feeds = sa.table(
+    "feeds",
+    sa.column("id", sa.Integer),
+    sa.column("folder_id", sa.Integer),
+    sa.column("unread_count", sa.Integer),
+    sa.column("total_count", sa.Integer),
+    sa.column("latest_article_at", sa.DateTime(timezone=True)),
+)
+folders = sa.table(
+    "folders",
+    sa.column("id", sa.Integer),
+    sa.column("unread_count", sa.Integer),
+    sa.column("total_count", sa.Integer),
+)
+articles = sa.table(
+    "articles",
+    sa.column("id", sa.Integer),
+    sa.column("feed_id", sa.Integer),
+    sa.column("is_read", sa.Boolean),
+    sa.column("published_at", sa.DateTime(timezone=True)),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("feeds", "folders"):
+        op.add_column(
+            table,
+            sa.Column("unread_count", sa.Integer(), server_default="0", nullable=False),
+        )
+        op.add_column(
+            table,
+            sa.Column("total_count", sa.Integer(), server_default="0", nullable=False),
+        )
+    op.add_column(
+        "feeds",
+        sa.Column("latest_article_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # Backfill from the existing articles
+    of_feed = articles.c.feed_id == feeds.c.id
+    op.execute(
+        feeds.update().values(
+            total_count=sa.select(sa.func.count(articles.c.id))
+            .where(of_feed)
+            .scalar_subquery(),
+            unread_count=sa.select(sa.func.count(articles.c.id))
+            .where(of_feed, articles.c.is_read.isnot(True))
+            .scalar_subquery(),
+            latest_article_at=sa.select(sa.func.max(articles.c.published_at))
+            .where(of_feed)
+            .scalar_subquery(),
+        )
+    )
+    in_folder = feeds.c.folder_id == folders.c.id
+    op.execute(
+        folders.update().values(
+            total_count=sa.select(sa.func.coalesce(sa.func.sum(feeds.c.total_count), 0))
+            .where(in_folder)
+            .scalar_subquery(),
+            unread_count=sa.select(
+                sa.func.coalesce(sa.func.sum(feeds.c.unread_count), 0)
+            )
+            .where(in_folder)
+            .scalar_subquery(),
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("feeds") as batch_op:
+        batch_op.drop_column("latest_article_at")
+        batch_op.drop_column("total_count")
+        batch_op.drop_column("unread_count")
+    with op.batch_alter_table("folders") as batch_op:
+        batch_op.drop_column("total_count")
+        batch_op.drop_column("unread_count")
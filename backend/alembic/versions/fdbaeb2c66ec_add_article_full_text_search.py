@@ -0,0 +1,74 @@
+"""add article full text search
+
+Revision ID: fdbaeb2c66ec
+Revises: c5587f5369f1
+Create Date: 2026-10-18 15:22:09.481736
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "fdbaeb2c66ec"
+down_revision: Union[str, None] = "c5587f5369f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'C')"
+)
+
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE articles_fts USING fts5("
+    "title, description, content, content='articles', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER articles_fts_insert AFTER INSERT ON articles BEGIN "
+    "INSERT INTO articles_fts(rowid, title, description, content) "
+    "VALUES (new.id, new.title, new.description, new.content); END",
+    "CREATE TRIGGER articles_fts_delete AFTER DELETE ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, description, content) "
+    "VALUES ('delete', old.id, old.title, old.description, old.content); END",
+    "CREATE TRIGGER articles_fts_update "
+    "AFTER UPDATE OF title, description, content ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, description, content) "
+    "VALUES ('delete', old.id, old.title, old.description, old.content); "
+    "INSERT INTO articles_fts(rowid, title, description, content) "
+    "VALUES (new.id, new.title, new.description, new.content); END",
+    # Index the articles that already exist
+    "INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Adding a stored generated column computes it for every existing row
+        op.execute(
+            "ALTER TABLE articles ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+        )
+        op.execute(
+            "CREATE INDEX ix_articles_search_vector ON articles "
+            "USING gin (search_vector)"
+        )
+    elif dialect == "sqlite":
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_articles_search_vector")
+        op.execute("ALTER TABLE articles DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("insert", "delete", "update"):
+            op.execute(f"DROP TRIGGER IF EXISTS articles_fts_{trigger}")
+        op.execute("DROP TABLE IF EXISTS articles_fts")
@@ -1,6 +1,136 @@
-# Article endpoints (placeholder for future expansion)
-from fastapi import APIRouter
+# Article endpoints
+from app.db import crud, database, models
+from app.schemas import article as article_schemas
+from app.services import image_proxy
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import RedirectResponse
+from sqlalchemy.orm import Session
 
 router = APIRouter()
 
-# Add article-specific endpoints here as needed
+
+@router.get("/", response_model=article_schemas.ArticlePage)
+def read_articles(
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    feed_id: int | None = None,
+    folder_id: int | None = None,
+    is_read: bool | None = None,
+    db: Session = Depends(database.get_db),
+):
+    """
+    Article timeline, newest first.
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page.
+    """
+    after = None
+    if cursor:
+        try:
+            after = crud.decode_article_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    items, next_cursor = crud.get_articles_page(
+        db,
+        limit=limit,
+        after=after,
+        feed_id=feed_id,
+        folder_id=folder_id,
+        is_read=is_read,
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/search", response_model=article_schemas.ArticleSearchPage)
+def search_articles(
+    q: str = Query(..., min_length=1, max_length=256),
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    feed_id: int | None = None,
+    folder_id: int | None = None,
+    db: Session = Depends(database.get_db),
+):
+    """
+    Full-text search over article titles, descriptions and content.
+    Results are ranked best match first; pass ``next_cursor`` as ``cursor``
+    for the next page.
+    """
+    after = None
+    if cursor:
+        try:
+            after = crud.decode_search_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    items, next_cursor = crud.search_articles(
+        db, q, limit=limit, after=after, feed_id=feed_id, folder_id=folder_id
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.post("/read", response_model=article_schemas.ArticleReadResult)
+def set_articles_read(
+    data: article_schemas.ArticleReadUpdate,
+    db: Session = Depends(database.get_db),
+):
+    """
+    Mark articles read (or unread with ``is_read: false``) in bulk.
+    Select them by ids, feed, folder and/or a timeline cursor; everything
+    matching is updated in one statement.
+    """
+    before = None
+    if data.before:
+        try:
+            before = crud.decode_article_cursor(data.before)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    updated = crud.set_articles_read(
+        db,
+        is_read=data.is_read,
+        article_ids=data.article_ids,
+        feed_id=data.feed_id,
+        folder_id=data.folder_id,
+        before=before,
+    )
+    return {"updated": updated}
+
+
+@router.put("/{article_id}/read", response_model=article_schemas.ArticleReadResult)
+def mark_article_read(article_id: int, db: Session = Depends(database.get_db)):
+    """Mark a single article as read"""
+    updated = crud.set_articles_read(db, article_ids=[article_id])
+    if not updated and db.get(models.Article, article_id) is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return {"updated": updated}
+
+
+@router.get("/{article_id}/image")
+def get_article_image(
+    article_id: int,
+    request: Request,
+    w: int = Query(320, ge=1, le=4096),
+    db: Session = Depends(database.get_db),
+):
+    """
+    Thumbnail of the article's image, at most ``w`` pixels on either side.
+    Widths snap up to a few fixed sizes. The ETag is derived from the
+    thumbnail's bytes, so browsers revalidate it once its max-age is over.
+    """
+    article = db.get(models.Article, article_id)
+    if article is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    url = article.image_url
+    if not url or not url.startswith(("http://", "https://")):
+        raise HTTPException(status_code=404, detail="Article has no image")
+    if not image_proxy.pillow_available():
+        return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    width = image_proxy.snap_width(w)
+    try:
+        data = image_proxy.thumbnail_cache.thumbnail(url, width)
+    except image_proxy.ImageProxyError as e:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+    headers = {
+        "Cache-Control": f"public, max-age={image_proxy.THUMBNAIL_MAX_AGE_SECONDS}",
+        "ETag": image_proxy.content_etag(data),
+    }
+    if request.headers.get("If-None-Match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=data, media_type="image/webp", headers=headers)
@@ -154,16 +154,16 @@ async def get_app_documentation():
                         {
                             "method": "GET",
                             "path": "/feeds/{feed_id}/articles/",
-                            "description": "Get all articles from a specific feed",
+                            "description": "Page through a feed's articles, newest first",
                             "parameters": {
                                 "query_params": [
-                                    "limit: Maximum number of articles to return",
-                                    "offset: Number of articles to skip",
-                                    "unread_only: Show only unread articles (true/false)",
+                                    "limit: Maximum number of articles to return (1-200)",
+                                    "cursor: next_cursor from the previous page",
+                                    "is_read: Only read or unread articles (true/false)",
                                 ]
                             },
                             "example_response": {
-                                "articles": [
+                                "items": [
                                     {
                                         "id": "1",
                                         "title": "Latest Tech Trends",
@@ -174,8 +174,7 @@ async def get_app_documentation():
                                         "feed_id": "1",
                                     }
                                 ],
-                                "total_count": 25,
-                                "unread_count": 10,
+                                "next_cursor": "MjAyNS0wNi0xMVQwOTowMDowMCswMDowMHwx",
                             },
                         }
                     ],
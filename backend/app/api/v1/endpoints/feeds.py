@@ -6,8 +6,23 @@ import httpx
 from app.db import crud, database, models
 from app.schemas import article as article_schemas
 from app.schemas import feed as feed_schemas
-from app.services.feed_parser import fetch_and_save_articles_for_feed
-from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
+from app.services import favicons
+from app.services.feed_import import feed_importer
+from app.services.feed_parser import HostDeferredError
+from app.services.opml import MAX_OPML_BYTES, OPML_MEDIA_TYPE, parse_opml, write_opml
+from app.services.refresh_jobs import refresh_jobs
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -20,7 +35,9 @@ def create_feed(feed: feed_schemas.FeedCreate, db: Session = Depends(database.ge
     if not feed.url or not feed.url.strip():
         raise HTTPException(status_code=422, detail="Feed URL cannot be empty")
     try:
-        db_feed = crud.create_feed(db, feed)
+        db_feed, parsed = crud.create_feed(db, feed)
+        # Articles and favicon are stored in the background
+        feed_importer.submit(db_feed.id, parsed, find_favicon=not db_feed.favicon)
         return db_feed
     except IntegrityError as e:
         db.rollback()  # Rollback before querying
@@ -51,6 +68,10 @@ def create_feed(feed: feed_schemas.FeedCreate, db: Session = Depends(database.ge
                 },
             },
         )
+    except HostDeferredError:
+        # Answered with 503 and Retry-After by the app's exception handler
+        db.rollback()
+        raise
     except ValueError as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=f"Error parsing feed: {e}")
@@ -59,11 +80,18 @@ def create_feed(feed: feed_schemas.FeedCreate, db: Session = Depends(database.ge
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/", response_model=list[feed_schemas.Feed])
+@router.get("/", response_model=list[feed_schemas.FeedSummary])
 def read_feeds(db: Session = Depends(database.get_db)):
+    """List feeds with article counts; page articles via GET /articles/"""
     return crud.get_feeds(db)
 
 
+@router.get("/broken", response_model=list[feed_schemas.FeedHealth])
+def read_broken_feeds(db: Session = Depends(database.get_db)):
+    """List feeds that are failing to refresh, with their backoff state"""
+    return crud.get_broken_feeds(db)
+
+
 @router.delete("/{feed_id}")
 def delete_feed(feed_id: str, db: Session = Depends(database.get_db)):
     # Accept both int and UUID for test compatibility
@@ -86,8 +114,17 @@ def delete_feed(feed_id: str, db: Session = Depends(database.get_db)):
     )
 
 
-@router.get("/{feed_id}/articles/", response_model=list[article_schemas.Article])
-def get_articles_for_feed(feed_id: str, db: Session = Depends(database.get_db)):
+@router.get("/{feed_id}/articles/", response_model=article_schemas.ArticlePage)
+def get_articles_for_feed(
+    feed_id: str,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    is_read: bool | None = None,
+    db: Session = Depends(database.get_db),
+):
+    """
+    One feed's article timeline, newest first; same paging as GET /articles/.
+    """
     try:
         try:
             feed_key = int(feed_id)
@@ -101,11 +138,73 @@ def get_articles_for_feed(feed_id: str, db: Session = Depends(database.get_db)):
     feed = db.query(models.Feed).filter_by(id=feed_key).first()
     if not feed:
         raise HTTPException(status_code=404, detail="Feed not found")
-    return crud.get_articles_for_feed(db, feed_key)
+    after = None
+    if cursor:
+        try:
+            after = crud.decode_article_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    items, next_cursor = crud.get_articles_page(
+        db, limit=limit, after=after, feed_id=feed.id, is_read=is_read
+    )
+    return {"items": items, "next_cursor": next_cursor}
 
 
-@router.post("/{feed_id}/refresh")
-def refresh_feed(feed_id: str, db: Session = Depends(database.get_db)):
+@router.get("/{feed_id}/icon")
+def get_feed_icon(
+    feed_id: str, request: Request, db: Session = Depends(database.get_db)
+):
+    """The feed site's favicon, served from the per-domain favicon cache.
+
+    Browsers may keep the icon for as long as it stays cached here, and
+    revalidate it with its ETag afterwards.
+    """
+    try:
+        try:
+            feed_key = int(feed_id)
+        except ValueError:
+            feed_key = uuid.UUID(feed_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid UUID format",
+        )
+    feed = db.query(models.Feed).filter_by(id=feed_key).first()
+    if not feed:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    favicon = favicons.get_favicon(db, feed.site_url or feed.url)
+    if favicon.data is None:
+        raise HTTPException(status_code=404, detail="Feed site has no icon")
+
+    headers = {
+        "Cache-Control": (
+            f"public, max-age={int(favicons.favicon_ttl().total_seconds())}"
+        ),
+        "ETag": f'"{favicon.content_hash}"',
+    }
+    if request.headers.get("If-None-Match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=favicon.data, media_type=favicon.content_type, headers=headers
+    )
+
+
+@router.post(
+    "/{feed_id}/refresh",
+    response_model=feed_schemas.FeedRefreshJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def refresh_feed(
+    feed_id: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(database.get_db),
+):
+    """Queue a refresh of the feed and return the job to poll.
+
+    Repeated requests while a refresh of the feed is queued or running get
+    that same job back.
+    """
     try:
         try:
             feed_key = int(feed_id)
@@ -121,9 +220,78 @@ def refresh_feed(feed_id: str, db: Session = Depends(database.get_db)):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Feed not found"
         )
-    result = fetch_and_save_articles_for_feed(feed, db)
-    db.refresh(feed)
-    return feed
+    job, _ = refresh_jobs.submit(feed.id)
+    response.headers["Location"] = str(
+        request.url_for("get_refresh_job", job_id=job.id)
+    )
+    return job
+
+
+@router.get("/refresh-jobs/{job_id}", response_model=feed_schemas.FeedRefreshJob)
+def get_refresh_job(job_id: str):
+    """Status of a refresh queued with POST /feeds/{feed_id}/refresh"""
+    job = refresh_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Refresh job not found")
+    return job
+
+
+@router.get("/refresh-batches/{batch_id}", response_model=feed_schemas.FeedRefreshBatch)
+def get_refresh_batch(batch_id: str):
+    """Progress of refreshes queued together, such as an OPML import's"""
+    batch = refresh_jobs.get_batch(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Refresh batch not found")
+    return batch
+
+
+@router.post(
+    "/import/opml",
+    response_model=feed_schemas.OpmlImportResult,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def import_opml(
+    request: Request,
+    response: Response,
+    opml: bytes = Body(..., media_type=OPML_MEDIA_TYPE),
+    db: Session = Depends(database.get_db),
+):
+    """Subscribe to every feed in an OPML document sent as the request body.
+
+    Folders and feeds are stored in one transaction and the new feeds'
+    first fetch is queued as a refresh batch, whose progress is at the
+    Location header.
+    """
+    if len(opml) > MAX_OPML_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="OPML document too large",
+        )
+    try:
+        entries = parse_opml(opml)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    imported = crud.import_opml_feeds(db, entries)
+    batch = refresh_jobs.submit_batch([feed.id for feed in imported["feeds"]])
+    response.headers["Location"] = str(
+        request.url_for("get_refresh_batch", batch_id=batch.id)
+    )
+    return {
+        "feeds_created": len(imported["feeds"]),
+        "feeds_existing": imported["feeds_existing"],
+        "folders_created": imported["folders_created"],
+        "refresh": batch,
+    }
+
+
+@router.get("/export/opml")
+def export_opml(db: Session = Depends(database.get_db)):
+    """All subscriptions as an OPML document, grouped by folder"""
+    return StreamingResponse(
+        write_opml(crud.get_opml_export_rows(db)),
+        media_type=OPML_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="subscriptions.opml"'},
+    )
 
 
 @router.post("/parse-title")
@@ -135,8 +303,11 @@ async def parse_feed_title(request: Request):
     try:
         from app.services.feed_parser import fetch_feed_title_and_url
 
-        result = fetch_feed_title_and_url(url)
+        # Blocking fetch; keep it off the event loop
+        result = await run_in_threadpool(fetch_feed_title_and_url, url)
         return result
+    except HostDeferredError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Could not fetch feed title: {e}")
 
@@ -151,7 +322,7 @@ async def fetch_feed_title(request: Request):
     try:
         from app.services.feed_parser import fetch_feed_title_and_url
 
-        result = fetch_feed_title_and_url(url)
+        result = await run_in_threadpool(fetch_feed_title_and_url, url)
         # Ensure result is a dict with 'title' and 'url' keys
         if not isinstance(result, dict):
             # If the function returns a tuple, convert to dict
@@ -160,6 +331,8 @@ async def fetch_feed_title(request: Request):
             else:
                 raise ValueError("Unexpected return type from fetch_feed_title_and_url")
         return result
+    except HostDeferredError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -193,12 +366,8 @@ def move_feed_to_folder(
         folder = db.query(models.Folder).filter_by(id=folder_key).first()
         if not folder:
             raise HTTPException(status_code=404, detail="Target folder not found")
-        feed.folder_id = folder_key
-    else:
-        feed.folder_id = None
-    db.commit()
-    db.refresh(feed)
-    return feed
+        return crud.move_feed(db, feed, folder_key)
+    return crud.move_feed(db, feed, None)
 
 
 @router.post("/cleanup-articles")
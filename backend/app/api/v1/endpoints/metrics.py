@@ -36,6 +36,20 @@ database_query_duration = Histogram(
     "database_query_duration_seconds", "Time spent on database queries"
 )
 
+feed_refresh_cycle_duration = Histogram(
+    "feed_refresh_cycle_duration_seconds",
+    "Wall time of a full feed refresh cycle",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+
+feed_refresh_feeds_per_second = Gauge(
+    "feed_refresh_feeds_per_second", "Feed throughput of the last refresh cycle"
+)
+
+feed_refresh_failures_total = Counter(
+    "feed_refresh_failures_total", "Total number of failed feed refreshes"
+)
+
 # System metrics
 system_memory_usage = Gauge("system_memory_usage_bytes", "System memory usage in bytes")
 
@@ -102,3 +116,12 @@ def increment_articles_scraped(count: int = 1):
 def observe_database_query_time(duration: float):
     """Helper function to observe database query duration"""
     database_query_duration.observe(duration)
+
+
+def observe_feed_refresh_cycle(
+    wall_time: float, feeds_per_second: float, failures: int
+):
+    """Helper function to record the outcome of a feed refresh cycle"""
+    feed_refresh_cycle_duration.observe(wall_time)
+    feed_refresh_feeds_per_second.set(feeds_per_second)
+    feed_refresh_failures_total.inc(failures)
@@ -13,6 +13,28 @@ logger = logging.getLogger(__name__)
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Maximum number of feeds fetched at the same time during a refresh cycle
+    FEED_REFRESH_CONCURRENCY: int = 50
+    # Bounds for the per-feed refresh interval learned from publishing cadence
+    FEED_REFRESH_MIN_INTERVAL_MINUTES: int = 5
+    FEED_REFRESH_MAX_INTERVAL_MINUTES: int = 24 * 60
+    # Shared outbound HTTP client pool
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 6
+    HTTP2_ENABLED: bool = True
+    # Politeness towards a single host: sustained requests/second and burst
+    FEED_HOST_REQUESTS_PER_SECOND: float = 1.0
+    FEED_HOST_BURST: int = 5
+    # Feed downloads larger than this are aborted
+    FEED_MAX_BODY_BYTES: int = 10 * 1024 * 1024
+    # Processes parsing large feed bodies; unset uses one per CPU core and
+    # 0 parses on the refresh thread
+    FEED_PARSE_WORKERS: Optional[int] = None
+    # Cached site favicons are looked up again after this long
+    FAVICON_TTL_HOURS: int = 7 * 24
+    # On-disk article thumbnail cache; unset uses a directory under /tmp
+    IMAGE_CACHE_DIR: Optional[str] = None
+    IMAGE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
 
     class Config:
         env_file = ".env"
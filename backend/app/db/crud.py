@@ -1,16 +1,37 @@
 # CRUD operations for feeds, folders, articles
+import base64
 import logging
-from datetime import datetime, timedelta
+import re
+from datetime import datetime, timedelta, timezone
 
 from app.db.models import Article, Feed, Folder, Settings
-from app.schemas.article import ArticleCreate
-from app.schemas.feed import FeedCreate
+from app.schemas.article import Article as ArticleSchema
+from app.schemas.article import ArticleCreate, ArticleSearchResult
+from app.schemas.feed import FeedCreate, FeedSummary
 from app.schemas.folder import FolderCreate
 from app.schemas.settings import SettingsCreate, SettingsUpdate
-from app.services.feed_parser import fetch_favicon_url, parse_feed
-from sqlalchemy import and_
+from app.services.feed_dates import standardize_date
+from app.services.feed_parser import ArticleData, FeedData, parse_feed
+from app.services.opml import OpmlFeed
+from app.services.seen_entries import seen_entries
+from sqlalchemy import (
+    Float,
+    and_,
+    case,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    table,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import DatabaseError, OperationalError, SQLAlchemyError
-from sqlalchemy.orm import Session, joinedload  # Import joinedload
+from sqlalchemy.orm import Session
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -44,39 +65,294 @@ def handle_database_operation(operation_name: str):
 def create_article(db: Session, article: ArticleCreate):
     db_article = Article(**article.model_dump())
     db.add(db_article)
+    db.flush()
+    _increment_feed_counters(db, db_article.feed_id, 1, db_article.published_at)
     db.commit()
     db.refresh(db_article)
     return db_article
 
 
+# Rows per INSERT statement, keeps bound parameters well under driver limits
+ARTICLE_INSERT_BATCH_SIZE = 500
+# Rows per DELETE statement during cleanup, keeps lock times short
+ARTICLE_DELETE_BATCH_SIZE = 5000
+
+
+def _to_utc(value: datetime | None) -> datetime | None:
+    """Normalize timestamps to UTC; naive values are assumed to be UTC already"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc)
+
+
+def _increment_feed_counters(
+    db: Session, feed_id: int, count: int, latest_published_at: datetime | None
+):
+    """Account for ``count`` new unread articles on a feed and its folder.
+
+    Uses relative UPDATEs so concurrent writers do not lose increments; the
+    caller commits together with the inserted articles.
+    """
+    if count <= 0:
+        return
+    feed_values = {
+        Feed.total_count: Feed.total_count + count,
+        Feed.unread_count: Feed.unread_count + count,
+    }
+    if latest_published_at is not None:
+        feed_values[Feed.latest_article_at] = case(
+            (
+                or_(
+                    Feed.latest_article_at.is_(None),
+                    Feed.latest_article_at < latest_published_at,
+                ),
+                latest_published_at,
+            ),
+            else_=Feed.latest_article_at,
+        )
+    db.query(Feed).filter(Feed.id == feed_id).update(
+        feed_values, synchronize_session=False
+    )
+    folder_id = select(Feed.folder_id).where(Feed.id == feed_id).scalar_subquery()
+    db.query(Folder).filter(Folder.id == folder_id).update(
+        {
+            Folder.total_count: Folder.total_count + count,
+            Folder.unread_count: Folder.unread_count + count,
+        },
+        synchronize_session=False,
+    )
+
+
+def recount_folder_counters(db: Session, folder_ids=None):
+    """Recompute folder counters as the sum of their feeds' counters (no commit)"""
+    feeds_in_folder = Feed.folder_id == Folder.id
+    query = db.query(Folder)
+    if folder_ids is not None:
+        query = query.filter(Folder.id.in_(folder_ids))
+    query.update(
+        {
+            Folder.total_count: select(func.coalesce(func.sum(Feed.total_count), 0))
+            .where(feeds_in_folder)
+            .scalar_subquery(),
+            Folder.unread_count: select(func.coalesce(func.sum(Feed.unread_count), 0))
+            .where(feeds_in_folder)
+            .scalar_subquery(),
+        },
+        synchronize_session=False,
+    )
+
+
+def recount_feed_counters(db: Session, feed_ids=None):
+    """Recompute feed counters (and their folders') from the articles table.
+
+    Runs as set-based correlated UPDATEs; pass ``feed_ids`` to limit the
+    work to feeds whose articles changed. The caller commits.
+    """
+    of_feed = Article.feed_id == Feed.id
+    query = db.query(Feed)
+    if feed_ids is not None:
+        feed_ids = list(feed_ids)
+        if not feed_ids:
+            return
+        query = query.filter(Feed.id.in_(feed_ids))
+    query.update(
+        {
+            Feed.total_count: select(func.count(Article.id))
+            .where(of_feed)
+            .scalar_subquery(),
+            Feed.unread_count: select(func.count(Article.id))
+            .where(of_feed, Article.is_read.isnot(True))
+            .scalar_subquery(),
+            Feed.latest_article_at: select(func.max(Article.published_at))
+            .where(of_feed)
+            .scalar_subquery(),
+        },
+        synchronize_session=False,
+    )
+
+    folder_ids = None
+    if feed_ids is not None:
+        folder_ids = select(Feed.folder_id).where(
+            Feed.id.in_(feed_ids), Feed.folder_id.isnot(None)
+        )
+    recount_folder_counters(db, folder_ids)
+
+
+@handle_database_operation("reconcile_counters")
+def reconcile_counters(db: Session) -> int:
+    """Repair drift between the denormalized counters and the articles table.
+
+    Returns the number of feeds whose counters were wrong.
+    """
+    stats = _feed_article_stats(db)
+    drifted = [
+        feed_id
+        for (feed_id,) in db.query(Feed.id)
+        .outerjoin(stats, stats.c.feed_id == Feed.id)
+        .filter(
+            or_(
+                Feed.total_count != func.coalesce(stats.c.total_count, 0),
+                Feed.unread_count != func.coalesce(stats.c.unread_count, 0),
+                Feed.latest_article_at.is_distinct_from(stats.c.latest_article_at),
+            )
+        )
+    ]
+    recount_feed_counters(db, drifted)
+    # Folder sums can drift independently of their feeds, e.g. after a move
+    recount_folder_counters(db)
+    db.commit()
+    return len(drifted)
+
+
+def _insert_articles_ignoring_duplicates(db: Session, rows: list[dict]):
+    """Build a multi-row INSERT that skips rows violating _feed_guid_uc"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return (
+            postgresql.insert(Article)
+            .values(rows)
+            .on_conflict_do_nothing(constraint="_feed_guid_uc")
+        )
+    if dialect == "sqlite":
+        return (
+            sqlite.insert(Article)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["feed_id", "guid"])
+        )
+    return insert(Article).values(rows)
+
+
+@handle_database_operation("bulk_create_articles")
+def bulk_create_articles(db: Session, feed_id: int, articles: list[ArticleCreate]):
+    """Insert the articles of a feed that are not stored yet.
+
+    Existing rows are looked up with a single IN query on guid/link, new rows
+    go in with multi-row inserts and the whole batch is committed once.
+    Returns the number of articles inserted.
+    """
+    if not articles:
+        return 0
+
+    guids = {article.guid for article in articles}
+    links = {article.link for article in articles}
+    existing = (
+        db.query(Article.guid, Article.link)
+        .filter(
+            Article.feed_id == feed_id,
+            or_(Article.guid.in_(guids), Article.link.in_(links)),
+        )
+        .all()
+    )
+    seen_guids = {guid for guid, _ in existing}
+    seen_links = {link for _, link in existing}
+
+    rows = []
+    for article in articles:
+        # Also drops duplicates repeated within the same feed document
+        if article.guid in seen_guids or article.link in seen_links:
+            continue
+        seen_guids.add(article.guid)
+        seen_links.add(article.link)
+        row = {**article.model_dump(), "feed_id": feed_id}
+        row["published_at"] = _to_utc(row["published_at"])
+        rows.append(row)
+
+    inserted = 0
+    for start in range(0, len(rows), ARTICLE_INSERT_BATCH_SIZE):
+        batch = rows[start : start + ARTICLE_INSERT_BATCH_SIZE]
+        result = db.execute(_insert_articles_ignoring_duplicates(db, batch))
+        inserted += result.rowcount
+    published = [row["published_at"] for row in rows if row["published_at"]]
+    _increment_feed_counters(db, feed_id, inserted, max(published, default=None))
+    db.commit()
+    return inserted
+
+
+@handle_database_operation("get_recent_publication_times")
+def get_recent_publication_times(
+    db: Session, feed_ids: list[int], per_feed: int = 20
+) -> dict[int, list[datetime]]:
+    """Publication times of the newest articles of each feed, in one query"""
+    if not feed_ids:
+        return {}
+    ranked = (
+        db.query(
+            Article.feed_id,
+            Article.published_at,
+            func.row_number()
+            .over(partition_by=Article.feed_id, order_by=Article.published_at.desc())
+            .label("position"),
+        )
+        .filter(Article.feed_id.in_(feed_ids), Article.published_at.isnot(None))
+        .subquery()
+    )
+    rows = db.query(ranked.c.feed_id, ranked.c.published_at).filter(
+        ranked.c.position <= per_feed
+    )
+
+    times = {feed_id: [] for feed_id in feed_ids}
+    for feed_id, published_at in rows:
+        times[feed_id].append(published_at)
+    return times
+
+
+def _feed_article_stats(db: Session):
+    """Subquery of total/unread counts and latest article time per feed"""
+    return (
+        db.query(
+            Article.feed_id,
+            func.count(Article.id).label("total_count"),
+            func.sum(case((Article.is_read.is_(True), 0), else_=1)).label(
+                "unread_count"
+            ),
+            func.max(Article.published_at).label("latest_article_at"),
+        )
+        .group_by(Article.feed_id)
+        .subquery()
+    )
+
+
 @handle_database_operation("get_feeds")
 def get_feeds(db: Session):
-    return (
-        db.query(Feed).options(joinedload(Feed.articles)).all()
-    )  # Eager load articles
+    """All feeds with their unread/total counters and latest article time.
+
+    Reads the denormalized counters on each feed row; the articles
+    themselves are paged via GET /articles/.
+    """
+    return [
+        FeedSummary.model_validate(feed) for feed in db.query(Feed).order_by(Feed.id)
+    ]
 
 
 @handle_database_operation("get_folders")
 def get_folders(db: Session):
-    folders = db.query(Folder).all()
-    from app.schemas.feed import Feed as FeedSchema
-
-    result = []
-    for folder in folders:
-        # Get feeds for this folder
-        feeds = db.query(Feed).filter(Feed.folder_id == folder.id).all()
-        # Convert feeds to Pydantic models
-        feeds_data = [FeedSchema.model_validate(feed) for feed in feeds]
-        # Convert folder to Pydantic model, inject feeds
-        folder_data = folder
-        folder_dict = folder.__dict__.copy()
-        folder_dict["feeds"] = feeds_data
-        # Use Folder schema to serialize
-        from app.schemas.folder import Folder as FolderSchema
-
-        folder_pydantic = FolderSchema.model_validate(folder_dict)
-        result.append(folder_pydantic)
-    return result
+    """Folder tree with each folder's feeds and their article counters.
+
+    Folders and feeds come from a single outer-joined query, so the number
+    of queries does not grow with the number of folders.
+    """
+    from app.schemas.folder import Folder as FolderSchema
+
+    rows = (
+        db.query(Folder.id, Folder.name, Folder.unread_count, Folder.total_count, Feed)
+        .outerjoin(Feed, Feed.folder_id == Folder.id)
+        .order_by(Folder.id, Feed.id)
+        .all()
+    )
+
+    folders = {}
+    for folder_id, name, unread_count, total_count, feed in rows:
+        folder = folders.get(folder_id)
+        if folder is None:
+            folder = folders[folder_id] = FolderSchema(
+                id=folder_id,
+                name=name,
+                unread_count=unread_count,
+                total_count=total_count,
+            )
+        if feed is not None:
+            folder.feeds.append(FeedSummary.model_validate(feed))
+    return list(folders.values())
 
 
 @handle_database_operation("create_folder")
@@ -88,13 +364,15 @@ def create_folder(db: Session, folder: FolderCreate):
     return db_folder
 
 
-def create_feed(db: Session, feed: FeedCreate):
+def create_feed(db: Session, feed: FeedCreate) -> tuple[Feed, FeedData]:
+    """Validate a feed by parsing it and store the feed row.
+
+    Returns the feed and its parsed document. Storing the document's
+    articles and finding the site's favicon are left to
+    app.services.feed_import, so adding a feed does not wait on them.
+    """
     try:
         parsed_data = parse_feed(feed.url)
-        # Try to get favicon from site_url if available
-        favicon_url = None
-        if parsed_data.site_url:
-            favicon_url = fetch_favicon_url(parsed_data.site_url)
         db_feed = Feed(
             url=feed.url,
             folder_id=feed.folder_id,
@@ -102,57 +380,398 @@ def create_feed(db: Session, feed: FeedCreate):
             feed_url=feed.url,  # Store original URL
             site_url=parsed_data.site_url,
             description=parsed_data.description,
-            favicon=favicon_url,
+            favicon=feed.favicon,
         )
         db.add(db_feed)
         db.commit()
         db.refresh(db_feed)
-        for article_data in parsed_data.articles:
-            from datetime import datetime
-
-            published_at = None
-            if article_data.published_at:
-                try:
-                    published_at = datetime.fromisoformat(
-                        article_data.published_at.replace("Z", "+00:00")
-                    )
-                except:
-                    published_at = datetime.now()
-            article = Article(
+        return db_feed, parsed_data
+    except ValueError as e:
+        db.rollback()
+        raise e
+    except Exception as e:
+        db.rollback()
+        raise
+
+
+def import_feed_articles(db: Session, feed_id: int, articles: list[ArticleData]):
+    """Bulk insert the articles parsed when a feed was added"""
+    to_create = []
+    for article_data in articles:
+        published_at = article_data.published_at or None
+        if isinstance(published_at, str):
+            published_at = standardize_date(published_at)
+        to_create.append(
+            ArticleCreate(
                 title=article_data.title,
                 link=article_data.link,
                 guid=article_data.guid,
                 published_at=published_at,
                 description=article_data.content,
                 image_url=article_data.image_url,
-                feed_id=db_feed.id,
             )
-            db.add(article)
+        )
+    return bulk_create_articles(db, feed_id, to_create)
+
+
+def set_feed_favicon(db: Session, feed_id: int, favicon: str):
+    db.query(Feed).filter(Feed.id == feed_id).update({"favicon": favicon})
+    db.commit()
+
+
+@handle_database_operation("import_opml_feeds")
+def import_opml_feeds(db: Session, entries: list[OpmlFeed]) -> dict:
+    """Store the subscriptions of an OPML import in one transaction.
+
+    Missing folders are created by name. Feeds already subscribed to, or
+    listed twice, are skipped. Nothing is fetched here: the new feeds are
+    returned for the caller to schedule their first refresh. Returns a dict
+    with the new ``feeds``, ``folders_created`` and ``feeds_existing``.
+    """
+    try:
+        urls = {entry.url for entry in entries}
+        existing_urls = {
+            url for (url,) in db.query(Feed.url).filter(Feed.url.in_(urls))
+        }
+        folder_names = {entry.folder for entry in entries if entry.folder}
+        folders = {
+            folder.name: folder
+            for folder in db.query(Folder).filter(Folder.name.in_(folder_names))
+        }
+        folders_created = 0
+        for name in folder_names - folders.keys():
+            folders[name] = Folder(name=name)
+            db.add(folders[name])
+            folders_created += 1
+
+        feeds = []
+        feeds_existing = 0
+        seen_urls = set()
+        for entry in entries:
+            if entry.url in existing_urls or entry.url in seen_urls:
+                feeds_existing += entry.url in existing_urls
+                continue
+            seen_urls.add(entry.url)
+            feeds.append(
+                Feed(
+                    url=entry.url,
+                    feed_url=entry.url,
+                    title=entry.title or entry.url,
+                    site_url=entry.site_url,
+                    folder=folders[entry.folder] if entry.folder else None,
+                )
+            )
+        db.add_all(feeds)
         db.commit()
-        return db_feed
-    except ValueError as e:
-        db.rollback()
-        raise e
-    except Exception as e:
+    except Exception:
         db.rollback()
         raise
+    return {
+        "feeds": feeds,
+        "folders_created": folders_created,
+        "feeds_existing": feeds_existing,
+    }
+
+
+@handle_database_operation("get_opml_export_rows")
+def get_opml_export_rows(db: Session):
+    """(folder name, title, url, site url) of every feed for an OPML export.
+
+    Only these columns are loaded, with feeds outside any folder first and
+    the rest grouped by folder.
+    """
+    return (
+        db.query(Folder.name, Feed.title, Feed.url, Feed.site_url)
+        .outerjoin(Folder, Feed.folder_id == Folder.id)
+        .order_by(Folder.name.isnot(None), Folder.name, Feed.title, Feed.id)
+        .all()
+    )
+
+
+@handle_database_operation("get_broken_feeds")
+def get_broken_feeds(db: Session):
+    """Feeds whose last refresh failed, most failures first"""
+    return (
+        db.query(Feed)
+        .filter(Feed.consecutive_failures > 0)
+        .order_by(Feed.consecutive_failures.desc(), Feed.id)
+        .all()
+    )
+
+
+def encode_article_cursor(article: Article) -> str:
+    """Opaque timeline cursor pointing just after the given article"""
+    raw = f"{article.published_at.isoformat()}|{article.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_article_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of encode_article_cursor; raises ValueError for bad cursors"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        published_at, article_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(published_at), int(article_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _older_than_cursor(after: tuple[datetime, int]):
+    """Keyset predicate for articles after ``after`` in timeline order"""
+    published_at, article_id = after
+    return or_(
+        Article.published_at < published_at,
+        and_(Article.published_at == published_at, Article.id < article_id),
+    )
+
+
+@handle_database_operation("get_articles_page")
+def get_articles_page(
+    db: Session,
+    limit: int = 50,
+    after: tuple[datetime, int] | None = None,
+    feed_id: int | None = None,
+    folder_id: int | None = None,
+    is_read: bool | None = None,
+):
+    """Newest-first page of articles using keyset pagination.
+
+    Pages are selected with ``(published_at, id) < after`` rather than an
+    OFFSET, so each page costs the same index range scan however deep the
+    reader has scrolled. ``after`` is a decoded cursor. Returns the articles
+    and the cursor of the next page (None on the last page).
+    """
+    query = db.query(Article).filter(Article.published_at.isnot(None))
+    if feed_id is not None:
+        query = query.filter(Article.feed_id == feed_id)
+    if folder_id is not None:
+        query = query.join(Feed, Feed.id == Article.feed_id).filter(
+            Feed.folder_id == folder_id
+        )
+    if is_read is not None:
+        query = query.filter(Article.is_read == is_read)
+    if after is not None:
+        query = query.filter(_older_than_cursor(after))
+
+    articles = (
+        query.order_by(Article.published_at.desc(), Article.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    if len(articles) > limit:
+        articles = articles[:limit]
+        return articles, encode_article_cursor(articles[-1])
+    return articles, None
+
+
+@handle_database_operation("set_articles_read")
+def set_articles_read(
+    db: Session,
+    is_read: bool = True,
+    article_ids: list[int] | None = None,
+    feed_id: int | None = None,
+    folder_id: int | None = None,
+    before: tuple[datetime, int] | None = None,
+) -> int:
+    """Set the read state of every article in the given scope.
+
+    The articles change in a single UPDATE, however many match, and only
+    rows whose state actually changes are touched. The feed ids it returns
+    let the unread counters be adjusted in two more small statements.
+    Returns the number of articles updated.
+    """
+    conditions = [Article.is_read.isnot(True) if is_read else Article.is_read.is_(True)]
+    if article_ids is not None:
+        if not article_ids:
+            return 0
+        conditions.append(Article.id.in_(article_ids))
+    if feed_id is not None:
+        conditions.append(Article.feed_id == feed_id)
+    if folder_id is not None:
+        conditions.append(
+            Article.feed_id.in_(select(Feed.id).where(Feed.folder_id == folder_id))
+        )
+    if before is not None:
+        conditions.append(Article.published_at.isnot(None))
+        conditions.append(_older_than_cursor(before))
+
+    changed = db.execute(
+        update(Article)
+        .where(*conditions)
+        .values(is_read=is_read)
+        .returning(Article.feed_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if not changed:
+        return 0
+
+    per_feed: dict[int, int] = {}
+    for (changed_feed_id,) in changed:
+        per_feed[changed_feed_id] = per_feed.get(changed_feed_id, 0) + 1
+    delta = case(per_feed, value=Feed.id)
+    db.query(Feed).filter(Feed.id.in_(per_feed)).update(
+        {
+            Feed.unread_count: (
+                Feed.unread_count - delta if is_read else Feed.unread_count + delta
+            )
+        },
+        synchronize_session=False,
+    )
+    recount_folder_counters(
+        db,
+        select(Feed.folder_id).where(Feed.id.in_(per_feed), Feed.folder_id.isnot(None)),
+    )
+    db.commit()
+    return len(changed)
+
+
+SEARCH_SNIPPET_START = "<mark>"
+SEARCH_SNIPPET_END = "</mark>"
+# Relative weight of title, description and content matches in SQLite's bm25
+SEARCH_SQLITE_WEIGHTS = (10.0, 5.0, 1.0)
+_SEARCH_TERM_RE = re.compile(r"\w+")
 
+articles_fts = table("articles_fts", column("rowid"))
 
-def get_articles_for_feed(db: Session, feed_id):
-    return db.query(Article).filter(Article.feed_id == feed_id).all()
+
+def encode_search_cursor(score: float, article_id: int) -> str:
+    """Opaque search cursor pointing just after the given result"""
+    raw = f"{score!r}|{article_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    """Inverse of encode_search_cursor; raises ValueError for bad cursors"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        score, article_id = raw.rsplit("|", 1)
+        return float(score), int(article_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _search_terms_sqlite(text: str) -> str | None:
+    """FTS5 query matching every word of ``text``.
+
+    Each word is quoted, so user input can never be parsed as FTS5 syntax.
+    """
+    terms = _SEARCH_TERM_RE.findall(text)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def _search_query(db: Session, text: str):
+    """Dialect-specific (query, score, snippet) for a full-text search.
+
+    Higher scores are better on both backends.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        tsquery = func.websearch_to_tsquery("english", text)
+        search_vector = literal_column("articles.search_vector")
+        # ts_rank_cd is a float4; as double precision it compares exactly
+        # with the float8 bound from a cursor
+        score = cast(func.ts_rank_cd(search_vector, tsquery), Float(precision=53))
+        # Highlight the same columns search_vector indexes
+        snippet = func.ts_headline(
+            "english",
+            func.concat_ws(" ", Article.title, Article.description, Article.content),
+            tsquery,
+            f"StartSel={SEARCH_SNIPPET_START}, StopSel={SEARCH_SNIPPET_END}, "
+            "MaxFragments=2, MaxWords=30, MinWords=10",
+        )
+        query = db.query(
+            Article, score.label("score"), snippet.label("snippet")
+        ).filter(search_vector.op("@@")(tsquery))
+        return query, score, snippet
+
+    terms = _search_terms_sqlite(text)
+    fts = literal_column("articles_fts")
+    score = -func.bm25(fts, *SEARCH_SQLITE_WEIGHTS)
+    snippet = func.snippet(fts, -1, SEARCH_SNIPPET_START, SEARCH_SNIPPET_END, "…", 16)
+    query = (
+        db.query(Article, score.label("score"), snippet.label("snippet"))
+        .join(articles_fts, articles_fts.c.rowid == Article.id)
+        .filter(fts.op("MATCH")(terms))
+    )
+    return query, score, snippet
+
+
+@handle_database_operation("search_articles")
+def search_articles(
+    db: Session,
+    text: str,
+    limit: int = 50,
+    after: tuple[float, int] | None = None,
+    feed_id: int | None = None,
+    folder_id: int | None = None,
+):
+    """Best-matching page of articles for a full-text query.
+
+    Results are ranked by relevance (ties broken by id) and paged with a
+    ``(score, id)`` keyset, like the timeline. Each item carries a
+    highlighted snippet. Returns the results and the next page's cursor.
+    """
+    if not _SEARCH_TERM_RE.search(text):
+        return [], None
+    query, score, snippet = _search_query(db, text)
+    if feed_id is not None:
+        query = query.filter(Article.feed_id == feed_id)
+    if folder_id is not None:
+        query = query.join(Feed, Feed.id == Article.feed_id).filter(
+            Feed.folder_id == folder_id
+        )
+    if after is not None:
+        after_score, article_id = after
+        query = query.filter(
+            or_(
+                score < after_score, and_(score == after_score, Article.id < article_id)
+            )
+        )
+
+    rows = query.order_by(score.desc(), Article.id.desc()).limit(limit + 1).all()
+    results = [
+        ArticleSearchResult(
+            **ArticleSchema.model_validate(article).model_dump(),
+            score=row_score,
+            snippet=row_snippet,
+        )
+        for article, row_score, row_snippet in rows[:limit]
+    ]
+    if len(rows) > limit:
+        _, last_score, _ = rows[limit - 1]
+        return results, encode_search_cursor(last_score, rows[limit - 1][0].id)
+    return results, None
 
 
 def delete_feed(db: Session, feed_id):
+    folder_id = db.query(Feed.folder_id).filter(Feed.id == feed_id).scalar()
     # First delete all articles for this feed
     db.query(Article).filter(Article.feed_id == feed_id).delete()
+    seen_entries.forget([feed_id])
     # Then delete the feed
     result = db.query(Feed).filter(Feed.id == feed_id).delete()
+    # The folder no longer includes the feed's articles in its counters
+    if folder_id is not None:
+        recount_folder_counters(db, [folder_id])
     db.commit()
     if result:
         return {"ok": True}
     return {"ok": False, "error": "Feed not found"}
 
 
+def move_feed(db: Session, feed: Feed, folder_id):
+    """Move a feed to another folder (None for ungrouped) and roll its
+    counters over from the old folder to the new one"""
+    affected = {feed.folder_id, folder_id} - {None}
+    feed.folder_id = folder_id
+    db.flush()
+    if affected:
+        recount_folder_counters(db, affected)
+    db.commit()
+    db.refresh(feed)
+    return feed
+
+
 def delete_folder(db: Session, folder_id):
     # First, set all feeds in this folder to have no folder (ungrouped)
     db.query(Feed).filter(Feed.folder_id == folder_id).update({"folder_id": None})
@@ -175,48 +794,38 @@ def update_folder(db: Session, folder_id, new_name: str):
 
 
 def delete_old_articles(db: Session, days_older_than: int = 28):
-    """Delete articles older than specified number of days"""
-    cutoff_date = datetime.now() - timedelta(days=days_older_than)
+    """Delete articles published more than the given number of days ago.
 
-    # Query articles with pub_date older than cutoff
-    # Note: pub_date is stored as string, so we need to be careful with comparison
-    deleted_count = 0
+    Runs as indexed ``DELETE ... WHERE published_at < cutoff`` statements of
+    at most ARTICLE_DELETE_BATCH_SIZE rows, committing after each batch so
+    locks are held only briefly.
+    """
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_older_than)
 
-    articles = db.query(Article).all()
-    for article in articles:
-        if article.pub_date:
-            try:
-                # Try to parse the pub_date string to datetime
-                # Handle various date formats that might be in RSS feeds
-                article_date = None
-
-                # Try ISO format first
-                try:
-                    article_date = datetime.fromisoformat(
-                        article.pub_date.replace("Z", "+00:00")
-                    )
-                except:
-                    pass
-
-                # Try RFC822 format (common in RSS)
-                if not article_date:
-                    try:
-                        from email.utils import parsedate_to_datetime
-
-                        article_date = parsedate_to_datetime(article.pub_date)
-                    except:
-                        pass
-
-                # If we successfully parsed the date and it's older than cutoff
-                if article_date and article_date < cutoff_date:
-                    db.delete(article)
-                    deleted_count += 1
-
-            except Exception:
-                # If we can't parse the date, skip this article
-                continue
-
-    db.commit()
+    deleted_count = 0
+    while True:
+        batch_ids = (
+            db.query(Article.id)
+            .filter(Article.published_at < cutoff_date)
+            .limit(ARTICLE_DELETE_BATCH_SIZE)
+            .scalar_subquery()
+        )
+        deleted_rows = db.execute(
+            delete(Article)
+            .where(Article.id.in_(batch_ids))
+            .returning(Article.feed_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        deleted = len(deleted_rows)
+        # Keep the affected feeds' counters in step within the same transaction
+        affected_feeds = {feed_id for (feed_id,) in deleted_rows}
+        recount_feed_counters(db, affected_feeds)
+        # Deleted entries still in a feed's document are stored again
+        seen_entries.forget(affected_feeds)
+        db.commit()
+        deleted_count += deleted
+        if deleted < ARTICLE_DELETE_BATCH_SIZE:
+            break
     return deleted_count
 
 
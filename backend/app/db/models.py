@@ -1,14 +1,18 @@
 # SQLAlchemy models for feeds, folders, articles
 from app.db.database import Base
 from sqlalchemy import (
+    DDL,
     Boolean,
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
+    event,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -18,6 +22,9 @@ class Folder(Base):
     __tablename__ = "folders"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True)
+    # Sums of the feed counters below, maintained by app.db.crud
+    unread_count = Column(Integer, default=0, nullable=False)
+    total_count = Column(Integer, default=0, nullable=False)
     feeds = relationship("Feed", back_populates="folder")
 
 
@@ -30,11 +37,39 @@ class Feed(Base):
     title = Column(String, index=True)
     description = Column(Text, nullable=True)  # Add description field
     favicon = Column(String, nullable=True)  # Add favicon field to Feed
+    # HTTP validators from the last successful fetch, used for conditional GETs
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the last body
+    # Fetch failure tracking for backoff and the circuit breaker
+    consecutive_failures = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    last_failure_at = Column(DateTime(timezone=True), nullable=True)
+    next_retry_at = Column(DateTime(timezone=True), nullable=True)
+    circuit_state = Column(String(16), default="closed", nullable=False)
+    # Denormalized article counters, maintained by app.db.crud
+    unread_count = Column(Integer, default=0, nullable=False)
+    total_count = Column(Integer, default=0, nullable=False)
+    latest_article_at = Column(DateTime(timezone=True), nullable=True)
     folder_id = Column(Integer, ForeignKey("folders.id"), nullable=True)
     folder = relationship("Folder", back_populates="feeds")
     articles = relationship("Article", back_populates="feed")
 
 
+class Favicon(Base):
+    """Favicon of a site, shared by every feed on the same scheme and host"""
+
+    __tablename__ = "favicons"
+    id = Column(Integer, primary_key=True, index=True)
+    domain = Column(String, unique=True, index=True, nullable=False)
+    # None when the site has no usable icon; the row then caches the miss
+    icon_url = Column(String, nullable=True)
+    content_type = Column(String, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of data
+    data = Column(LargeBinary, nullable=True)
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+
+
 class Article(Base):
     __tablename__ = "articles"
     id = Column(Integer, primary_key=True, index=True)
@@ -45,15 +80,73 @@ class Article(Base):
     image_url = Column(String, nullable=True)
     is_read = Column(Boolean, default=False)
     guid = Column(String, nullable=True)
-    published_at = Column(String, nullable=True)  # For test compatibility
+    published_at = Column(DateTime(timezone=True), nullable=True)
     description = Column(Text, nullable=True)  # Add description field for tests
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     feed_id = Column(Integer, ForeignKey("feeds.id"), nullable=False)
     feed = relationship("Feed", back_populates="articles")
 
-    # Add unique constraint for (feed_id, guid) to ensure uniqueness within feed
-    __table_args__ = (UniqueConstraint("feed_id", "guid", name="_feed_guid_uc"),)
+    __table_args__ = (
+        # Add unique constraint for (feed_id, guid) to ensure uniqueness within feed
+        UniqueConstraint("feed_id", "guid", name="_feed_guid_uc"),
+        # Keyset pagination of the timeline, globally and per feed
+        Index("ix_articles_published_at_id", "published_at", "id"),
+        Index("ix_articles_feed_id_published_at_id", "feed_id", "published_at", "id"),
+    )
+
+
+# Full-text search index over article title, description and content. The
+# search query itself lives in app.db.crud.search_articles.
+#
+# PostgreSQL keeps a weighted tsvector in a generated column with a GIN index.
+ARTICLE_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'C')"
+)
+for statement in (
+    "ALTER TABLE articles ADD COLUMN search_vector tsvector "
+    f"GENERATED ALWAYS AS ({ARTICLE_SEARCH_VECTOR_SQL}) STORED",
+    "CREATE INDEX ix_articles_search_vector ON articles USING gin (search_vector)",
+):
+    event.listen(
+        Article.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
+
+# SQLite uses an external-content FTS5 table kept in step by triggers. The
+# update trigger only fires for the indexed columns, so read-state changes
+# do not touch the index.
+ARTICLE_FTS_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE articles_fts USING fts5("
+    "title, description, content, content='articles', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER articles_fts_insert AFTER INSERT ON articles BEGIN "
+    "INSERT INTO articles_fts(rowid, title, description, content) "
+    "VALUES (new.id, new.title, new.description, new.content); END",
+    "CREATE TRIGGER articles_fts_delete AFTER DELETE ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, description, content) "
+    "VALUES ('delete', old.id, old.title, old.description, old.content); END",
+    "CREATE TRIGGER articles_fts_update "
+    "AFTER UPDATE OF title, description, content ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, description, content) "
+    "VALUES ('delete', old.id, old.title, old.description, old.content); "
+    "INSERT INTO articles_fts(rowid, title, description, content) "
+    "VALUES (new.id, new.title, new.description, new.content); END",
+)
+for statement in ARTICLE_FTS_SQLITE_DDL:
+    event.listen(
+        Article.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+event.listen(
+    Article.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS articles_fts").execute_if(dialect="sqlite"),
+)
 
 
 class Settings(Base):
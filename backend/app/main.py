@@ -1,11 +1,16 @@
 import logging
+import math
 import os
 import time
 
 from app.api.v1.api import router as api_v1_router
 from app.api.v1.endpoints.metrics import increment_http_requests
 from app.db.database import Base, engine, health_check_database
+from app.services import http_client
 from app.services.background_tasks import background_manager
+from app.services.feed_import import feed_importer
+from app.services.feed_parser import HostDeferredError
+from app.services.refresh_jobs import refresh_jobs
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -126,9 +131,20 @@ async def check_database_connection(request, call_next):
 app.include_router(api_v1_router, prefix="/api/v1")
 
 
+@app.exception_handler(HostDeferredError)
+async def host_deferred_handler(request, exc: HostDeferredError):
+    """An upstream host asked us to slow down; fail fast and say when to retry"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
 @app.on_event("startup")
 async def start_background_tasks():
     """Start background tasks if database is available"""
+    http_client.startup()
     if engine is not None:
         try:
             logger.info("🚀 Starting background task manager...")
@@ -149,3 +165,6 @@ async def stop_background_tasks():
         logger.info("✅ Background tasks stopped successfully")
     except Exception as e:
         logger.error(f"❌ Error stopping background tasks: {str(e)}")
+    refresh_jobs.stop()
+    feed_importer.shutdown()
+    http_client.shutdown()
@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator, model_validator
 
 
 class ArticleBase(BaseModel):
@@ -46,3 +46,55 @@ class Article(ArticleBase):
         return str(v)
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ArticlePage(BaseModel):
+    """One page of the article timeline"""
+
+    items: list[Article]
+    next_cursor: Optional[str] = None  # Pass back as ``cursor`` for the next page
+
+
+class ArticleSearchResult(Article):
+    """Article matching a search, with its relevance and a highlighted excerpt"""
+
+    score: float
+    snippet: Optional[str] = None  # Matches wrapped in <mark>...</mark>
+
+
+class ArticleSearchPage(BaseModel):
+    """One page of search results, best match first"""
+
+    items: list[ArticleSearchResult]
+    next_cursor: Optional[str] = None  # Pass back as ``cursor`` for the next page
+
+
+class ArticleReadUpdate(BaseModel):
+    """Set the read state of every article matching the given scope.
+
+    Scopes combine, e.g. ``feed_id`` with ``before`` marks the feed's
+    articles older than a timeline cursor. At least one is required.
+    """
+
+    is_read: bool = True
+    article_ids: Optional[list[int]] = None
+    feed_id: Optional[int] = None
+    folder_id: Optional[int] = None
+    before: Optional[str] = None  # A timeline ``next_cursor``
+
+    @model_validator(mode="after")
+    def require_scope(self):
+        if (
+            self.article_ids is None
+            and self.feed_id is None
+            and self.folder_id is None
+            and self.before is None
+        ):
+            raise ValueError(
+                "Specify article_ids, feed_id, folder_id or before to select articles"
+            )
+        return self
+
+
+class ArticleReadResult(BaseModel):
+    updated: int
@@ -1,5 +1,6 @@
 # Feed schemas
 import uuid
+from datetime import datetime
 from typing import List, Optional
 
 from app.schemas.article import Article  # Import Article schema
@@ -26,7 +27,7 @@ class Feed(FeedBase):
     site_url: str | None = None
     description: str | None = None
     folder_id: str | None = None
-    favicon: str | None = None  # Add favicon to schema
+    favicon: str | None = None  # Icon URL; discovered icons use GET /feeds/{id}/icon
     articles: list[Article] = []  # Add articles field with correct Pydantic type
 
     @field_validator("id", mode="before")
@@ -42,3 +43,96 @@ class Feed(FeedBase):
         return str(v)
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class FeedSummary(FeedBase):
+    """Feed without its articles, plus article aggregates for list views"""
+
+    id: str
+    title: str
+    feed_url: str | None = None
+    site_url: str | None = None
+    description: str | None = None
+    folder_id: str | None = None
+    favicon: str | None = None
+    unread_count: int = 0
+    total_count: int = 0
+    latest_article_at: datetime | None = None
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def convert_id_to_str(cls, v):
+        return str(v)
+
+    @field_validator("folder_id", mode="before")
+    @classmethod
+    def convert_folder_id_to_str(cls, v):
+        if v is None:
+            return None
+        return str(v)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FeedHealth(BaseModel):
+    """Fetch failure state of a feed"""
+
+    id: str
+    title: str | None = None
+    url: str
+    consecutive_failures: int = 0
+    last_error: str | None = None
+    last_failure_at: datetime | None = None
+    next_retry_at: datetime | None = None
+    circuit_state: str = "closed"
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def convert_id_to_str(cls, v):
+        return str(v)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FeedRefreshJob(BaseModel):
+    """A queued manual refresh; poll it until ``status`` is final"""
+
+    id: str
+    feed_id: str
+    status: str
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    new_articles: int | None = None
+    error: str | None = None
+
+    @field_validator("feed_id", mode="before")
+    @classmethod
+    def convert_feed_id_to_str(cls, v):
+        return str(v)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FeedRefreshBatch(BaseModel):
+    """Progress of refreshes queued together; poll until ``finished_at`` is set"""
+
+    id: str
+    created_at: datetime
+    finished_at: datetime | None = None
+    total: int
+    queued: int
+    running: int
+    succeeded: int
+    failed: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OpmlImportResult(BaseModel):
+    """Outcome of an OPML import; the new feeds' first fetch runs in ``refresh``"""
+
+    feeds_created: int
+    feeds_existing: int
+    folders_created: int
+    refresh: FeedRefreshBatch
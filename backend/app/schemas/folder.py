@@ -1,6 +1,7 @@
 # Folder schemas
 from typing import List
 
+from app.schemas.feed import FeedSummary
 from pydantic import BaseModel, ConfigDict, field_serializer, field_validator
 
 
@@ -18,7 +19,9 @@ class FolderUpdate(BaseModel):
 
 class Folder(FolderBase):
     id: str
-    feeds: list = []  # Add feeds relationship for tests
+    unread_count: int = 0
+    total_count: int = 0
+    feeds: list[FeedSummary] = []
 
     @field_validator("id", mode="before")
     @classmethod
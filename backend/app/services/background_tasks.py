@@ -1,20 +1,45 @@
 # Background tasks service
+import asyncio
 import logging
 import threading
 import time
 
+from app.api.v1.endpoints.metrics import (
+    increment_articles_scraped,
+    observe_feed_refresh_cycle,
+)
+from app.core.config import settings as app_settings
 from app.db import crud, database, models
+from app.services.feed_health import retry_not_before
+from app.services.refresh_engine import RefreshEngine
+from app.services.scheduler import FeedScheduler
 from sqlalchemy.orm import Session
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Longest the main loop sleeps, so new feeds and cleanup are picked up promptly
+MAX_IDLE_SECONDS = 60
+# How often the denormalized article counters are checked against the articles
+RECONCILE_INTERVAL_SECONDS = 24 * 60 * 60
+MIN_REFRESH_INTERVAL_SECONDS = (
+    app_settings.FEED_REFRESH_MIN_INTERVAL_MINUTES if app_settings else 5
+) * 60
+MAX_REFRESH_INTERVAL_SECONDS = (
+    app_settings.FEED_REFRESH_MAX_INTERVAL_MINUTES if app_settings else 24 * 60
+) * 60
+
 
 class BackgroundTaskManager:
     def __init__(self):
         self.is_running = False
         self.thread = None
+        self.loop = None
+        self.refresh_engine = RefreshEngine()
+        self.scheduler = FeedScheduler(
+            MIN_REFRESH_INTERVAL_SECONDS, MAX_REFRESH_INTERVAL_SECONDS
+        )
 
     def start(self, app):
         """Start the background task manager"""
@@ -35,8 +60,12 @@ class BackgroundTaskManager:
 
     def _run_background_tasks(self):
         """Main loop for background tasks"""
-        last_refresh = 0
         last_cleanup = 0
+        last_reconcile = 0
+
+        # The refresh engine's HTTP client is bound to this loop, so it lives
+        # as long as the background thread does
+        self.loop = asyncio.new_event_loop()
 
         while self.is_running:
             try:
@@ -45,13 +74,16 @@ class BackgroundTaskManager:
                 with database.SessionLocal() as db:
                     settings = crud.get_settings(db)
 
-                    # Check if it's time to refresh feeds
+                    # Refresh the feeds whose adaptive interval has elapsed;
+                    # feeds without history use the configured interval
                     refresh_interval = (
                         settings.refresh_interval_minutes * 60
                     )  # Convert to seconds
-                    if current_time - last_refresh >= refresh_interval:
-                        self._refresh_all_feeds(db)
-                        last_refresh = current_time
+                    feed_ids = [feed_id for (feed_id,) in db.query(models.Feed.id)]
+                    self.scheduler.sync(feed_ids, current_time)
+                    due_feed_ids = self.scheduler.pop_due(current_time)
+                    if due_feed_ids:
+                        self._refresh_due_feeds(db, due_feed_ids, refresh_interval)
 
                     # Check if it's time to cleanup articles (run cleanup every 24 hours)
                     cleanup_interval = 24 * 60 * 60  # 24 hours in seconds
@@ -61,26 +93,67 @@ class BackgroundTaskManager:
                         self._auto_cleanup_articles(db, settings.auto_cleanup_days)
                         last_cleanup = current_time
 
-                # Sleep for 60 seconds before next check
-                time.sleep(60)
+                    # Repair any drift in the denormalized unread counters once a day
+                    if current_time - last_reconcile >= RECONCILE_INTERVAL_SECONDS:
+                        self._reconcile_counters(db)
+                        last_reconcile = current_time
+
+                # Sleep until the next feed is due, checking in at least every minute
+                time.sleep(self._idle_seconds())
 
             except Exception as e:
                 logger.error(f"Error in background task: {e}")
                 time.sleep(60)  # Wait before retrying
 
-    def _refresh_all_feeds(self, db: Session):
-        """Refresh all feeds"""
-        from app.services.feed_parser import fetch_and_save_articles_for_feed
-
-        feeds = db.query(models.Feed).all()
-        logger.info(f"Starting feed refresh for {len(feeds)} feeds")
-
+        self.loop.run_until_complete(self.refresh_engine.aclose())
+        self.loop.close()
+        self.loop = None
+
+    def _idle_seconds(self) -> float:
+        until_due = self.scheduler.seconds_until_next_due(time.time())
+        if until_due is None:
+            return MAX_IDLE_SECONDS
+        return max(1.0, min(MAX_IDLE_SECONDS, until_due))
+
+    def _refresh_due_feeds(
+        self, db: Session, feed_ids: list[int], default_interval: float
+    ):
+        """Refresh the due feeds concurrently and schedule their next refresh"""
+        feeds = db.query(models.Feed).filter(models.Feed.id.in_(feed_ids)).all()
+        logger.info(
+            f"Starting feed refresh for {len(feeds)} due feeds "
+            f"(concurrency {self.refresh_engine.concurrency})"
+        )
+
+        stats = self.loop.run_until_complete(
+            self.refresh_engine.refresh_feeds(feeds, db)
+        )
+        increment_articles_scraped(stats.new_articles)
+        observe_feed_refresh_cycle(
+            stats.wall_time_seconds, stats.feeds_per_second, stats.failed
+        )
+        logger.info(
+            f"Feed refresh finished in {stats.wall_time_seconds:.1f}s: "
+            f"{stats.succeeded} ok ({stats.unchanged} unchanged), "
+            f"{stats.failed} failed, {stats.skipped} backing off, "
+            f"{stats.deferred} deferred by their hosts, "
+            f"{stats.new_articles} new articles, "
+            f"{stats.feeds_per_second:.2f} feeds/sec"
+        )
+
+        now = time.time()
+        history = crud.get_recent_publication_times(db, feed_ids)
         for feed in feeds:
-            try:
-                result = fetch_and_save_articles_for_feed(feed, db)
-                logger.info(f"Feed {feed.id} ({feed.title}): {result}")
-            except Exception as e:
-                logger.error(f"Error refreshing feed {feed.id}: {e}")
+            # Failing and deferred feeds are not picked up again before their
+            # retry time
+            retry_at = retry_not_before(feed)
+            self.scheduler.reschedule(
+                feed.id,
+                history.get(feed.id, []),
+                default_interval,
+                now,
+                not_before=retry_at.timestamp() if retry_at else None,
+            )
 
     def _auto_cleanup_articles(self, db: Session, days: int):
         """Automatically cleanup old articles"""
@@ -92,6 +165,15 @@ class BackgroundTaskManager:
         except Exception as e:
             logger.error(f"Error during auto cleanup: {e}")
 
+    def _reconcile_counters(self, db: Session):
+        """Recompute feed and folder counters that disagree with the articles"""
+        try:
+            drifted = crud.reconcile_counters(db)
+            if drifted:
+                logger.warning(f"Reconciled article counters for {drifted} feeds")
+        except Exception as e:
+            logger.error(f"Error reconciling article counters: {e}")
+
 
 # Global instance
 background_manager = BackgroundTaskManager()
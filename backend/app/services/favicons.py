@@ -0,0 +1,197 @@
+# Per-site favicon cache: discovery from the homepage <head>, stored icon bytes
+import codecs
+import hashlib
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import httpx
+from app.core.config import settings
+from app.db import models
+from app.services import http_client
+from app.services.feed_parser import HostDeferredError, host_limiter
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_FAVICON_TTL_HOURS = 7 * 24
+# Homepages are read up to </head>, but never further than this
+MAX_HEAD_BYTES = 256 * 1024
+# Larger icons are not cached
+MAX_ICON_BYTES = 256 * 1024
+
+
+def feed_icon_path(feed_id: int) -> str:
+    """Where clients load a feed's icon: the cached copy, not the origin"""
+    return f"/api/v1/feeds/{feed_id}/icon"
+
+
+def favicon_ttl() -> timedelta:
+    hours = settings.FAVICON_TTL_HOURS if settings else DEFAULT_FAVICON_TTL_HOURS
+    return timedelta(hours=hours)
+
+
+class _HeadParsed(Exception):
+    pass
+
+
+class IconLinkParser(HTMLParser):
+    """Finds the first ``<link rel="...icon...">`` in a page's <head>.
+
+    Fed the page chunk by chunk; raises _HeadParsed at the first icon link,
+    ``</head>`` or ``<body>``, so nothing after the head is parsed.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.href: str | None = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            raise _HeadParsed
+        if tag != "link":
+            return
+        attrs = dict(attrs)
+        rel = (attrs.get("rel") or "").lower().split()
+        if attrs.get("href") and any("icon" in token for token in rel):
+            self.href = attrs["href"].strip()
+            raise _HeadParsed
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            raise _HeadParsed
+
+
+def find_icon_link(response: httpx.Response) -> str | None:
+    """Icon href from the head of a streamed HTML response, as written"""
+    try:
+        decoder = codecs.getincrementaldecoder(response.charset_encoding or "utf-8")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")
+    decoder = decoder(errors="replace")
+    parser = IconLinkParser()
+    received = 0
+    try:
+        for chunk in response.iter_bytes():
+            parser.feed(decoder.decode(chunk))
+            received += len(chunk)
+            if received >= MAX_HEAD_BYTES:
+                break
+    except _HeadParsed:
+        pass
+    return parser.href
+
+
+@contextmanager
+def _polite_stream(url: str):
+    """Streamed GET respecting the host's rate limit; raises
+    HostDeferredError when the host is, or now asks to be, left alone"""
+    host_limiter.wait(url)
+    with http_client.stream(url) as response:
+        host_limiter.observe(url, response)
+        host_limiter.raise_if_deferred(url)
+        yield response
+
+
+def discover_icon_url(site_url: str) -> str:
+    """The site's declared icon, or /favicon.ico when it declares none"""
+    href = None
+    try:
+        with _polite_stream(site_url) as response:
+            response.raise_for_status()
+            href = find_icon_link(response)
+            # Relative hrefs resolve against the page after redirects
+            site_url = str(response.url)
+    except HostDeferredError:
+        raise
+    except Exception as e:
+        logger.info(f"Could not read {site_url} for its icon link: {e}")
+    if href:
+        return urljoin(site_url, href)
+    return urljoin(http_client.host_key(site_url), "/favicon.ico")
+
+
+def download_icon(icon_url: str) -> tuple[bytes, str] | None:
+    """Icon bytes and content type, or None for missing or oversized icons"""
+    with _polite_stream(icon_url) as response:
+        if response.status_code != 200:
+            return None
+        content_type = response.headers.get("Content-Type", "").split(";")[0]
+        if not content_type.startswith("image/"):
+            # Servers often label .ico files as octet-stream
+            if not icon_url.lower().endswith(".ico"):
+                return None
+            content_type = "image/x-icon"
+        data = bytearray()
+        for chunk in response.iter_bytes():
+            data.extend(chunk)
+            if len(data) > MAX_ICON_BYTES:
+                return None
+    return bytes(data), content_type
+
+
+def _refresh(favicon: models.Favicon, site_url: str):
+    """Look the site's icon up again and store it on the row (no commit)"""
+    icon_url = discover_icon_url(site_url)
+    try:
+        icon = download_icon(icon_url)
+    except HostDeferredError:
+        raise
+    except Exception as e:
+        logger.info(f"Could not download icon {icon_url}: {e}")
+        icon = None
+    favicon.fetched_at = datetime.now(timezone.utc)
+    if icon is None:
+        # Keep an icon from an earlier fetch; a miss is cached for one TTL
+        if favicon.data is None:
+            favicon.icon_url = None
+        return
+    data, favicon.content_type = icon
+    favicon.icon_url = icon_url
+    favicon.data = data
+    favicon.content_hash = hashlib.sha256(data).hexdigest()
+
+
+def _is_fresh(favicon: models.Favicon, now: datetime) -> bool:
+    fetched_at = favicon.fetched_at
+    if fetched_at.tzinfo is None:
+        fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+    return now - fetched_at < favicon_ttl()
+
+
+def get_favicon(db: Session, site_url: str) -> models.Favicon:
+    """The cached favicon of the site's domain, fetched when missing or stale.
+
+    Feeds on the same scheme and host share one row, so the homepage and
+    icon are downloaded once per domain and TTL rather than once per feed.
+    Check ``data`` for whether the site has an icon. While the site's host
+    asks us to slow down a stale icon is returned as is, and a missing one
+    raises HostDeferredError.
+    """
+    domain = http_client.host_key(site_url)
+    favicon = db.query(models.Favicon).filter_by(domain=domain).first()
+    if favicon is not None and _is_fresh(favicon, datetime.now(timezone.utc)):
+        return favicon
+
+    is_new = favicon is None
+    if is_new:
+        favicon = models.Favicon(domain=domain)
+    try:
+        _refresh(favicon, site_url)
+    except HostDeferredError:
+        if is_new:
+            raise
+        return favicon
+    try:
+        if is_new:
+            db.add(favicon)
+        db.commit()
+    except IntegrityError:
+        # Another worker cached the domain first
+        db.rollback()
+        favicon = db.query(models.Favicon).filter_by(domain=domain).one()
+    return favicon
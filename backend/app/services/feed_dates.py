@@ -0,0 +1,127 @@
+# Normalize feed timestamps to timezone-aware UTC datetimes
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+
+try:
+    # feedparser's private date handlers cover shapes the parsers below miss;
+    # requirements.txt pins the release
+    from feedparser.datetimes import _parse_date
+except (ImportError, AttributeError):  # moved in another feedparser release
+    _parse_date = None
+
+# Feeds repeat the same timestamps on every refresh, so parses are memoized
+DATE_CACHE_SIZE = 4096
+
+# "Mon, 02 Jan 2023 10:00:00 GMT" and "2 Jan 2023 10:00 +0100"
+_RFC822_RE = re.compile(
+    r"\s*(?:[A-Za-z]{3},?\s*)?(\d{1,2})\s+([A-Za-z]{3})[a-z]*\s+(\d{4})"
+    r"\s+(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([+-]\d{4}|[A-Za-z]{1,3})?\s*"
+)
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun")
+        + ("jul", "aug", "sep", "oct", "nov", "dec"),
+        start=1,
+    )
+}
+# Zone names RFC 822 allows; anything else falls through to the slow path
+_ZONE_HOURS = {
+    "gmt": 0,
+    "ut": 0,
+    "utc": 0,
+    "z": 0,
+    "est": -5,
+    "edt": -4,
+    "cst": -6,
+    "cdt": -5,
+    "mst": -7,
+    "mdt": -6,
+    "pst": -8,
+    "pdt": -7,
+}
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _parse_rfc822(value: str) -> datetime | None:
+    match = _RFC822_RE.fullmatch(value)
+    if match is None:
+        return None
+    day, month, year, hour, minute, second, zone = match.groups()
+    month = _MONTHS.get(month.lower())
+    if month is None:
+        return None
+    if zone is None:
+        offset = 0
+    elif zone[0] in "+-":
+        offset = int(zone[1:3]) * 60 + int(zone[3:5])
+        if zone[0] == "-":
+            offset = -offset
+    elif zone.lower() in _ZONE_HOURS:
+        offset = _ZONE_HOURS[zone.lower()] * 60
+    else:
+        return None
+    parsed = datetime(
+        int(year),
+        month,
+        int(day),
+        int(hour),
+        int(minute),
+        int(second or 0),
+        tzinfo=timezone.utc,
+    )
+    return parsed - timedelta(minutes=offset)
+
+
+def _parse_iso8601(value: str) -> datetime | None:
+    if not value[:4].isdigit():
+        return None
+    return _as_utc(datetime.fromisoformat(value.strip()))
+
+
+def _parse_slow(value: str) -> datetime | None:
+    try:
+        return _as_utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError, IndexError):
+        pass
+    if _parse_date is None:
+        return None
+    # feedparser knows many odd shapes; it returns a UTC struct_time
+    parsed = _parse_date(value)
+    if parsed is None:
+        return None
+    return datetime(*parsed[:6], tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_feed_date(value: str) -> datetime | None:
+    """Parse a feed timestamp into an aware UTC datetime, or None.
+
+    RFC 822 (RSS) and ISO 8601 (Atom) are handled directly; anything else
+    goes through email.utils and then feedparser's date handlers, when
+    the installed feedparser still has them.
+    """
+    for parse in (_parse_rfc822, _parse_iso8601, _parse_slow):
+        try:
+            parsed = parse(value)
+        except (ValueError, OverflowError):
+            continue
+        if parsed is not None:
+            return parsed
+    return None
+
+
+def standardize_date(date_str: str) -> datetime:
+    """Convert various date formats to an aware UTC datetime.
+
+    Missing or unparseable dates fall back to the current time.
+    """
+    parsed = parse_feed_date(date_str) if date_str else None
+    return parsed or datetime.now(timezone.utc)
@@ -0,0 +1,148 @@
+# Map parsed feed entries to articles.
+#
+# Pure CPU work with no database access, so it can run in parse pool workers.
+import re
+from typing import Collection
+from urllib.parse import urljoin, urlparse
+
+from app.schemas.article import ArticleCreate
+from app.services.feed_dates import standardize_date
+from app.services.feed_stream import parse_document
+
+# <img src> and og:/twitter:image <meta> tags, matched together so each
+# content blob is scanned once
+_IMAGE_TAG_RE = re.compile(
+    r"""<img[^>]+src=["'](?P<img>.*?)["'][^>]*>"""
+    r"""|<meta[^>]+(?:property=["']og:(?P<og>image)"""
+    r"""|name=["']twitter:image)["'][^>]+content=["'](?P<meta>.*?)["'][^>]*>""",
+    re.IGNORECASE,
+)
+
+
+def _absolute(url: str, base_url: str | None) -> str:
+    if base_url and not url.startswith(("http://", "https://")):
+        return urljoin(base_url, url)
+    return url
+
+
+def _is_image(media) -> bool:
+    # feedparser gives FeedParserDicts for enclosures but plain dicts for media:*
+    kind = media.get("type") or ""
+    return kind.startswith("image/") or media.get("medium") == "image"
+
+
+def extract_image_url(entry, base_url=None):
+    """Extract image URL from RSS entry using multiple methods.
+
+    In order of preference: an image enclosure, media:content,
+    media:thumbnail, the first <img> in the content, the entry's image or
+    itunes:image, then an og:image or twitter:image meta tag.
+    """
+    for enclosure in entry.get("enclosures") or ():
+        if (enclosure.get("type") or "").startswith("image/"):
+            return enclosure.get("href")
+
+    for media in entry.get("media_content") or ():
+        if _is_image(media) and media.get("url"):
+            return media.get("url")
+
+    for thumb in entry.get("media_thumbnail") or ():
+        return thumb.get("url")
+
+    # feedparser aliases description to summary, so skip repeated blobs
+    blobs = [content.get("value") for content in entry.get("content") or ()]
+    blobs.append(entry.get("summary"))
+    if entry.get("description") is not entry.get("summary"):
+        blobs.append(entry.get("description"))
+
+    og_image = twitter_image = None
+    for blob in blobs:
+        if not blob or "<" not in blob:
+            continue
+        for match in _IMAGE_TAG_RE.finditer(blob):
+            img_url = match.group("img")
+            if img_url is None:
+                if match.group("og"):
+                    og_image = og_image or match.group("meta")
+                else:
+                    twitter_image = twitter_image or match.group("meta")
+                continue
+            # Skip data URLs and small icons
+            if img_url.startswith("data:") or "icon" in img_url.lower():
+                continue
+            return _absolute(img_url, base_url)
+
+    image = entry.get("image")
+    if image:
+        if isinstance(image, dict) and "href" in image:
+            return image["href"]
+        elif isinstance(image, str):
+            return image
+
+    itunes_image = entry.get("itunes_image")
+    if isinstance(itunes_image, dict) and "href" in itunes_image:
+        return itunes_image["href"]
+
+    meta_image = og_image or twitter_image
+    if meta_image:
+        return _absolute(meta_image, base_url)
+    return None
+
+
+def articles_from_entries(
+    feed_id: int, entries, site_link: str | None, seen: Collection[str] | None = None
+) -> list[ArticleCreate]:
+    """Map parsed entries (from feedparser or the fast parser) to articles.
+
+    Entries whose guid or link is in ``seen`` are skipped before any work.
+    """
+    # Extract base URL for relative image URL resolution
+    base_url = None
+    if site_link:
+        parsed_url = urlparse(site_link)
+        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+    articles = []
+    for entry in entries:
+        link = entry.get("link")
+        guid = entry.get("id", link)  # Use entry id or link as guid
+        if seen and (guid in seen or link in seen):
+            continue
+
+        # Extract image URL
+        image_url = extract_image_url(entry, base_url)
+
+        # Get and standardize the publication date
+        pub_date = entry.get("published", "")
+        if not pub_date and hasattr(entry, "updated"):
+            pub_date = entry.updated
+        standardized_date = standardize_date(pub_date)
+        # Get content from the most appropriate field
+        content = None
+        if hasattr(entry, "content") and entry.content:
+            content = entry.content[0].value
+        elif hasattr(entry, "summary"):
+            content = entry.summary
+        elif hasattr(entry, "description"):
+            content = entry.description
+
+        articles.append(
+            ArticleCreate(
+                title=entry.get("title", "No title"),
+                content=content or "",
+                link=link,
+                published_at=standardized_date,
+                image_url=image_url,
+                feed_id=feed_id,
+                guid=guid,
+            )
+        )
+    return articles
+
+
+def parse_articles(
+    feed_id: int, body: bytes, seen: Collection[str] | None = None
+) -> list[ArticleCreate]:
+    """Parse a whole feed document into articles for ``feed_id``"""
+    parsed = parse_document(body, seen)
+    return articles_from_entries(feed_id, parsed.entries, parsed.feed.get("link"), seen)
@@ -0,0 +1,89 @@
+# Feed fetch failure tracking: exponential backoff and circuit breaker
+from datetime import datetime, timedelta, timezone
+
+from app.db import models
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# First retry delay; doubles with every further consecutive failure
+BACKOFF_BASE_SECONDS = 5 * 60
+BACKOFF_MAX_SECONDS = 24 * 60 * 60
+# Consecutive failures after which the circuit opens
+CIRCUIT_FAILURE_THRESHOLD = 5
+# Stored error messages are truncated to keep feed rows small
+MAX_ERROR_LENGTH = 500
+
+
+def retry_delay_seconds(consecutive_failures: int) -> float:
+    """Exponential backoff delay after the given number of failures"""
+    if consecutive_failures <= 0:
+        return 0
+    exponent = min(consecutive_failures - 1, 32)
+    return min(BACKOFF_BASE_SECONDS * 2**exponent, BACKOFF_MAX_SECONDS)
+
+
+def record_fetch_failure(
+    feed: models.Feed, error: Exception | str, now: datetime | None = None
+):
+    """Count a failed refresh and push the next retry out (caller commits)"""
+    now = now or datetime.now(timezone.utc)
+    failures = (feed.consecutive_failures or 0) + 1
+    feed.consecutive_failures = failures
+    feed.last_error = str(error)[:MAX_ERROR_LENGTH]
+    feed.last_failure_at = now
+    feed.next_retry_at = now + timedelta(seconds=retry_delay_seconds(failures))
+    # Also reopens a half-open circuit whose trial refresh failed
+    if failures >= CIRCUIT_FAILURE_THRESHOLD:
+        feed.circuit_state = CIRCUIT_OPEN
+
+
+def record_fetch_deferred(
+    feed: models.Feed, seconds: float, now: datetime | None = None
+):
+    """Hold the feed back while its host asks us to slow down (caller commits).
+
+    Not a failure: the failure count and circuit are left alone.
+    """
+    now = now or datetime.now(timezone.utc)
+    retry_at = now + timedelta(seconds=seconds)
+    current = retry_not_before(feed)
+    if current is None or current < retry_at:
+        feed.next_retry_at = retry_at
+
+
+def record_fetch_success(feed: models.Feed):
+    """Close the circuit after a successful refresh (caller commits)"""
+    if not feed.consecutive_failures and feed.circuit_state in (None, CIRCUIT_CLOSED):
+        return
+    feed.consecutive_failures = 0
+    feed.last_error = None
+    feed.next_retry_at = None
+    feed.circuit_state = CIRCUIT_CLOSED
+
+
+def retry_not_before(feed: models.Feed) -> datetime | None:
+    """Earliest time the scheduler may refresh the feed again"""
+    if feed.next_retry_at is None:
+        return None
+    return _as_utc(feed.next_retry_at)
+
+
+def begin_fetch_attempt(feed: models.Feed, now: datetime | None = None) -> bool:
+    """Whether a scheduled refresh may run; an open circuit whose retry time
+    has passed moves to half-open and lets a single trial through."""
+    not_before = retry_not_before(feed)
+    now = now or datetime.now(timezone.utc)
+    if not_before is not None and now < not_before:
+        return False
+    if feed.circuit_state == CIRCUIT_OPEN:
+        feed.circuit_state = CIRCUIT_HALF_OPEN
+    return True
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything is stored in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
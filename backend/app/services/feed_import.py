@@ -0,0 +1,70 @@
+# Background half of adding a feed: first article import and favicon discovery
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from app.db import crud, database
+from app.services import favicons
+from app.services.feed_parser import FeedData
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMPORT_WORKERS = 4
+
+
+class FeedImporter:
+    """Finishes adding a feed after the create request has returned.
+
+    The endpoint stores the feed row from its parsed document and hands
+    the rest over. The document's articles are bulk inserted while the
+    site's favicon is looked up in the per-domain favicon cache, fetching
+    it on a miss. Each job runs on its own worker thread with its own
+    database session, so a slow homepage delays neither the response nor
+    the articles.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_IMPORT_WORKERS, session_factory=None):
+        self.session_factory = session_factory
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="feed-import"
+        )
+
+    def _session(self):
+        return (self.session_factory or database.SessionLocal)()
+
+    def submit(
+        self, feed_id: int, parsed: FeedData, find_favicon: bool = True
+    ) -> list[Future]:
+        """Start importing the feed's articles and, optionally, its favicon"""
+        jobs = [self.executor.submit(self._import_articles, feed_id, parsed)]
+        if find_favicon and parsed.site_url:
+            jobs.append(
+                self.executor.submit(self._find_favicon, feed_id, parsed.site_url)
+            )
+        return jobs
+
+    def _import_articles(self, feed_id: int, parsed: FeedData):
+        try:
+            with self._session() as db:
+                saved = crud.import_feed_articles(db, feed_id, parsed.articles)
+            logger.info(f"Feed {feed_id}: imported {saved} articles")
+        except Exception as e:
+            logger.error(f"Feed {feed_id}: error importing articles: {e}")
+
+    def _find_favicon(self, feed_id: int, site_url: str):
+        try:
+            with self._session() as db:
+                favicon = favicons.get_favicon(db, site_url)
+                # The icon's origin URL stays in the favicon cache; feeds
+                # point clients at the endpoint serving the cached copy
+                if favicon.data is not None:
+                    crud.set_feed_favicon(db, feed_id, favicons.feed_icon_path(feed_id))
+        except Exception as e:
+            logger.error(f"Feed {feed_id}: error finding favicon: {e}")
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global instance
+feed_importer = FeedImporter()
@@ -1,18 +1,32 @@
-import re
+import asyncio
+import threading
 import time
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
-from typing import List, Optional
-from urllib.parse import urljoin, urlparse
+from typing import Collection, List, Optional
 
 import feedparser
 import httpx
-import requests
+from app.core.config import settings
 from app.db import crud, database, models
 from app.schemas.article import ArticleCreate
-from bs4 import BeautifulSoup
+from app.services import http_client
+from app.services.feed_dates import standardize_date
+from app.services.feed_entries import (
+    articles_from_entries,
+    extract_image_url,
+    parse_articles,
+)
+from app.services.feed_health import (
+    record_fetch_deferred,
+    record_fetch_failure,
+    record_fetch_success,
+)
+from app.services.feed_stream import StreamedFeed, read_feed_stream
+from app.services.seen_entries import seen_entries
 from fastapi import BackgroundTasks
+from feedparser.util import FeedParserDict
 from sqlalchemy.orm import Session
 
 
@@ -36,40 +50,172 @@ class FeedData:
     articles: list[ArticleData]
 
 
-# Placeholder for feed parser service
+# Per-host politeness: sustained request rate, burst size and how long to
+# leave a host alone after it answers 429/503
+DEFAULT_HOST_REQUESTS_PER_SECOND = 1.0
+DEFAULT_HOST_BURST = 5
+DEFAULT_HOST_DEFER_SECONDS = 60
+MAX_HOST_DEFER_SECONDS = 60 * 60
+THROTTLED_STATUS_CODES = {429, 503}
 
 
-def standardize_date(date_str: str) -> datetime:
-    """Convert various date formats to datetime object"""
-    if not date_str:
-        return datetime.now()
+class HostDeferredError(Exception):
+    """The host answered 429/503 and the pause it asked for has not ended.
 
+    Raised instead of sleeping through the pause, which can last up to
+    MAX_HOST_DEFER_SECONDS; ``retry_after`` is the seconds left.
+    """
+
+    def __init__(self, url: str, retry_after: float):
+        super().__init__(
+            f"{http_client.host_key(url)} asked us to slow down; "
+            f"retry in {retry_after:.0f}s"
+        )
+        self.retry_after = retry_after
+
+
+class HostRateLimiter:
+    """Token bucket per host, plus a pause after the host asks us to slow down.
+
+    ``reserve`` books the caller's place in the host's queue and returns how
+    long to wait before sending; a deferred host holds everyone back until
+    its Retry-After time has passed. ``wait`` and ``wait_async`` only sleep
+    for the rate limit and raise HostDeferredError for a deferred host.
+    Thread-safe, and usable from asyncio since it never blocks itself.
+    """
+
+    def __init__(self, rate: float, burst: int, clock=time.monotonic):
+        self.interval = 1.0 / rate
+        self.tolerance = self.interval * (max(1, burst) - 1)
+        self.clock = clock
+        self._lock = threading.Lock()
+        # Theoretical arrival time of the next request (GCRA) and deferrals
+        self._next_at: dict[str, float] = {}
+        self._blocked_until: dict[str, float] = {}
+
+    def reserve(self, url: str) -> float:
+        """Take the host's next send slot; returns the seconds to wait for it"""
+        host = http_client.host_key(url)
+        with self._lock:
+            now = self.clock()
+            start = max(now, self._blocked_until.get(host, now))
+            next_at = max(self._next_at.get(host, start), start)
+            send_at = max(start, next_at - self.tolerance)
+            self._next_at[host] = next_at + self.interval
+            return send_at - now
+
+    def blocked_for(self, url: str) -> float:
+        """Seconds left before a deferred host may be contacted again"""
+        host = http_client.host_key(url)
+        with self._lock:
+            return max(0.0, self._blocked_until.get(host, 0.0) - self.clock())
+
+    def defer(self, url: str, seconds: float):
+        """Pause all requests to the host for ``seconds``"""
+        host = http_client.host_key(url)
+        with self._lock:
+            until = self.clock() + seconds
+            if until > self._blocked_until.get(host, 0.0):
+                self._blocked_until[host] = until
+                # Requests after the pause start from a fresh bucket
+                self._next_at[host] = until
+
+    def reset(self):
+        """Forget every host's rate and deferral state"""
+        with self._lock:
+            self._next_at.clear()
+            self._blocked_until.clear()
+
+    def raise_if_deferred(self, url: str):
+        blocked = self.blocked_for(url)
+        if blocked > 0:
+            raise HostDeferredError(url, blocked)
+
+    def wait(self, url: str):
+        """Block until the host's next send slot; raises HostDeferredError
+        while the host is deferred"""
+        self.raise_if_deferred(url)
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+            # A 429 seen while we slept
+            self.raise_if_deferred(url)
+
+    async def wait_async(self, url: str):
+        """``wait`` for coroutines"""
+        self.raise_if_deferred(url)
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+            self.raise_if_deferred(url)
+
+    def observe(self, url: str, response: httpx.Response):
+        """Defer the host when it answers 429 Too Many Requests / 503"""
+        if response.status_code in THROTTLED_STATUS_CODES:
+            self.defer(url, retry_after_seconds(response))
+
+
+def retry_after_seconds(response: httpx.Response) -> float:
+    """Delay requested by a Retry-After header (seconds or HTTP date)"""
+    value = response.headers.get("Retry-After")
+    delay = None
+    if value:
+        value = value.strip()
+        if value.isdigit():
+            delay = float(value)
+        else:
+            try:
+                retry_at = parsedate_to_datetime(value)
+                delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+    if delay is None:
+        delay = DEFAULT_HOST_DEFER_SECONDS
+    return min(max(delay, 0.0), MAX_HOST_DEFER_SECONDS)
+
+
+host_limiter = HostRateLimiter(
+    rate=(
+        settings.FEED_HOST_REQUESTS_PER_SECOND
+        if settings
+        else DEFAULT_HOST_REQUESTS_PER_SECOND
+    ),
+    burst=settings.FEED_HOST_BURST if settings else DEFAULT_HOST_BURST,
+)
+
+
+def fetch_feed_document(url: str) -> FeedParserDict:
+    """Download and parse a whole feed, politely and under the size cap.
+
+    Streams like a refresh, so FEED_MAX_BODY_BYTES applies (FeedTooLargeError)
+    and entries are parsed as they arrive. Raises HostDeferredError rather
+    than waiting out a host's 429/503 pause.
+    """
+    host_limiter.wait(url)
+    with http_client.stream(url) as response:
+        host_limiter.observe(url, response)
+        if response.status_code in THROTTLED_STATUS_CODES:
+            raise HostDeferredError(url, host_limiter.blocked_for(url))
+        response.raise_for_status()
+        body = read_feed_stream(response, url)
     try:
-        # Try parsing with email.utils (handles RFC822 format)
-        dt = parsedate_to_datetime(date_str)
-        return dt
-    except:
-        try:
-            # Try parsing with feedparser's date handling
-            dt = feedparser._parse_date(date_str)
-            if dt:
-                return dt
-        except:
-            pass
-    # If all parsing fails, return current time
-    return datetime.now()
+        if body.parser.failed:
+            return feedparser.parse(body.read_body())
+        return FeedParserDict(feed=body.parser.feed_info, entries=body.entries)
+    finally:
+        body.close()
 
 
 def parse_feed(url: str) -> FeedData:
     """Parse RSS feed from URL and return structured data"""
     try:
-        response = httpx.get(url, timeout=10)
-        response.raise_for_status()
+        parsed = fetch_feed_document(url)
+    except HostDeferredError:
+        raise
     except Exception as e:
         raise ValueError(f"Failed to fetch feed from {url}: {e}")
 
     try:
-        parsed = feedparser.parse(response.text)
 
         # Extract feed information
         feed_title = parsed.feed.get("title", "Untitled Feed")
@@ -104,169 +250,150 @@ def parse_feed(url: str) -> FeedData:
 def fetch_feed_title_and_url(url: str) -> dict:
     """Fetch just the title and URL information from a feed"""
     try:
-        response = httpx.get(url, timeout=10)
-        response.raise_for_status()
-
-        parsed = feedparser.parse(response.text)
+        parsed = fetch_feed_document(url)
         title = parsed.feed.get("title", "")
 
         return {"title": title, "url": url}
+    except HostDeferredError:
+        raise
     except Exception as e:
         raise ValueError(f"Could not fetch feed title: {e}")
 
 
-def extract_image_url(entry, base_url=None):
-    """Extract image URL from RSS entry using multiple methods"""
-
-    # Method 1: Check for enclosures (common in RSS)
-    if hasattr(entry, "enclosures") and entry.enclosures:
-        for enclosure in entry.enclosures:
-            if (
-                hasattr(enclosure, "type")
-                and enclosure.type
-                and enclosure.type.startswith("image/")
-            ):
-                return enclosure.href
-
-    # Method 2: Check for media:content or media:thumbnail
-    if hasattr(entry, "media_content") and entry.media_content:
-        for media in entry.media_content:
-            if (
-                hasattr(media, "type")
-                and media.type
-                and media.type.startswith("image/")
-            ):
-                return media.get("url")
-
-    if hasattr(entry, "media_thumbnail") and entry.media_thumbnail:
-        for thumb in entry.media_thumbnail:
-            return thumb.get("url")
-
-    # Method 3: Look for images in the content/summary HTML
-    content_to_search = []
-    if hasattr(entry, "content") and entry.content:
-        for content in entry.content:
-            content_to_search.append(content.value)
-    if hasattr(entry, "summary") and entry.summary:
-        content_to_search.append(entry.summary)
-    if hasattr(entry, "description") and entry.description:
-        content_to_search.append(entry.description)
-
-    for content in content_to_search:
-        if content:
-            # Look for img tags with more flexible matching
-            img_matches = re.finditer(
-                r'<img[^>]+src=["\'](.*?)["\'][^>]*>', content, re.IGNORECASE
-            )
-            for match in img_matches:
-                img_url = match.group(1)
-                # Skip data URLs and small icons
-                if img_url.startswith("data:") or "icon" in img_url.lower():
-                    continue
-                # Convert relative URLs to absolute if base_url is provided
-                if base_url and not img_url.startswith(("http://", "https://")):
-                    img_url = urljoin(base_url, img_url)
-                return img_url
-
-    # Method 4: Check for image field in entry
-    if hasattr(entry, "image") and entry.image:
-        if isinstance(entry.image, dict) and "href" in entry.image:
-            return entry.image["href"]
-        elif isinstance(entry.image, str):
-            return entry.image
-
-    # Method 5: Check for itunes:image
-    if hasattr(entry, "itunes_image") and entry.itunes_image:
-        if isinstance(entry.itunes_image, dict) and "href" in entry.itunes_image:
-            return entry.itunes_image["href"]
-
-    # Method 6: Check for og:image meta tag in content
-    for content in content_to_search:
-        if content:
-            og_match = re.search(
-                r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\'](.*?)["\'][^>]*>',
-                content,
-                re.IGNORECASE,
-            )
-            if og_match:
-                img_url = og_match.group(1)
-                if base_url and not img_url.startswith(("http://", "https://")):
-                    img_url = urljoin(base_url, img_url)
-                return img_url
-
-    # Method 7: Check for twitter:image meta tag in content
-    for content in content_to_search:
-        if content:
-            twitter_match = re.search(
-                r'<meta[^>]+name=["\']twitter:image["\'][^>]+content=["\'](.*?)["\'][^>]*>',
-                content,
-                re.IGNORECASE,
-            )
-            if twitter_match:
-                img_url = twitter_match.group(1)
-                if base_url and not img_url.startswith(("http://", "https://")):
-                    img_url = urljoin(base_url, img_url)
-                return img_url
+def conditional_request_headers(feed: models.Feed) -> dict:
+    """Build If-None-Match / If-Modified-Since headers from the last fetch"""
+    headers = {}
+    if feed.etag:
+        headers["If-None-Match"] = feed.etag
+    if feed.last_modified:
+        headers["If-Modified-Since"] = feed.last_modified
+    return headers
+
+
+def parse_while_streaming(feed: models.Feed) -> bool:
+    """Whether to parse a refresh's entries as the body downloads.
+
+    Only for feeds with no stored body hash: otherwise the body is hashed
+    first, so an unchanged one (see process_feed_response) costs no
+    parsing or sanitizing at all.
+    """
+    return feed.content_hash is None
+
+
+def process_feed_response(
+    feed: models.Feed,
+    response: httpx.Response,
+    db: Session,
+    body: StreamedFeed | None = None,
+    articles: list[ArticleCreate] | None = None,
+) -> int | None:
+    """Store new articles from a fetched feed response.
+
+    ``body`` is the streamed download of ``response``; ``articles`` are its
+    entries when they were already parsed elsewhere (the parse pool).
+    Returns None without saving when the server answered 304 Not Modified
+    or the body is identical to the last one processed, otherwise the
+    number of new articles saved.
+    """
+    if response.status_code == 304:
+        return None
+
+    new_articles = None
+    if body.content_hash != feed.content_hash:
+        if articles is None:
+            new_articles = save_streamed_feed(feed, body, db)
+        else:
+            new_articles = store_articles(feed, articles, db)
 
-    return None
+    # Only remember validators once the body has been stored, so a failed
+    # save is retried in full on the next refresh
+    feed.etag = response.headers.get("ETag")
+    feed.last_modified = response.headers.get("Last-Modified")
+    feed.content_hash = body.content_hash
+    record_fetch_success(feed)
+    db.commit()
+    return new_articles
 
 
 def fetch_and_save_articles_for_feed(feed: models.Feed, db: Session):
-    # Fetch feed data
+    # Stream the feed, letting the server tell us when nothing changed
+    body = None
     try:
-        response = httpx.get(feed.url, timeout=10)
-        response.raise_for_status()
+        host_limiter.wait(feed.url)
+        with http_client.stream(
+            feed.url, headers=conditional_request_headers(feed)
+        ) as response:
+            host_limiter.observe(feed.url, response)
+            if response.status_code != 304:
+                response.raise_for_status()
+                body = read_feed_stream(
+                    response,
+                    feed.url,
+                    parse=parse_while_streaming(feed),
+                    seen=seen_entries.get(db, feed.id),
+                )
+    except HostDeferredError as e:
+        record_fetch_deferred(feed, e.retry_after)
+        db.commit()
+        return f"Feed deferred: {e}"
     except Exception as e:
-        # Optionally log error
+        record_fetch_failure(feed, e)
+        db.commit()
         return f"Failed to fetch feed: {e}"
 
-    parsed = feedparser.parse(response.text)
-    new_articles = 0
-
-    # Extract base URL for relative image URL resolution
-    base_url = None
-    if hasattr(parsed.feed, "link") and parsed.feed.link:
-        parsed_url = urlparse(parsed.feed.link)
-        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-
-    for entry in parsed.entries:
-        link = entry.get("link")
-        # Deduplicate by feed_id + link
-        exists = db.query(models.Article).filter_by(feed_id=feed.id, link=link).first()
-        if exists:
-            continue
-
-        # Extract image URL
-        image_url = extract_image_url(entry, base_url)
-
-        # Get and standardize the publication date
-        pub_date = entry.get("published", "")
-        if not pub_date and hasattr(entry, "updated"):
-            pub_date = entry.updated
-        standardized_date = standardize_date(pub_date)
-        # Get content from the most appropriate field
-        content = None
-        if hasattr(entry, "content") and entry.content:
-            content = entry.content[0].value
-        elif hasattr(entry, "summary"):
-            content = entry.summary
-        elif hasattr(entry, "description"):
-            content = entry.description
-
-        article = ArticleCreate(
-            title=entry.get("title", "No title"),
-            content=content or "",
-            link=link,
-            published_at=standardized_date,
-            image_url=image_url,
-            feed_id=feed.id,
-            guid=entry.get("id", link),  # Use entry id or link as guid
-        )
-        crud.create_article(db, article)
-        new_articles += 1
+    try:
+        new_articles = process_feed_response(feed, response, db, body)
+    finally:
+        if body is not None:
+            body.close()
+    if new_articles is None:
+        return "Feed not modified."
     return f"Fetched and saved {new_articles} new articles."
 
 
+def store_articles(feed: models.Feed, articles: list[ArticleCreate], db: Session):
+    """Insert new articles and remember them as seen for later refreshes"""
+    # Deduplicate by feed_id + guid/link and insert in one batch
+    new_articles = crud.bulk_create_articles(db, feed.id, articles)
+    seen_entries.remember(feed.id, articles)
+    return new_articles
+
+
+def save_streamed_feed(feed: models.Feed, body: StreamedFeed, db: Session) -> int:
+    """Store the entries parsed while the feed was downloading, or parse
+    the downloaded body now when it was not parsed on the way in.
+
+    Bodies the incremental parser could not handle go through feedparser.
+    Entries the feed has already stored (``body.seen``) are skipped.
+    """
+    if body.parser is None:
+        articles = parse_articles(feed.id, body.read_body(), body.seen)
+    elif body.parser.failed:
+        return save_articles_from_feed_content(feed, body.read_body(), db, body.seen)
+    else:
+        articles = articles_from_entries(
+            feed.id, body.entries, body.parser.site_link, body.seen
+        )
+    return store_articles(feed, articles, db)
+
+
+def save_articles_from_feed_content(
+    feed: models.Feed,
+    body: str | bytes,
+    db: Session,
+    seen: Collection[str] | None = None,
+) -> int:
+    """Parse a downloaded feed body and store entries not seen before.
+
+    Returns the number of new articles saved.
+    """
+    parsed = feedparser.parse(body)
+    articles = articles_from_entries(
+        feed.id, parsed.entries, parsed.feed.get("link"), seen
+    )
+    return store_articles(feed, articles, db)
+
+
 # Periodic background refresh for all feeds
 def refresh_all_feeds(db: Session):
     feeds = db.query(models.Feed).all()
@@ -291,25 +418,4 @@ def schedule_periodic_refresh(app, interval_seconds=3600):
     thread.start()
 
 
-def fetch_favicon_url(site_url: str) -> str | None:
-    """Attempt to fetch the favicon URL from the given site URL."""
-    try:
-        resp = httpx.get(site_url, timeout=10)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        # Look for <link rel="icon"> or <link rel="shortcut icon">
-        icon_link = soup.find("link", rel=lambda x: x and "icon" in x.lower())
-        if icon_link and icon_link.get("href"):
-            href = icon_link["href"]
-            # Convert relative URLs to absolute
-            if not href.startswith("http://") and not href.startswith("https://"):
-                href = urljoin(site_url, href)
-            return href
-        # Fallback: try default /favicon.ico
-        parsed = urlparse(site_url)
-        return f"{parsed.scheme}://{parsed.netloc}/favicon.ico"
-    except Exception:
-        return None
-
-
 # In main.py, call schedule_periodic_refresh(app) in a startup event
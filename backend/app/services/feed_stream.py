@@ -0,0 +1,457 @@
+# Streaming, size-capped feed download with an incremental XML parse
+import hashlib
+import tempfile
+import xml.etree.ElementTree as ET
+from typing import Collection
+
+import feedparser
+from app.core.config import settings
+from feedparser.util import FeedParserDict
+
+try:
+    # feedparser's private HTML sniffing and sanitizing keep the fast parser's
+    # output identical to feedparser's; requirements.txt pins the release
+    from feedparser.mixin import _FeedParserMixin
+    from feedparser.sanitizer import _sanitize_html
+
+    _looks_like_html = _FeedParserMixin.looks_like_html
+except (ImportError, AttributeError):  # moved in another feedparser release
+    _looks_like_html = _sanitize_html = None
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # lxml is optional; ElementTree's expat parser is used instead
+    lxml_etree = None
+
+DEFAULT_MAX_FEED_BYTES = 10 * 1024 * 1024
+# Bodies are kept for the feedparser fallback; past this size they spill to disk
+SPOOL_MEMORY_BYTES = 1024 * 1024
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+RSS1_NS = "http://purl.org/rss/1.0/"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+MEDIA_NS = "http://search.yahoo.com/mrss/"
+ITUNES_NS = "http://www.itunes.com/dtds/podcast-1.0.dtd"
+XHTML_NS = "http://www.w3.org/1999/xhtml"
+
+ENTRY_TAGS = {"item", f"{{{RSS1_NS}}}item", f"{{{ATOM_NS}}}entry"}
+FEED_TAGS = {"channel", f"{{{RSS1_NS}}}channel", f"{{{ATOM_NS}}}feed"}
+
+XML_PARSE_ERRORS = (ET.ParseError,) + (
+    (lxml_etree.XMLSyntaxError,) if lxml_etree is not None else ()
+)
+
+
+def _pull_parser():
+    """XMLPullParser from lxml when available (faster), else ElementTree"""
+    if lxml_etree is not None:
+        return lxml_etree.XMLPullParser(
+            events=("start", "end"),
+            # Internal entities only, like expat; with entities off lxml stops
+            # silently at an undefined one such as &nbsp; instead of failing
+            resolve_entities="internal",
+            no_network=True,
+            remove_comments=True,
+            remove_pis=True,
+        )
+    return ET.XMLPullParser(events=("start", "end"))
+
+
+def _release(element, parent):
+    """Free a finished entry so long feeds parse in constant memory"""
+    element.clear()
+    if lxml_etree is not None and isinstance(element, lxml_etree._Element):
+        # lxml's parser still points at the element being closed; removing
+        # it mid-parse corrupts the tree, so only drop the finished siblings
+        # before it (the iterparse idiom)
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+    elif parent is not None:
+        parent.remove(element)
+
+
+def _tostring(element) -> str:
+    if lxml_etree is not None and isinstance(element, lxml_etree._Element):
+        return lxml_etree.tostring(element, encoding="unicode")
+    return ET.tostring(element, encoding="unicode")
+
+
+class FeedTooLargeError(ValueError):
+    """The feed body exceeded the configured maximum size"""
+
+
+def max_feed_bytes() -> int:
+    return settings.FEED_MAX_BODY_BYTES if settings else DEFAULT_MAX_FEED_BYTES
+
+
+def fast_parser_available() -> bool:
+    return _looks_like_html is not None and _sanitize_html is not None
+
+
+def _text(element) -> str:
+    if element is None or element.text is None:
+        return ""
+    return element.text.strip()
+
+
+def _html(value: str) -> str:
+    return _sanitize_html(value, "utf-8", "text/html") if value else value
+
+
+def _title(value: str) -> str:
+    # Titles are plain text unless they carry markup, as in feedparser
+    if _looks_like_html(value):
+        return _html(value)
+    return value.strip()
+
+
+def _inner_xhtml(element) -> str:
+    """Markup inside an Atom xhtml construct's wrapping <div>"""
+    container = element.find(f"{{{XHTML_NS}}}div")
+    if container is None:
+        container = element
+    # Serialize as plain HTML tags rather than namespaced ones
+    for child in container.iter():
+        child.tag = child.tag.rpartition("}")[2]
+    if lxml_etree is not None:
+        lxml_etree.cleanup_namespaces(container)
+    parts = [container.text or ""]
+    parts.extend(_tostring(child) for child in container)
+    return "".join(parts).strip()
+
+
+def _atom_text(element) -> str:
+    """Value of an Atom text construct (text, html or xhtml)"""
+    if element is None:
+        return ""
+    kind = element.get("type", "text")
+    if kind == "xhtml":
+        return _html(_inner_xhtml(element))
+    if kind in ("html", "text/html"):
+        return _html(_text(element))
+    return _title(_text(element))
+
+
+def _media(element) -> dict:
+    # feedparser keeps media:* as plain dicts and itunes:image as ``image``
+    media = {}
+    for content in element.iter(f"{{{MEDIA_NS}}}content"):
+        if content.get("url"):
+            media.setdefault("media_content", []).append(dict(content.attrib))
+    for thumbnail in element.iter(f"{{{MEDIA_NS}}}thumbnail"):
+        if thumbnail.get("url"):
+            media.setdefault("media_thumbnail", []).append(dict(thumbnail.attrib))
+    itunes_image = element.find(f"{{{ITUNES_NS}}}image")
+    if itunes_image is not None and itunes_image.get("href"):
+        media["image"] = FeedParserDict(href=itunes_image.get("href"))
+    return media
+
+
+def _enclosure(href: str, kind: str | None, length: str | None) -> FeedParserDict:
+    link = FeedParserDict(rel="enclosure", href=href)
+    if kind:
+        link["type"] = kind
+    if length:
+        link["length"] = length
+    return link
+
+
+def _rss_entry(item) -> FeedParserDict:
+    entry = FeedParserDict()
+    ns = RSS1_NS if item.tag.startswith(f"{{{RSS1_NS}}}") else None
+
+    def find(name):
+        return item.find(f"{{{ns}}}{name}" if ns else name)
+
+    title = find("title")
+    if title is not None:
+        entry["title"] = _title(_text(title))
+    link = _text(find("link"))
+    guid = find("guid")
+    if guid is not None and _text(guid):
+        entry["id"] = _text(guid)
+        # A permalink guid doubles as the link when there is none
+        if not link and guid.get("isPermaLink", "true").lower() != "false":
+            link = entry["id"]
+    # ``enclosures`` is derived from ``links`` by FeedParserDict
+    links = []
+    if link:
+        entry["link"] = link
+        links.append(FeedParserDict(rel="alternate", type="text/html", href=link))
+    for enclosure in item.findall("enclosure"):
+        if enclosure.get("url"):
+            links.append(
+                _enclosure(
+                    enclosure.get("url"), enclosure.get("type"), enclosure.get("length")
+                )
+            )
+    if links:
+        entry["links"] = links
+    pub_date = _text(item.find("pubDate"))
+    if pub_date:
+        entry["published"] = pub_date
+    dc_date = _text(item.find(f"{{{DC_NS}}}date"))
+    if dc_date:
+        entry["updated"] = dc_date
+    description = find("description")
+    if description is not None:
+        entry["summary"] = _html(_text(description))
+    encoded = item.find(f"{{{CONTENT_NS}}}encoded")
+    if encoded is not None:
+        entry["content"] = [FeedParserDict(value=_html(_text(encoded)))]
+    entry.update(_media(item))
+    return entry
+
+
+def _rss_key(item) -> tuple[str, str]:
+    """The (guid, link) ``_rss_entry`` would give the item, found cheaply"""
+    ns = f"{{{RSS1_NS}}}" if item.tag.startswith(f"{{{RSS1_NS}}}") else ""
+    link = _text(item.find(f"{ns}link"))
+    guid_element = item.find(f"{ns}guid")
+    guid = _text(guid_element) if guid_element is not None else ""
+    if guid and not link and guid_element.get("isPermaLink", "true").lower() != "false":
+        link = guid
+    return guid or link, link
+
+
+def _atom_key(item) -> tuple[str, str]:
+    """The (guid, link) ``_atom_entry`` would give the entry, found cheaply"""
+    link = ""
+    for element in item.findall(f"{{{ATOM_NS}}}link"):
+        if element.get("href") and element.get("rel", "alternate") == "alternate":
+            link = element.get("href")
+            break
+    return _text(item.find(f"{{{ATOM_NS}}}id")) or link, link
+
+
+def _atom_entry(item) -> FeedParserDict:
+    entry = FeedParserDict()
+    title = item.find(f"{{{ATOM_NS}}}title")
+    if title is not None:
+        entry["title"] = _atom_text(title)
+    links = []
+    for link in item.findall(f"{{{ATOM_NS}}}link"):
+        href = link.get("href")
+        if not href:
+            continue
+        rel = link.get("rel", "alternate")
+        if rel == "enclosure":
+            links.append(_enclosure(href, link.get("type"), link.get("length")))
+            continue
+        links.append(
+            FeedParserDict(rel=rel, type=link.get("type", "text/html"), href=href)
+        )
+        if rel == "alternate" and "link" not in entry:
+            entry["link"] = href
+    if links:
+        entry["links"] = links
+    for name in ("id", "published", "updated"):
+        value = _text(item.find(f"{{{ATOM_NS}}}{name}"))
+        if value:
+            entry[name] = value
+    summary = item.find(f"{{{ATOM_NS}}}summary")
+    if summary is not None:
+        entry["summary"] = _atom_text(summary)
+    content = item.find(f"{{{ATOM_NS}}}content")
+    if content is not None:
+        entry["content"] = [FeedParserDict(value=_atom_text(content))]
+    entry.update(_media(item))
+    return entry
+
+
+class IncrementalFeedParser:
+    """Parse RSS 2.0, RSS 1.0 and Atom as bytes arrive.
+
+    Entries are returned as soon as their closing tag has been read and are
+    then dropped from the tree, so memory does not grow with the number of
+    entries. Entries and ``feed_info`` look like feedparser's, so the same
+    extraction code handles both. Anything the XML parser rejects (bad
+    markup, HTML entities, unknown encodings) sets ``failed`` and the
+    caller falls back to feedparser. So does a feedparser release without
+    the helpers borrowed above; the parser then starts out failed.
+
+    Entries whose guid or link is in ``seen`` are dropped without being
+    built, so already stored entries cost no sanitizing or extraction.
+    """
+
+    def __init__(self, seen: Collection[str] | None = None):
+        self._parser = _pull_parser()
+        self._stack = []
+        self.feed_info = FeedParserDict()
+        self.failed = not fast_parser_available()
+        self.seen = seen
+        self.skipped = 0
+
+    @property
+    def site_link(self) -> str | None:
+        return self.feed_info.get("link")
+
+    def feed(self, chunk: bytes) -> list[FeedParserDict]:
+        if self.failed:
+            return []
+        try:
+            self._parser.feed(chunk)
+            return self._read_events()
+        except XML_PARSE_ERRORS:
+            self.failed = True
+            return []
+
+    def close(self) -> list[FeedParserDict]:
+        if self.failed:
+            return []
+        try:
+            self._parser.close()
+            return self._read_events()
+        except XML_PARSE_ERRORS:
+            self.failed = True
+            return []
+
+    def _read_events(self) -> list[FeedParserDict]:
+        entries = []
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._stack.append(element)
+                continue
+            self._stack.pop()
+            parent = self._stack[-1] if self._stack else None
+            if element.tag in ENTRY_TAGS:
+                is_atom = element.tag == f"{{{ATOM_NS}}}entry"
+                if self.seen and not self.seen.isdisjoint(
+                    _atom_key(element) if is_atom else _rss_key(element)
+                ):
+                    self.skipped += 1
+                elif is_atom:
+                    entries.append(_atom_entry(element))
+                else:
+                    entries.append(_rss_entry(element))
+                _release(element, parent)
+            elif parent is not None and parent.tag in FEED_TAGS:
+                self._note_feed_field(element)
+        return entries
+
+    def _note_feed_field(self, element):
+        info = self.feed_info
+        tag = element.tag.rpartition("}")[2]
+        is_atom = element.tag.startswith(f"{{{ATOM_NS}}}")
+        if tag == "title" and "title" not in info:
+            info["title"] = _atom_text(element) if is_atom else _title(_text(element))
+        elif tag == "link" and "link" not in info:
+            if not is_atom:
+                if _text(element):
+                    info["link"] = _text(element)
+            elif element.get("rel", "alternate") == "alternate" and element.get("href"):
+                info["link"] = element.get("href")
+        elif tag in ("description", "subtitle") and "description" not in info:
+            if is_atom:
+                info["description"] = _atom_text(element)
+            else:
+                info["description"] = _html(_text(element))
+
+
+def parse_document(body: bytes, seen: Collection[str] | None = None) -> FeedParserDict:
+    """Parse a whole feed document, trying the fast parser before feedparser.
+
+    Returns an object shaped like feedparser's result (``feed`` and
+    ``entries``). Entries in ``seen`` are left out by the fast parser only;
+    feedparser's result always has every entry.
+    """
+    parser = IncrementalFeedParser(seen)
+    entries = parser.feed(body) + parser.close()
+    if parser.failed:
+        return feedparser.parse(body)
+    return FeedParserDict(feed=parser.feed_info, entries=entries)
+
+
+class StreamedFeed:
+    """Accumulates a feed body chunk by chunk.
+
+    Enforces the size cap as bytes arrive, hashes the body incrementally and
+    feeds it to an IncrementalFeedParser. The raw body is spooled (to disk
+    past SPOOL_MEMORY_BYTES) so feedparser can take over if the incremental
+    parse fails, or so the body can be parsed later (``parse=False``, e.g.
+    in the parse pool).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_bytes: int | None = None,
+        parse: bool = True,
+        seen: Collection[str] | None = None,
+    ):
+        self.url = url
+        self.max_bytes = max_bytes or max_feed_bytes()
+        self.size = 0
+        self.seen = seen
+        self.entries: list[FeedParserDict] = []
+        self.parser = IncrementalFeedParser(seen) if parse else None
+        self._hash = hashlib.sha256()
+        self._spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+
+    def check_headers(self, headers):
+        """Abort before downloading when Content-Length is already too big"""
+        length = headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > self.max_bytes:
+            raise FeedTooLargeError(
+                f"Feed {self.url} is {length} bytes, over the {self.max_bytes} limit"
+            )
+
+    def add(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            self.close()
+            raise FeedTooLargeError(
+                f"Feed {self.url} exceeded the {self.max_bytes} byte limit"
+            )
+        self._hash.update(chunk)
+        self._spool.write(chunk)
+        if self.parser is not None:
+            self.entries.extend(self.parser.feed(chunk))
+
+    def finish(self):
+        if self.parser is not None:
+            self.entries.extend(self.parser.close())
+
+    @property
+    def content_hash(self) -> str:
+        return self._hash.hexdigest()
+
+    def read_body(self) -> bytes:
+        self._spool.seek(0)
+        return self._spool.read()
+
+    def close(self):
+        self._spool.close()
+
+
+def read_feed_stream(
+    response, url: str, parse: bool = True, seen: Collection[str] | None = None
+) -> StreamedFeed:
+    """Download a streamed httpx response into a StreamedFeed"""
+    body = StreamedFeed(url, parse=parse, seen=seen)
+    try:
+        body.check_headers(response.headers)
+        for chunk in response.iter_bytes():
+            body.add(chunk)
+        body.finish()
+    except Exception:
+        body.close()
+        raise
+    return body
+
+
+async def aread_feed_stream(
+    response, url: str, parse: bool = True, seen: Collection[str] | None = None
+) -> StreamedFeed:
+    """``read_feed_stream`` for an httpx.AsyncClient response"""
+    body = StreamedFeed(url, parse=parse, seen=seen)
+    try:
+        body.check_headers(response.headers)
+        async for chunk in response.aiter_bytes():
+            body.add(chunk)
+        body.finish()
+    except Exception:
+        body.close()
+        raise
+    return body
@@ -0,0 +1,154 @@
+# Shared HTTP clients for outbound fetches (feeds, favicons)
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlsplit
+
+import httpx
+from app.core.config import settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+FETCH_TIMEOUT_SECONDS = 10
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 6
+KEEPALIVE_EXPIRY_SECONDS = 60
+# Feeds, homepages and images move (http -> https, new paths); loops stop here
+MAX_REDIRECTS = 5
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+_host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def http2_enabled() -> bool:
+    """HTTP/2 needs the optional ``h2`` package; fall back to HTTP/1.1 without it"""
+    if settings is not None and not settings.HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def max_connections_per_host() -> int:
+    if settings is None:
+        return DEFAULT_MAX_CONNECTIONS_PER_HOST
+    return max(1, settings.HTTP_MAX_CONNECTIONS_PER_HOST)
+
+
+def _client_options(max_connections: int | None) -> dict:
+    # httpx decodes gzip and deflate itself, and brotli/zstd when their
+    # packages are installed, advertising them in Accept-Encoding
+    if max_connections is None:
+        max_connections = (
+            settings.HTTP_MAX_CONNECTIONS if settings else DEFAULT_MAX_CONNECTIONS
+        )
+    return {
+        "timeout": FETCH_TIMEOUT_SECONDS,
+        "http2": http2_enabled(),
+        "follow_redirects": True,
+        "max_redirects": MAX_REDIRECTS,
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    }
+
+
+def host_key(url: str) -> str:
+    """Connection pool key for a URL: scheme, host and port"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def create_client(
+    max_connections: int | None = None,
+    transport: httpx.BaseTransport | None = None,
+) -> httpx.Client:
+    return httpx.Client(transport=transport, **_client_options(max_connections))
+
+
+def create_async_client(
+    max_connections: int | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """Pooled async client; each event loop needs its own"""
+    return httpx.AsyncClient(transport=transport, **_client_options(max_connections))
+
+
+def get_client() -> httpx.Client:
+    """The process-wide pooled sync client, created on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client()
+                logger.info(
+                    f"HTTP client ready (http2={http2_enabled()}, "
+                    f"per-host limit={max_connections_per_host()})"
+                )
+    return _client
+
+
+def startup():
+    """Create the shared client when the application starts"""
+    get_client()
+
+
+def shutdown():
+    """Close pooled connections when the application stops"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+@contextmanager
+def host_slot(url: str):
+    """Hold one of the host's connection slots for the duration of a request"""
+    key = host_key(url)
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(key)
+        if semaphore is None:
+            semaphore = _host_semaphores[key] = threading.BoundedSemaphore(
+                max_connections_per_host()
+            )
+    with semaphore:
+        yield
+
+
+def get(url: str, **kwargs) -> httpx.Response:
+    """GET through the shared client, respecting the per-host connection cap"""
+    with host_slot(url):
+        return get_client().get(url, **kwargs)
+
+
+@contextmanager
+def stream(url: str, **kwargs):
+    """Streamed GET through the shared client; read the body inside the block"""
+    with host_slot(url), get_client().stream("GET", url, **kwargs) as response:
+        yield response
+
+
+class AsyncHostLimiter:
+    """Caps in-flight requests per host for one event loop"""
+
+    def __init__(self, per_host: int | None = None):
+        self.per_host = per_host or max_connections_per_host()
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        key = host_key(url)
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(self.per_host)
+        async with semaphore:
+            yield
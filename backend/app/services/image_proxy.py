@@ -0,0 +1,222 @@
+# Article image thumbnails, generated on first request and cached on disk
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import httpx
+from app.core.config import settings
+from app.services import http_client
+from app.services.feed_parser import host_limiter
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMAGE_CACHE_DIR = os.path.join(tempfile.gettempdir(), "fluxreader-images")
+DEFAULT_IMAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# Requested widths snap up to one of these, so sizes share cache entries
+THUMBNAIL_WIDTHS = (160, 320, 640, 1280)
+# Source images larger than this are not thumbnailed
+MAX_SOURCE_BYTES = 15 * 1024 * 1024
+# Decoding guard against decompression bombs
+MAX_SOURCE_PIXELS = 50_000_000
+THUMBNAIL_QUALITY = 80
+# Browsers revalidate thumbnails with their ETag after this long
+THUMBNAIL_MAX_AGE_SECONDS = 24 * 3600
+
+
+class ImageProxyError(Exception):
+    """The source image could not be fetched or thumbnailed"""
+
+
+def pillow_available() -> bool:
+    """Thumbnails need the optional Pillow package; without it images are
+    served from their origin"""
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def snap_width(width: int) -> int:
+    for size in THUMBNAIL_WIDTHS:
+        if width <= size:
+            return size
+    return THUMBNAIL_WIDTHS[-1]
+
+
+def cache_key(url: str, width: int) -> str:
+    return hashlib.sha256(f"{width}:{url}".encode()).hexdigest()
+
+
+def content_etag(data: bytes) -> str:
+    return f'"{hashlib.sha256(data).hexdigest()}"'
+
+
+def make_thumbnail(data: bytes, width: int) -> bytes:
+    """WebP no larger than ``width`` on either side, keeping the aspect ratio"""
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.width * image.height > MAX_SOURCE_PIXELS:
+                raise ImageProxyError("Source image has too many pixels")
+            # Lets JPEG decode at a reduced scale instead of full size
+            image.draft("RGB", (width, width))
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+            image.thumbnail((width, width), Image.Resampling.LANCZOS)
+            out = io.BytesIO()
+            image.save(out, "WEBP", quality=THUMBNAIL_QUALITY, method=4)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise ImageProxyError(f"Could not decode image: {e}")
+    return out.getvalue()
+
+
+def download_image(url: str) -> bytes:
+    """Raises HostDeferredError when the image host asks us to slow down"""
+    host_limiter.wait(url)
+    with http_client.stream(url) as response:
+        host_limiter.observe(url, response)
+        host_limiter.raise_if_deferred(url)
+        if response.status_code != 200:
+            raise ImageProxyError(f"Origin answered {response.status_code}")
+        content_type = response.headers.get("Content-Type", "")
+        if content_type and not content_type.startswith("image/"):
+            raise ImageProxyError(f"Origin sent {content_type}, not an image")
+        data = bytearray()
+        for chunk in response.iter_bytes():
+            data.extend(chunk)
+            if len(data) > MAX_SOURCE_BYTES:
+                raise ImageProxyError("Source image too large")
+    return bytes(data)
+
+
+class ThumbnailCache:
+    """Size-bounded on-disk cache of thumbnails, evicting the least recently
+    used.
+
+    A thumbnail is stored under the SHA-256 of its source URL and width.
+    The image behind a URL can change, so clients should tell thumbnails
+    apart by their bytes (content_etag), not by that key. Recency lives in
+    memory and is rebuilt from file modification times when the process
+    starts.
+    """
+
+    def __init__(self, directory: str | None = None, max_bytes: int | None = None):
+        self.directory = (
+            directory
+            or (settings.IMAGE_CACHE_DIR if settings else None)
+            or DEFAULT_IMAGE_CACHE_DIR
+        )
+        if max_bytes is None:
+            max_bytes = (
+                settings.IMAGE_CACHE_MAX_BYTES
+                if settings
+                else DEFAULT_IMAGE_CACHE_MAX_BYTES
+            )
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, int] | None = None
+        self._total = 0
+        self._lock = threading.Lock()
+        # One download per thumbnail, however many cards ask for it at once
+        self._key_locks: dict[str, threading.Lock] = {}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.webp")
+
+    def _load(self):
+        # Called with the lock held
+        if self._entries is not None:
+            return
+        found = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".webp"):
+                    stat = os.stat(os.path.join(root, name))
+                    found.append((stat.st_mtime, name[:-5], stat.st_size))
+        found.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in found)
+        self._total = sum(self._entries.values())
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            self._load()
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            with self._lock:
+                self._total -= self._entries.pop(key, 0)
+            return None
+        return data
+
+    def put(self, key: str, data: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._load()
+            self._total += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+
+    def _evict(self):
+        # Called with the lock held
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._load()
+            return self._total
+
+    def thumbnail(self, url: str, width: int) -> bytes:
+        """The cached thumbnail of the image at ``url``, creating it on a miss.
+
+        Raises ImageProxyError when the source cannot be fetched or decoded,
+        and HostDeferredError while its host asks us to slow down.
+        """
+        key = cache_key(url, width)
+        data = self.get(key)
+        if data is not None:
+            return data
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                data = self.get(key)
+                if data is None:
+                    try:
+                        source = download_image(url)
+                    except httpx.HTTPError as e:
+                        raise ImageProxyError(f"Could not fetch image: {e}")
+                    data = make_thumbnail(source, width)
+                    self.put(key, data)
+        finally:
+            with self._lock:
+                self._key_locks.pop(key, None)
+        return data
+
+
+# Global instance
+thumbnail_cache = ThumbnailCache()
@@ -0,0 +1,116 @@
+# OPML subscription lists: parsing imports and writing exports
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Iterable, Iterator
+from urllib.parse import urlsplit
+from xml.sax.saxutils import escape, quoteattr
+
+OPML_MEDIA_TYPE = "text/x-opml"
+# Uploads larger than this are rejected before parsing
+MAX_OPML_BYTES = 10 * 1024 * 1024
+
+
+@dataclass
+class OpmlFeed:
+    url: str
+    title: str | None = None
+    site_url: str | None = None
+    folder: str | None = None
+
+
+def _attr(outline: ET.Element, name: str) -> str | None:
+    # Exporters disagree on the case of xmlUrl/htmlUrl
+    for key, value in outline.attrib.items():
+        if key.lower() == name.lower():
+            value = value.strip()
+            return value or None
+    return None
+
+
+def _is_http_url(url: str | None) -> bool:
+    return bool(url) and urlsplit(url).scheme in ("http", "https")
+
+
+def parse_opml(data: bytes) -> list[OpmlFeed]:
+    """Feed subscriptions listed in an OPML document, in document order.
+
+    Outlines with an ``xmlUrl`` are feeds. Any other outline is a folder;
+    folders are flat here, so a feed nested several levels deep lands in
+    its top-level folder. Feeds whose URL is not http(s) are left out.
+    Raises ValueError when the document is not OPML.
+    """
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError as e:
+        raise ValueError(f"Invalid OPML document: {e}")
+    body = root.find("body")
+    if root.tag != "opml" or body is None:
+        raise ValueError("Invalid OPML document: missing <opml> or <body>")
+
+    feeds = []
+
+    def walk(outline: ET.Element, folder: str | None):
+        url = _attr(outline, "xmlUrl")
+        name = _attr(outline, "text") or _attr(outline, "title")
+        if url:
+            if _is_http_url(url):
+                site_url = _attr(outline, "htmlUrl")
+                feeds.append(
+                    OpmlFeed(
+                        url=url,
+                        title=name,
+                        site_url=site_url if _is_http_url(site_url) else None,
+                        folder=folder,
+                    )
+                )
+            return
+        for child in outline.findall("outline"):
+            walk(child, folder or name)
+
+    for outline in body.findall("outline"):
+        walk(outline, None)
+    return feeds
+
+
+def _feed_outline(title: str | None, url: str, site_url: str | None) -> str:
+    text = quoteattr(title or url)
+    attrs = f'type="rss" text={text} title={text} xmlUrl={quoteattr(url)}'
+    if site_url:
+        attrs += f" htmlUrl={quoteattr(site_url)}"
+    return f"<outline {attrs}/>"
+
+
+def write_opml(
+    feeds: Iterable[tuple[str | None, str | None, str, str | None]],
+    title: str = "FluxReader subscriptions",
+) -> Iterator[str]:
+    """Write an OPML document piece by piece, for streaming responses.
+
+    ``feeds`` yields (folder name, title, url, site url) tuples, with feeds
+    of the same folder next to each other. Feeds without a folder are
+    written at the top level.
+    """
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<opml version="2.0">\n'
+    yield (
+        f"  <head>\n    <title>{escape(title)}</title>\n"
+        f"    <dateCreated>{format_datetime(datetime.now(timezone.utc))}"
+        "</dateCreated>\n  </head>\n"
+    )
+    yield "  <body>\n"
+    current_folder = None
+    for folder, feed_title, url, site_url in feeds:
+        if folder != current_folder:
+            if current_folder is not None:
+                yield "    </outline>\n"
+            if folder is not None:
+                name = quoteattr(folder)
+                yield f"    <outline text={name} title={name}>\n"
+            current_folder = folder
+        indent = "      " if folder is not None else "    "
+        yield f"{indent}{_feed_outline(feed_title, url, site_url)}\n"
+    if current_folder is not None:
+        yield "    </outline>\n"
+    yield "  </body>\n</opml>\n"
@@ -0,0 +1,96 @@
+# Process pool for the CPU-bound stage of a refresh: parsing and normalization
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.core.config import settings
+from app.schemas.article import ArticleCreate
+from app.services.feed_entries import parse_articles
+from app.services.feed_stream import StreamedFeed
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Smaller bodies parse faster than they can be shipped to a worker and back
+POOL_MIN_BODY_BYTES = 64 * 1024
+
+
+def worker_context():
+    """Start workers from a clean server process rather than by forking.
+
+    The pool starts lazily inside a server that already runs threads
+    (uvicorn, refreshes, imports, HTTP pools); a forked child inherits their
+    locks in whatever state they were and can deadlock on them.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def parse_workers() -> int:
+    configured = settings.FEED_PARSE_WORKERS if settings else None
+    if configured is None:
+        return os.cpu_count() or 1
+    return max(0, configured)
+
+
+def _parse_in_worker(feed_id: int, body: bytes, seen: frozenset[str]) -> list[dict]:
+    # Plain dicts pickle much smaller than pydantic models
+    return [article.model_dump() for article in parse_articles(feed_id, body, seen)]
+
+
+class ParsePool:
+    """Parses downloaded feed bodies across worker processes.
+
+    The refresh engine downloads on one thread, so parsing there leaves
+    every other core idle. Bodies of at least ``min_body_bytes`` go to a
+    ProcessPoolExecutor and come back as articles ready to insert; smaller
+    ones, and everything when ``workers`` is 0, are parsed in-process.
+    """
+
+    def __init__(self, workers: int | None = None, min_body_bytes: int | None = None):
+        self.workers = parse_workers() if workers is None else max(0, workers)
+        self.min_body_bytes = (
+            POOL_MIN_BODY_BYTES if min_body_bytes is None else min_body_bytes
+        )
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=worker_context()
+            )
+            logger.info(f"Feed parse pool started with {self.workers} workers")
+        return self._executor
+
+    async def parse(self, feed_id: int, body: StreamedFeed) -> list[ArticleCreate]:
+        """Parse a downloaded body into articles for ``feed_id``, skipping
+        entries in ``body.seen``"""
+        content = body.read_body()
+        seen = frozenset(body.seen or ())
+        if not self.enabled or len(content) < self.min_body_bytes:
+            return parse_articles(feed_id, content, seen)
+
+        loop = asyncio.get_running_loop()
+        try:
+            rows = await loop.run_in_executor(
+                self._get_executor(), _parse_in_worker, feed_id, content, seen
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start afresh next time
+            logger.error("Feed parse pool broke, parsing in-process")
+            self.shutdown()
+            return parse_articles(feed_id, content, seen)
+        return [ArticleCreate.model_construct(**row) for row in rows]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,244 @@
+# Concurrent feed refresh engine
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+import httpx
+from app.core.config import settings
+from app.db import models
+from app.services import http_client
+from app.services.feed_health import (
+    begin_fetch_attempt,
+    record_fetch_deferred,
+    record_fetch_failure,
+)
+from app.services.feed_parser import (
+    HostDeferredError,
+    HostRateLimiter,
+    conditional_request_headers,
+    host_limiter,
+    parse_while_streaming,
+    process_feed_response,
+)
+from app.services.feed_stream import aread_feed_stream
+from app.services.parse_pool import ParsePool
+from app.services.seen_entries import seen_entries
+from sqlalchemy.orm import Session
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_CONCURRENCY = 50
+
+
+@dataclass
+class RefreshCycleStats:
+    """Outcome of one refresh cycle, used to size the concurrency limit"""
+
+    feeds: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    # Feeds whose host asked us to slow down; they are not failures
+    deferred: int = 0
+    new_articles: int = 0
+    wall_time_seconds: float = 0.0
+    # Per feed id: articles saved (0 when unchanged), or why it was not refreshed
+    new_articles_by_feed: dict[int, int] = field(default_factory=dict)
+    errors: dict[int, str] = field(default_factory=dict)
+
+    @property
+    def feeds_per_second(self) -> float:
+        if self.wall_time_seconds <= 0:
+            return 0.0
+        return self.feeds / self.wall_time_seconds
+
+
+class RefreshEngine:
+    """Refresh feeds concurrently over a shared httpx.AsyncClient.
+
+    Network waits overlap up to ``concurrency`` feeds at a time, so a cycle
+    takes roughly as long as the slowest hosts rather than the sum of all of
+    them. Requests to one host are capped, rate limited and paused when the
+    host answers 429/503, and reuse its pooled keep-alive (or HTTP/2)
+    connections. Large bodies are parsed in the ParsePool's worker
+    processes; small ones, and saving, run on the event loop thread between
+    awaits, so a single SQLAlchemy session can be shared by every feed in
+    the cycle.
+    """
+
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        rate_limiter: HostRateLimiter | None = None,
+        parse_pool: ParsePool | None = None,
+    ):
+        if concurrency is None:
+            concurrency = (
+                settings.FEED_REFRESH_CONCURRENCY
+                if settings
+                else DEFAULT_REFRESH_CONCURRENCY
+            )
+        self.concurrency = max(1, concurrency)
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._host_limiter = http_client.AsyncHostLimiter()
+        self._rate_limiter = rate_limiter or host_limiter
+        self._parse_pool = parse_pool or ParsePool()
+        self.last_cycle: RefreshCycleStats | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = http_client.create_async_client(
+                max_connections=self.concurrency, transport=self._transport
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the shared HTTP client and stop the parse workers"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._parse_pool.shutdown()
+
+    async def refresh_feeds(
+        self,
+        feeds: list[models.Feed],
+        db: Session,
+        force: bool = False,
+        on_feed_done: Callable[[int, RefreshCycleStats], None] | None = None,
+    ) -> RefreshCycleStats:
+        """Refresh the given feeds and return statistics for the cycle.
+
+        ``force`` refreshes feeds even while they back off after failures,
+        for refreshes a user asked for. ``on_feed_done`` is called with each
+        feed's id and the cycle's stats as soon as that feed is finished.
+        """
+        stats = RefreshCycleStats(feeds=len(feeds))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.perf_counter()
+
+        async def refresh(feed: models.Feed):
+            feed_id = feed.id
+            await self._refresh_feed(feed, db, semaphore, stats, force)
+            if on_feed_done is not None:
+                on_feed_done(feed_id, stats)
+
+        await asyncio.gather(*(refresh(feed) for feed in feeds))
+
+        stats.wall_time_seconds = time.perf_counter() - started
+        self.last_cycle = stats
+        return stats
+
+    async def _refresh_feed(
+        self,
+        feed: models.Feed,
+        db: Session,
+        semaphore: asyncio.Semaphore,
+        stats: RefreshCycleStats,
+        force: bool = False,
+    ):
+        # Hosts that answered 429/503 are not waited for, even when forced:
+        # their pause can outlast the cycle
+        blocked = self._rate_limiter.blocked_for(feed.url)
+        if blocked > 0:
+            self._defer(feed, HostDeferredError(feed.url, blocked), db, stats)
+            return
+        # Feeds backing off after failures wait for their retry time
+        if not begin_fetch_attempt(feed) and not force:
+            stats.skipped += 1
+            return
+
+        try:
+            # Wait for the host before taking a global slot, so feeds queued
+            # behind a busy host do not hold up feeds on other hosts
+            async with self._host_limiter.slot(feed.url):
+                # Space requests to the host out
+                await self._rate_limiter.wait_async(feed.url)
+                async with semaphore:
+                    response, body = await self._download(feed, db)
+        except HostDeferredError as e:
+            self._defer(feed, e, db, stats)
+            return
+        except Exception as e:
+            stats.failed += 1
+            stats.errors[feed.id] = f"Failed to fetch feed: {e}"
+            logger.warning(f"Feed {feed.id}: failed to fetch feed: {e}")
+            self._record_failure(feed, e, db)
+            return
+
+        try:
+            articles = None
+            if self._parse_pool.enabled and body is not None:
+                if body.content_hash != feed.content_hash:
+                    articles = await self._parse_pool.parse(feed.id, body)
+            new_articles = process_feed_response(feed, response, db, body, articles)
+        except Exception as e:
+            db.rollback()
+            stats.failed += 1
+            stats.errors[feed.id] = f"Error refreshing feed: {e}"
+            logger.error(f"Error refreshing feed {feed.id}: {e}")
+            self._record_failure(feed, e, db)
+            return
+        finally:
+            if body is not None:
+                body.close()
+
+        stats.succeeded += 1
+        stats.new_articles_by_feed[feed.id] = new_articles or 0
+        if new_articles is None:
+            stats.unchanged += 1
+            return
+        stats.new_articles += new_articles
+        logger.info(f"Feed {feed.id} ({feed.title}): saved {new_articles} articles")
+
+    async def _download(self, feed: models.Feed, db: Session):
+        """Stream the feed body, parsing entries as they arrive unless the
+        parse pool will parse it afterwards or it may turn out unchanged
+        (parse_while_streaming).
+
+        Returns the response and its StreamedFeed (None for 304).
+        """
+        async with self._get_client().stream(
+            "GET", feed.url, headers=conditional_request_headers(feed)
+        ) as response:
+            self._rate_limiter.observe(feed.url, response)
+            if response.status_code == 304:
+                return response, None
+            response.raise_for_status()
+            return response, await aread_feed_stream(
+                response,
+                feed.url,
+                parse=not self._parse_pool.enabled and parse_while_streaming(feed),
+                seen=seen_entries.get(db, feed.id),
+            )
+
+    def _defer(
+        self,
+        feed: models.Feed,
+        error: HostDeferredError,
+        db: Session,
+        stats: RefreshCycleStats,
+    ):
+        """Skip the feed until its host's pause ends; the scheduler picks the
+        retry time up through the feed's next_retry_at"""
+        stats.deferred += 1
+        stats.errors[feed.id] = str(error)
+        try:
+            record_fetch_deferred(feed, error.retry_after)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Could not defer feed {feed.id}: {e}")
+
+    def _record_failure(self, feed: models.Feed, error: Exception, db: Session):
+        try:
+            record_fetch_failure(feed, error)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Could not record failure for feed {feed.id}: {e}")
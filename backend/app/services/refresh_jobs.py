@@ -0,0 +1,254 @@
+# Manual feed refreshes, run off the request threads with per-feed coalescing
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from app.db import database, models
+from app.services.parse_pool import ParsePool
+from app.services.refresh_engine import RefreshCycleStats, RefreshEngine
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+# Finished jobs stay pollable for this long
+FINISHED_JOB_TTL_SECONDS = 60 * 60
+MAX_FINISHED_JOBS = 1000
+
+
+@dataclass
+class RefreshJob:
+    feed_id: int
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = JOB_QUEUED
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    new_articles: int | None = None
+    error: str | None = None
+
+    @property
+    def in_flight(self) -> bool:
+        return self.status in (JOB_QUEUED, JOB_RUNNING)
+
+    def finish(self, new_articles: int | None = None, error: str | None = None):
+        self.status = JOB_FAILED if error else JOB_SUCCEEDED
+        self.new_articles = new_articles
+        self.error = error
+        self.finished_at = datetime.now(timezone.utc)
+
+
+@dataclass
+class RefreshBatch:
+    """Refresh jobs queued together, e.g. the first fetch of imported feeds"""
+
+    jobs: list[RefreshJob]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def _count(self, *statuses: str) -> int:
+        return sum(job.status in statuses for job in self.jobs)
+
+    @property
+    def total(self) -> int:
+        return len(self.jobs)
+
+    @property
+    def queued(self) -> int:
+        return self._count(JOB_QUEUED)
+
+    @property
+    def running(self) -> int:
+        return self._count(JOB_RUNNING)
+
+    @property
+    def succeeded(self) -> int:
+        return self._count(JOB_SUCCEEDED)
+
+    @property
+    def failed(self) -> int:
+        return self._count(JOB_FAILED)
+
+    @property
+    def in_flight(self) -> bool:
+        return any(job.in_flight for job in self.jobs)
+
+    @property
+    def finished_at(self) -> datetime | None:
+        if self.in_flight:
+            return None
+        return max((job.finished_at for job in self.jobs), default=self.created_at)
+
+
+class RefreshJobQueue:
+    """Queue of user-requested feed refreshes.
+
+    The refresh endpoint only enqueues a job and returns its id, so request
+    threads are never tied up by slow hosts. A worker thread drains the
+    queue through its own RefreshEngine, refreshing everything queued
+    together. A feed with a queued or running job gets that same job back
+    instead of a new one, so repeated clicks cost a single fetch. Jobs
+    submitted together form a batch whose progress can be polled, and each
+    job finishes as soon as its own feed is done.
+    """
+
+    def __init__(self, session_factory=None, engine: RefreshEngine | None = None):
+        self._session_factory = session_factory
+        # Manual refreshes are few; parse them on the worker thread rather
+        # than starting another process pool next to the scheduler's
+        self._engine = engine or RefreshEngine(parse_pool=ParsePool(workers=0))
+        self._jobs: dict[str, RefreshJob] = {}
+        self._batches: dict[str, RefreshBatch] = {}
+        self._in_flight: dict[int, RefreshJob] = {}
+        self._queue: list[RefreshJob] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._running = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _enqueue(self, feed_id: int) -> tuple[RefreshJob, bool]:
+        # Called with the lock held
+        job = self._in_flight.get(feed_id)
+        if job is not None:
+            return job, False
+        job = RefreshJob(feed_id=feed_id)
+        self._jobs[job.id] = job
+        self._in_flight[feed_id] = job
+        self._queue.append(job)
+        return job, True
+
+    def submit(self, feed_id: int) -> tuple[RefreshJob, bool]:
+        """Queue a refresh of the feed; returns the job and whether it is new"""
+        with self._lock:
+            self._prune()
+            job, created = self._enqueue(feed_id)
+        if created:
+            self.start()
+            self._wakeup.set()
+        return job, created
+
+    def submit_batch(self, feed_ids: list[int]) -> RefreshBatch:
+        """Queue refreshes of several feeds as one batch to poll"""
+        with self._lock:
+            self._prune()
+            jobs = [self._enqueue(feed_id)[0] for feed_id in feed_ids]
+            batch = RefreshBatch(jobs=jobs)
+            self._batches[batch.id] = batch
+        self.start()
+        self._wakeup.set()
+        return batch
+
+    def get(self, job_id: str) -> RefreshJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def get_batch(self, batch_id: str) -> RefreshBatch | None:
+        with self._lock:
+            return self._batches.get(batch_id)
+
+    def _prune(self):
+        """Forget finished jobs and batches past their TTL, and the oldest
+        past the cap"""
+        cutoff = time.time() - FINISHED_JOB_TTL_SECONDS
+        for items in (self._jobs, self._batches):
+            finished = [item for item in items.values() if not item.in_flight]
+            excess = len(finished) - MAX_FINISHED_JOBS
+            for item in finished:
+                if excess > 0 or item.finished_at.timestamp() < cutoff:
+                    del items[item.id]
+                    excess -= 1
+
+    def run_pending(self) -> int:
+        """Refresh every queued feed; returns the number of jobs run.
+
+        Always called from the same thread, which owns the engine's loop.
+        """
+        with self._lock:
+            jobs, self._queue = self._queue, []
+            for job in jobs:
+                job.status = JOB_RUNNING
+                job.started_at = datetime.now(timezone.utc)
+        if not jobs:
+            return 0
+
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        session_factory = self._session_factory or database.SessionLocal
+        pending = {job.feed_id: job for job in jobs}
+
+        def feed_done(feed_id: int, stats: RefreshCycleStats):
+            with self._lock:
+                job = pending.pop(feed_id)
+                if feed_id in stats.errors:
+                    job.finish(error=stats.errors[feed_id])
+                else:
+                    job.finish(new_articles=stats.new_articles_by_feed.get(feed_id))
+                self._in_flight.pop(feed_id, None)
+
+        failure = "Feed not found"
+        try:
+            with session_factory() as db:
+                feeds = (
+                    db.query(models.Feed)
+                    .filter(models.Feed.id.in_(list(pending)))
+                    .all()
+                )
+                self._loop.run_until_complete(
+                    self._engine.refresh_feeds(
+                        feeds, db, force=True, on_feed_done=feed_done
+                    )
+                )
+        except Exception as e:
+            logger.error(f"Error running refresh jobs for feeds {list(pending)}: {e}")
+            failure = f"Refresh failed: {e}"
+
+        # Jobs whose feed was deleted, or left over by a failed cycle
+        with self._lock:
+            for feed_id, job in pending.items():
+                job.finish(error=failure)
+                self._in_flight.pop(feed_id, None)
+        return len(jobs)
+
+    def start(self):
+        """Start the worker thread if it is not running yet"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._work, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the worker thread and close the engine's connections"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self._wakeup.set()
+        self._thread.join()
+
+    def _work(self):
+        while self._running:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                self.run_pending()
+            except Exception as e:
+                logger.error(f"Error in refresh job worker: {e}")
+        if self._loop is not None:
+            self._loop.run_until_complete(self._engine.aclose())
+            self._loop.close()
+            self._loop = None
+
+
+# Global instance
+refresh_jobs = RefreshJobQueue()
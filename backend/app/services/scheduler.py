@@ -0,0 +1,130 @@
+# Per-feed adaptive refresh scheduler
+import heapq
+import statistics
+from datetime import datetime, timezone
+from typing import Iterable
+
+# Poll roughly this many times per expected publication
+POLLS_PER_ARTICLE = 2
+# A feed counts as dormant once it has been quiet for this many typical gaps
+DORMANCY_FACTOR = 4
+
+
+def estimate_refresh_interval(
+    published_times: list[datetime],
+    default_interval: float,
+    min_interval: float,
+    max_interval: float,
+    now: datetime | None = None,
+) -> float:
+    """Estimate how often a feed should be polled, in seconds.
+
+    Uses the median gap between the feed's recent publication times, so busy
+    feeds are refreshed often and dormant ones rarely. Feeds without enough
+    history fall back to ``default_interval``.
+    """
+    times = sorted(_as_utc(t) for t in published_times if t is not None)
+    if len(times) < 2:
+        return _clamp(default_interval, min_interval, max_interval)
+
+    gaps = [
+        (later - earlier).total_seconds() for earlier, later in zip(times, times[1:])
+    ]
+    typical_gap = statistics.median(gaps)
+
+    # A feed that stopped publishing should back off even if it used to be busy
+    now = _as_utc(now or datetime.now(timezone.utc))
+    quiet_for = (now - times[-1]).total_seconds()
+    if quiet_for > DORMANCY_FACTOR * typical_gap:
+        typical_gap = quiet_for
+
+    return _clamp(typical_gap / POLLS_PER_ARTICLE, min_interval, max_interval)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _clamp(value: float, lower: float, upper: float) -> float:
+    return max(lower, min(upper, value))
+
+
+class FeedScheduler:
+    """Min-heap of next-due timestamps, one entry per feed.
+
+    Rescheduling pushes a new heap entry and leaves the old one in place;
+    stale entries are recognised by comparing against ``_next_due`` and
+    skipped when popped.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._heap: list[tuple[float, int]] = []
+        self._next_due: dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._next_due)
+
+    def sync(self, feed_ids: Iterable[int], now: float):
+        """Track new feeds (due immediately) and forget deleted ones"""
+        current = set(feed_ids)
+        for feed_id in list(self._next_due):
+            if feed_id not in current:
+                del self._next_due[feed_id]
+        for feed_id in current - self._next_due.keys():
+            self.schedule(feed_id, now)
+
+    def schedule(self, feed_id: int, due: float):
+        self._next_due[feed_id] = due
+        heapq.heappush(self._heap, (due, feed_id))
+
+    def reschedule(
+        self,
+        feed_id: int,
+        published_times: list[datetime],
+        default_interval: float,
+        now: float,
+        not_before: float | None = None,
+    ) -> float:
+        """Schedule the next refresh from the feed's publishing cadence.
+
+        ``not_before`` pushes the refresh out further, e.g. while a failing
+        feed is backing off.
+        """
+        interval = estimate_refresh_interval(
+            published_times,
+            default_interval,
+            self.min_interval,
+            self.max_interval,
+            now=datetime.fromtimestamp(now, timezone.utc),
+        )
+        due = now + interval
+        if not_before is not None and not_before > due:
+            due = not_before
+        self.schedule(feed_id, due)
+        return due - now
+
+    def next_due(self, feed_id: int) -> float | None:
+        return self._next_due.get(feed_id)
+
+    def pop_due(self, now: float) -> list[int]:
+        """Remove and return every feed whose next refresh is due"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, feed_id = heapq.heappop(self._heap)
+            if self._next_due.get(feed_id) != due_at:
+                continue  # Stale entry from an earlier reschedule or a deleted feed
+            del self._next_due[feed_id]
+            due.append(feed_id)
+        return due
+
+    def seconds_until_next_due(self, now: float) -> float | None:
+        while self._heap:
+            due_at, feed_id = self._heap[0]
+            if self._next_due.get(feed_id) == due_at:
+                return max(0.0, due_at - now)
+            heapq.heappop(self._heap)
+        return None
@@ -0,0 +1,87 @@
+# Per-feed record of stored entries, checked before any per-entry work
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+from app.db.models import Article
+from app.schemas.article import ArticleCreate
+from sqlalchemy.orm import Session
+
+DEFAULT_MAX_FEEDS = 10_000
+# Newest guids/links kept per feed; comfortably more than one feed document
+KEYS_PER_FEED = 1000
+
+
+def _add_keys(keys: dict[str, None], guid: str | None, link: str | None):
+    # Re-adding moves a key to the newest end, away from trimming
+    for key in (guid, link):
+        if key:
+            keys.pop(key, None)
+            keys[key] = None
+
+
+class SeenEntries:
+    """Bounded in-memory cache of the guids and links each feed has stored.
+
+    A feed is warm-started from its newest articles the first time it is
+    looked up and extended as articles are saved. Refreshes skip entries
+    found here before parsing their HTML, dates or images. An entry that is
+    missing (evicted, or never cached) still goes through the database
+    dedup in bulk_create_articles, so the cache only ever saves work.
+    """
+
+    def __init__(
+        self, max_feeds: int = DEFAULT_MAX_FEEDS, keys_per_feed: int = KEYS_PER_FEED
+    ):
+        self.max_feeds = max_feeds
+        self.keys_per_feed = keys_per_feed
+        # feed id -> insertion-ordered keys, least recently used feed first
+        self._feeds: OrderedDict[int, dict[str, None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, feed_id: int) -> frozenset[str]:
+        """The feed's known guids and links, loading them on first use"""
+        with self._lock:
+            keys = self._feeds.get(feed_id)
+            if keys is not None:
+                self._feeds.move_to_end(feed_id)
+                return frozenset(keys)
+
+        rows = (
+            db.query(Article.guid, Article.link)
+            .filter(Article.feed_id == feed_id)
+            .order_by(Article.id.desc())
+            .limit(self.keys_per_feed // 2)
+            .all()
+        )
+        keys = {}
+        for guid, link in reversed(rows):
+            _add_keys(keys, guid, link)
+        with self._lock:
+            self._feeds[feed_id] = keys
+            while len(self._feeds) > self.max_feeds:
+                self._feeds.popitem(last=False)
+        return frozenset(keys)
+
+    def remember(self, feed_id: int, articles: Iterable[ArticleCreate]):
+        """Record articles that are now stored for an already cached feed"""
+        with self._lock:
+            keys = self._feeds.get(feed_id)
+            if keys is None:
+                return  # Loaded from the database, with these, on next use
+            for article in articles:
+                _add_keys(keys, article.guid, article.link)
+            while len(keys) > self.keys_per_feed:
+                del keys[next(iter(keys))]
+
+    def forget(self, feed_ids: Iterable[int] | None = None):
+        """Drop cached feeds (all of them by default) after articles are deleted"""
+        with self._lock:
+            if feed_ids is None:
+                self._feeds.clear()
+                return
+            for feed_id in feed_ids:
+                self._feeds.pop(feed_id, None)
+
+
+seen_entries = SeenEntries()
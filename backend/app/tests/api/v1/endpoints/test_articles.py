@@ -0,0 +1,389 @@
+# backend/app/tests/api/v1/endpoints/test_articles.py
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from app.db import crud
+from app.db.models import Article as ArticleModel
+from app.db.models import Feed as FeedModel
+from app.services import image_proxy
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+BASE_TIME = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _add_article(
+    db_session: Session,
+    feed_id: int,
+    guid: str,
+    hours: int,
+    is_read: bool = False,
+) -> int:
+    article = ArticleModel(
+        feed_id=feed_id,
+        title=f"Article {guid}",
+        link=f"http://example.com/{guid}",
+        guid=guid,
+        published_at=BASE_TIME + timedelta(hours=hours),
+        is_read=is_read,
+    )
+    db_session.add(article)
+    db_session.commit()
+    return article.id
+
+
+class TestArticleTimeline:
+    def test_pages_through_timeline_newest_first(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://timeline.example.com/rss")
+        feed_id = feed.id
+        # Two articles share a timestamp, so id breaks the tie
+        for guid, hours in [("a", 0), ("b", 1), ("c", 1), ("d", 2), ("e", 3)]:
+            _add_article(db_session, feed_id, guid, hours)
+
+        guids = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/v1/articles/", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            guids.extend(item["guid"] for item in data["items"])
+            pages += 1
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert guids == ["e", "d", "c", "b", "a"]
+        assert pages == 3
+
+    def test_filters_by_feed_folder_and_read_state(
+        self, client: TestClient, db_session: Session, feed_factory, folder_factory
+    ):
+        folder_id = folder_factory(name="Timeline Folder")
+        in_folder = feed_factory(
+            feed_url="http://in-folder.example.com/rss", folder_id=folder_id
+        )
+        other = feed_factory(feed_url="http://other.example.com/rss")
+        in_folder_id, other_id = in_folder.id, other.id
+        _add_article(db_session, in_folder_id, "folder-unread", 1)
+        _add_article(db_session, in_folder_id, "folder-read", 2, is_read=True)
+        _add_article(db_session, other_id, "other-unread", 3)
+
+        def guids(**params):
+            response = client.get("/api/v1/articles/", params=params)
+            assert response.status_code == 200
+            return [item["guid"] for item in response.json()["items"]]
+
+        assert guids(feed_id=other_id) == ["other-unread"]
+        assert guids(folder_id=folder_id) == ["folder-read", "folder-unread"]
+        assert guids(is_read=False) == ["other-unread", "folder-unread"]
+        assert guids(folder_id=folder_id, is_read=True) == ["folder-read"]
+
+    def test_invalid_cursor_is_rejected(self, client: TestClient):
+        response = client.get("/api/v1/articles/", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+    def test_limit_is_bounded(self, client: TestClient):
+        response = client.get("/api/v1/articles/", params={"limit": 1000})
+        assert response.status_code == 422
+
+
+class TestMarkArticlesRead:
+    def _unread(self, client: TestClient, **params) -> list[str]:
+        response = client.get("/api/v1/articles/", params={"is_read": False, **params})
+        assert response.status_code == 200
+        return [item["guid"] for item in response.json()["items"]]
+
+    def test_marks_ids_and_feeds(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://mark-ids.example.com/rss")
+        other = feed_factory(feed_url="http://mark-feed.example.com/rss")
+        feed_id, other_id = feed.id, other.id
+        first = _add_article(db_session, feed_id, "ids-1", 1)
+        _add_article(db_session, feed_id, "ids-2", 2)
+        _add_article(db_session, other_id, "feed-1", 3)
+        _add_article(db_session, other_id, "feed-2", 4)
+
+        response = client.post("/api/v1/articles/read", json={"article_ids": [first]})
+        assert response.json() == {"updated": 1}
+        response = client.post("/api/v1/articles/read", json={"feed_id": other_id})
+        assert response.json() == {"updated": 2}
+        # Already-read articles are not counted again
+        response = client.post("/api/v1/articles/read", json={"feed_id": other_id})
+        assert response.json() == {"updated": 0}
+
+        assert self._unread(client) == ["ids-2"]
+
+    def test_marks_folder_in_one_update_and_adjusts_counters(
+        self, client: TestClient, db_session: Session, feed_factory, folder_factory
+    ):
+        folder_id = folder_factory(name="Mark Folder")
+        feeds = [
+            feed_factory(feed_url=f"http://mark-folder-{i}.example.com/rss")
+            for i in range(3)
+        ]
+        feed_ids = [feed.id for feed in feeds]
+        for i, feed_id in enumerate(feed_ids):
+            if i < 2:
+                db_session.get(FeedModel, feed_id).folder_id = folder_id
+            _add_article(db_session, feed_id, f"folder-{i}-a", i)
+            _add_article(db_session, feed_id, f"folder-{i}-b", i + 10)
+        crud.recount_feed_counters(db_session)
+        db_session.commit()
+
+        updates = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("UPDATE ARTICLES"):
+                updates.append(statement)
+
+        bind = db_session.get_bind()
+        event.listen(bind, "before_cursor_execute", record)
+        try:
+            response = client.post(
+                "/api/v1/articles/read", json={"folder_id": folder_id}
+            )
+        finally:
+            event.remove(bind, "before_cursor_execute", record)
+
+        assert response.json() == {"updated": 4}
+        assert len(updates) == 1
+        assert self._unread(client) == ["folder-2-b", "folder-2-a"]
+
+        folders = client.get("/api/v1/folders/").json()
+        (folder,) = [f for f in folders if f["id"] == str(folder_id)]
+        assert folder["unread_count"] == 0
+        assert folder["total_count"] == 4
+        unread = {
+            f["id"]: f["unread_count"] for f in client.get("/api/v1/feeds/").json()
+        }
+        assert unread == {str(feed_ids[0]): 0, str(feed_ids[1]): 0, str(feed_ids[2]): 2}
+
+    def test_marks_articles_older_than_cursor(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://mark-before.example.com/rss")
+        for guid, hours in [("a", 0), ("b", 1), ("c", 2), ("d", 3)]:
+            _add_article(db_session, feed.id, guid, hours)
+
+        page = client.get("/api/v1/articles/", params={"limit": 2}).json()
+        response = client.post(
+            "/api/v1/articles/read", json={"before": page["next_cursor"]}
+        )
+
+        assert response.json() == {"updated": 2}
+        assert self._unread(client) == ["d", "c"]
+
+    def test_marks_unread(self, client: TestClient, db_session: Session, feed_factory):
+        feed = feed_factory(feed_url="http://mark-unread.example.com/rss")
+        article_id = _add_article(db_session, feed.id, "was-read", 0, is_read=True)
+
+        response = client.post(
+            "/api/v1/articles/read",
+            json={"article_ids": [article_id], "is_read": False},
+        )
+
+        assert response.json() == {"updated": 1}
+        assert self._unread(client) == ["was-read"]
+
+    def test_requires_a_scope(self, client: TestClient):
+        response = client.post("/api/v1/articles/read", json={"is_read": True})
+        assert response.status_code == 422
+
+    def test_mark_single_article_read(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://mark-one.example.com/rss")
+        article_id = _add_article(db_session, feed.id, "one", 0)
+
+        response = client.put(f"/api/v1/articles/{article_id}/read")
+        assert response.status_code == 200
+        assert self._unread(client) == []
+
+        response = client.put("/api/v1/articles/999999/read")
+        assert response.status_code == 404
+
+
+class TestArticleSearch:
+    def _add(self, db_session: Session, feed_id: int, guid: str, title: str, **kw):
+        article = ArticleModel(
+            feed_id=feed_id,
+            title=title,
+            link=f"http://example.com/{guid}",
+            guid=guid,
+            published_at=BASE_TIME,
+            **kw,
+        )
+        db_session.add(article)
+        db_session.commit()
+        return article.id
+
+    def test_ranks_title_matches_first_with_snippets(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://search.example.com/rss")
+        self._add(
+            db_session,
+            feed.id,
+            "body",
+            "Weekly notes",
+            description="Some thoughts on compilers and databases",
+        )
+        self._add(db_session, feed.id, "title", "Writing compilers in Python")
+        self._add(db_session, feed.id, "other", "Gardening", description="Tomatoes")
+
+        response = client.get("/api/v1/articles/search", params={"q": "compilers"})
+
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert [item["guid"] for item in items] == ["title", "body"]
+        assert items[0]["score"] > items[1]["score"]
+        assert "<mark>compilers</mark>" in items[0]["snippet"]
+        assert "<mark>compilers</mark>" in items[1]["snippet"]
+
+    def test_index_follows_updates_and_deletes(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://search-sync.example.com/rss")
+        article_id = self._add(db_session, feed.id, "sync", "Old headline")
+        article = db_session.get(ArticleModel, article_id)
+        article.title = "Fresh headline"
+        db_session.commit()
+
+        def guids(q):
+            response = client.get("/api/v1/articles/search", params={"q": q})
+            return [item["guid"] for item in response.json()["items"]]
+
+        assert guids("old") == []
+        assert guids("fresh") == ["sync"]
+
+        db_session.delete(db_session.get(ArticleModel, article_id))
+        db_session.commit()
+        assert guids("fresh") == []
+
+    def test_pages_and_filters_results(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://search-pages.example.com/rss")
+        other = feed_factory(feed_url="http://search-other.example.com/rss")
+        feed_id, other_id = feed.id, other.id
+        for i in range(5):
+            self._add(db_session, feed_id, f"page-{i}", f"Kubernetes tip {i}")
+        self._add(db_session, other_id, "elsewhere", "Kubernetes elsewhere")
+
+        guids = []
+        cursor = None
+        while True:
+            params = {"q": "kubernetes", "limit": 2, "feed_id": feed_id}
+            if cursor:
+                params["cursor"] = cursor
+            data = client.get("/api/v1/articles/search", params=params).json()
+            guids.extend(item["guid"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert sorted(guids) == [f"page-{i}" for i in range(5)]
+        assert len(set(guids)) == 5
+
+    def test_user_input_is_not_parsed_as_query_syntax(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://search-syntax.example.com/rss")
+        self._add(db_session, feed.id, "syntax", 'C++ and "quoted" NEAR text')
+
+        for q in ['"unbalanced', "NEAR(", "c++ -", "***"]:
+            response = client.get("/api/v1/articles/search", params={"q": q})
+            assert response.status_code == 200
+
+    def test_invalid_cursor_is_rejected(self, client: TestClient):
+        response = client.get(
+            "/api/v1/articles/search", params={"q": "x", "cursor": "nope"}
+        )
+        assert response.status_code == 400
+
+
+class TestArticleImage:
+    def _article_with_image(self, db_session: Session, feed_factory, image_url):
+        feed_id = feed_factory(feed_url=f"{image_url}.rss").id
+        article_id = _add_article(db_session, feed_id, "img", 0)
+        db_session.get(ArticleModel, article_id).image_url = image_url
+        db_session.commit()
+        return article_id
+
+    def test_serves_cached_thumbnail(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        article_id = self._article_with_image(
+            db_session, feed_factory, "http://img.example.com/hero.jpg"
+        )
+        with patch.object(
+            image_proxy.thumbnail_cache,
+            "thumbnail",
+            return_value=b"webp-bytes",
+        ) as thumbnail:
+            response = client.get(f"/api/v1/articles/{article_id}/image?w=300")
+            assert response.status_code == 200
+            assert response.content == b"webp-bytes"
+            assert response.headers["content-type"] == "image/webp"
+            assert response.headers["cache-control"] == "public, max-age=86400"
+            assert response.headers["etag"] == image_proxy.content_etag(b"webp-bytes")
+            thumbnail.assert_called_once_with("http://img.example.com/hero.jpg", 320)
+
+            revalidated = client.get(
+                f"/api/v1/articles/{article_id}/image?w=300",
+                headers={"If-None-Match": response.headers["etag"]},
+            )
+            assert revalidated.status_code == 304
+            assert revalidated.content == b""
+
+            # The origin image changed behind the same URL
+            thumbnail.return_value = b"new-webp-bytes"
+            changed = client.get(
+                f"/api/v1/articles/{article_id}/image?w=300",
+                headers={"If-None-Match": response.headers["etag"]},
+            )
+            assert changed.status_code == 200
+            assert changed.content == b"new-webp-bytes"
+
+    def test_origin_failure_is_bad_gateway(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        article_id = self._article_with_image(
+            db_session, feed_factory, "http://img.example.com/gone.jpg"
+        )
+        with patch.object(
+            image_proxy.thumbnail_cache,
+            "thumbnail",
+            side_effect=image_proxy.ImageProxyError("Origin answered 404"),
+        ):
+            response = client.get(f"/api/v1/articles/{article_id}/image")
+        assert response.status_code == 502
+
+    def test_redirects_to_origin_without_pillow(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        article_id = self._article_with_image(
+            db_session, feed_factory, "http://img.example.com/raw.jpg"
+        )
+        with patch.object(image_proxy, "pillow_available", return_value=False):
+            response = client.get(
+                f"/api/v1/articles/{article_id}/image", follow_redirects=False
+            )
+        assert response.status_code == 307
+        assert response.headers["location"] == "http://img.example.com/raw.jpg"
+
+    def test_article_without_image(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        feed_id = feed_factory(feed_url="http://noimage.example.com/rss").id
+        article_id = _add_article(db_session, feed_id, "plain", 0)
+        response = client.get(f"/api/v1/articles/{article_id}/image")
+        assert response.status_code == 404
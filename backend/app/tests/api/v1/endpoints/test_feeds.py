@@ -2,7 +2,7 @@
 import uuid
 from unittest.mock import MagicMock, patch
 
-import pytest
+import httpx
 
 # Models
 from app.db.models import Article as ArticleModel
@@ -10,7 +10,11 @@ from app.db.models import Feed as FeedModel
 from app.db.models import Folder as FolderModel
 
 # Schemas for mocking service layer
-from app.services.feed_parser import ArticleData, FeedData
+from app.services import feed_stream, http_client
+from app.services.feed_parser import ArticleData, FeedData, host_limiter
+from app.services.parse_pool import ParsePool
+from app.services.refresh_engine import RefreshEngine
+from app.services.refresh_jobs import RefreshJobQueue
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
@@ -191,6 +195,11 @@ class TestFeedEndpoints:
         assert feed_details[id2]["folder_id"] == str(
             folder_id
         )  # Fix: compare as string
+        # Articles are not embedded, only their aggregates
+        assert "articles" not in feed_details[id1]
+        assert feed_details[id1]["total_count"] == len(MOCK_FEED_DATA.articles)
+        assert feed_details[id1]["unread_count"] == len(MOCK_FEED_DATA.articles)
+        assert feed_details[id1]["latest_article_at"].startswith("2023-01-02")
 
     @patch("app.db.crud.parse_feed")
     def test_delete_feed_success(
@@ -227,6 +236,25 @@ class TestFeedEndpoints:
         )
         assert article_count_after_delete == 0
 
+    def test_list_broken_feeds(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        healthy = feed_factory(feed_url="http://healthy.example.com/rss")
+        broken = feed_factory(feed_url="http://broken.example.com/rss")
+        broken.consecutive_failures = 3
+        broken.last_error = "Server error '503 Service Unavailable'"
+        db_session.commit()
+        healthy_id, broken_id = str(healthy.id), str(broken.id)
+
+        response = client.get("/api/v1/feeds/broken")
+        assert response.status_code == 200
+        data = response.json()
+        assert [f["id"] for f in data] == [broken_id]
+        assert data[0]["consecutive_failures"] == 3
+        assert data[0]["last_error"].startswith("Server error")
+        assert data[0]["circuit_state"] == "closed"
+        assert healthy_id not in {f["id"] for f in data}
+
     def test_delete_feed_non_existent(self, client: TestClient):
         non_existent_id = uuid.uuid4()
         response = client.delete(f"/api/v1/feeds/{non_existent_id}")
@@ -245,8 +273,9 @@ class TestFeedEndpoints:
 
         response = client.get(f"/api/v1/feeds/{feed_id}/articles/")
         assert response.status_code == 200
-        articles_data = response.json()
+        articles_data = response.json()["items"]
         assert len(articles_data) == len(MOCK_FEED_DATA.articles)
+        assert response.json()["next_cursor"] is None
         # Verify some content if needed, e.g., titles
         response_titles = {a["title"] for a in articles_data}
         mock_titles = {a.title for a in MOCK_FEED_DATA.articles}
@@ -272,13 +301,49 @@ class TestFeedEndpoints:
 
         response = client.get(f"/api/v1/feeds/{feed_id}/articles/")
         assert response.status_code == 200
-        assert response.json() == []
+        assert response.json() == {"items": [], "next_cursor": None}
+
+    @patch("app.db.crud.parse_feed")
+    def test_list_articles_for_feed_is_paginated(
+        self, mock_parse_feed: MagicMock, client: TestClient, db_session: Session
+    ):
+        mock_parse_feed.return_value = MOCK_FEED_DATA
+        add_response = self._add_feed_via_api(client, "http://pagedfeed.com/rss")
+        feed_id = add_response.json()["id"]
+
+        url = f"/api/v1/feeds/{feed_id}/articles/"
+        seen = []
+        page = client.get(url, params={"limit": 1}).json()
+        while True:
+            assert len(page["items"]) <= 1
+            seen.extend(a["title"] for a in page["items"])
+            if page["next_cursor"] is None:
+                break
+            page = client.get(
+                url, params={"limit": 1, "cursor": page["next_cursor"]}
+            ).json()
+        assert sorted(seen) == sorted(a.title for a in MOCK_FEED_DATA.articles)
+
+        assert client.get(url, params={"cursor": "not-a-cursor"}).status_code == 400
+        assert client.get(url, params={"limit": 1000}).status_code == 422
 
     def test_list_articles_for_non_existent_feed(self, client: TestClient):
         non_existent_id = uuid.uuid4()
         response = client.get(f"/api/v1/feeds/{non_existent_id}/articles/")
         assert response.status_code == 404
 
+    def _refresh_queue(self, db_session: Session, handler) -> RefreshJobQueue:
+        """A job queue on the test database whose jobs run when the test says"""
+        queue = RefreshJobQueue(
+            session_factory=lambda: db_session,
+            engine=RefreshEngine(
+                transport=httpx.MockTransport(handler),
+                parse_pool=ParsePool(workers=0),
+            ),
+        )
+        queue.start = MagicMock()
+        return queue
+
     @patch("app.db.crud.parse_feed")
     def test_refresh_feed(
         self, mock_parse_feed: MagicMock, client: TestClient, db_session: Session
@@ -289,37 +354,225 @@ class TestFeedEndpoints:
         add_response = self._add_feed_via_api(client, feed_url)
         assert add_response.status_code == 201
         feed_id = str(add_response.json()["id"])
-        initial_article_count = len(MOCK_FEED_DATA.articles)
-        assert len(add_response.json()["articles"]) == initial_article_count
+        assert len(add_response.json()["articles"]) == len(MOCK_FEED_DATA.articles)
 
-        # Configure mock for refresh to return new data
-        mock_parse_feed.reset_mock()
-        mock_parse_feed.return_value = MOCK_FEED_DATA_REFRESHED
-        refresh_response = client.post(f"/api/v1/feeds/{feed_id}/refresh")
-        assert refresh_response.status_code == 200
-        data = refresh_response.json()
-        assert str(data["id"]) == feed_id
-        if "articles" in data:
-            assert len(data["articles"]) == len(MOCK_FEED_DATA_REFRESHED.articles)
-            # Verify in DB
-            db_feed = (
-                db_session.query(FeedModel).filter(FeedModel.id == int(feed_id)).first()
-            )
-            assert db_feed is not None
-            assert len(db_feed.articles) == len(MOCK_FEED_DATA_REFRESHED.articles)
-            new_article_titles = {a.title for a in db_feed.articles}
-            assert MOCK_NEW_ARTICLE_AFTER_REFRESH.title in new_article_titles
-            mock_parse_feed.assert_called_once_with(feed_url)
-        else:
-            pytest.skip(
-                "'articles' key missing in refresh_feed response; check API implementation."
+        refreshed_rss = "".join(
+            f"<item><title>{a.title}</title><link>{a.link}</link>"
+            f"<guid>{a.guid}</guid></item>"
+            for a in MOCK_FEED_DATA_REFRESHED.articles
+        )
+        queue = self._refresh_queue(
+            db_session,
+            lambda request: httpx.Response(
+                200, text=f"<rss><channel>{refreshed_rss}</channel></rss>"
+            ),
+        )
+        with patch("app.api.v1.endpoints.feeds.refresh_jobs", queue):
+            refresh_response = client.post(f"/api/v1/feeds/{feed_id}/refresh")
+            assert refresh_response.status_code == 202
+            job = refresh_response.json()
+            assert job["feed_id"] == feed_id
+            assert job["status"] == "queued"
+            assert refresh_response.headers["Location"].endswith(
+                f"/api/v1/feeds/refresh-jobs/{job['id']}"
             )
 
+            # Repeated clicks share the queued job
+            again = client.post(f"/api/v1/feeds/{feed_id}/refresh")
+            assert again.status_code == 202
+            assert again.json()["id"] == job["id"]
+
+            assert queue.run_pending() == 1
+            status_response = client.get(f"/api/v1/feeds/refresh-jobs/{job['id']}")
+            assert status_response.status_code == 200
+            finished = status_response.json()
+            assert finished["status"] == "succeeded"
+            assert finished["new_articles"] == 1
+            assert finished["finished_at"] is not None
+
+            # Once finished, a new refresh gets a new job
+            next_job = client.post(f"/api/v1/feeds/{feed_id}/refresh").json()
+            assert next_job["id"] != job["id"]
+
+        db_feed = db_session.query(FeedModel).filter(FeedModel.id == int(feed_id)).one()
+        titles = {a.title for a in db_feed.articles}
+        assert MOCK_NEW_ARTICLE_AFTER_REFRESH.title in titles
+
+    def test_refresh_job_reports_fetch_failure(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        feed_id = str(feed_factory(feed_url="http://down.example.com/rss").id)
+        queue = self._refresh_queue(db_session, lambda request: httpx.Response(500))
+        with patch("app.api.v1.endpoints.feeds.refresh_jobs", queue):
+            job_id = client.post(f"/api/v1/feeds/{feed_id}/refresh").json()["id"]
+            queue.run_pending()
+            job = client.get(f"/api/v1/feeds/refresh-jobs/{job_id}").json()
+
+        assert job["status"] == "failed"
+        assert "500" in job["error"]
+
+    def test_unknown_refresh_job(self, client: TestClient):
+        response = client.get("/api/v1/feeds/refresh-jobs/does-not-exist")
+        assert response.status_code == 404
+
     def test_refresh_non_existent_feed(self, client: TestClient):
         non_existent_id = uuid.uuid4()
         response = client.post(f"/api/v1/feeds/{non_existent_id}/refresh")
         assert response.status_code == 404
 
+    def test_add_feed_while_host_is_deferred(self, client: TestClient):
+        url = "http://deferred.example.com/rss"
+        host_limiter.defer(url, 90)
+
+        response = self._add_feed_via_api(client, url)
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "90"
+
+    def test_add_feed_with_oversized_body(
+        self, client: TestClient, db_session: Session
+    ):
+        url = "http://huge.example.com/rss"
+        served = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            def body():
+                # Would run forever if the download were not capped
+                while True:
+                    served.append(1)
+                    yield b"<rss><channel><title>Huge</title>" + b" " * 512
+
+            return httpx.Response(200, content=body())
+
+        transport_client = http_client.create_client(
+            transport=httpx.MockTransport(handler)
+        )
+        with patch.object(
+            http_client, "get_client", return_value=transport_client
+        ), patch.object(feed_stream, "max_feed_bytes", return_value=4096):
+            response = self._add_feed_via_api(client, url)
+
+        assert response.status_code == 400
+        assert "limit" in response.json()["detail"]
+        assert len(served) < 20
+        assert db_session.query(FeedModel).filter_by(url=url).first() is None
+
+    def test_import_opml(self, client: TestClient, db_session: Session, feed_factory):
+        feed_factory(feed_url="http://known.example.com/rss")
+        opml = """<?xml version="1.0"?>
+<opml version="2.0"><head><title>Mine</title></head><body>
+  <outline text="Loose" xmlUrl="http://loose.example.com/rss"/>
+  <outline text="Tech">
+    <outline text="One" xmlUrl="http://one.example.com/rss"
+             htmlUrl="http://one.example.com"/>
+    <outline text="Known" xmlUrl="http://known.example.com/rss"/>
+  </outline>
+</body></opml>"""
+        queue = self._refresh_queue(
+            db_session,
+            lambda request: httpx.Response(
+                200,
+                text="<rss><channel><item><title>Hi</title>"
+                "<link>http://example.com/hi</link><guid>hi</guid>"
+                "</item></channel></rss>",
+            ),
+        )
+        with patch("app.api.v1.endpoints.feeds.refresh_jobs", queue):
+            response = client.post(
+                "/api/v1/feeds/import/opml",
+                content=opml,
+                headers={"Content-Type": "text/x-opml"},
+            )
+            assert response.status_code == 202
+            result = response.json()
+            assert result["feeds_created"] == 2
+            assert result["feeds_existing"] == 1
+            assert result["folders_created"] == 1
+            assert result["refresh"]["total"] == 2
+            assert result["refresh"]["queued"] == 2
+
+            assert queue.run_pending() == 2
+            progress = client.get(response.headers["Location"]).json()
+
+        assert progress["succeeded"] == 2
+        assert progress["finished_at"] is not None
+        one = db_session.query(FeedModel).filter_by(url="http://one.example.com/rss")
+        one = one.one()
+        assert one.title == "One"
+        assert one.site_url == "http://one.example.com"
+        assert one.folder.name == "Tech"
+        assert one.total_count == 1
+
+    def test_import_invalid_opml(self, client: TestClient):
+        response = client.post(
+            "/api/v1/feeds/import/opml",
+            content="<html><body>not opml</body></html>",
+            headers={"Content-Type": "text/x-opml"},
+        )
+        assert response.status_code == 400
+
+    def test_export_opml_round_trips(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        folder = FolderModel(name="News & Views")
+        db_session.add(folder)
+        db_session.commit()
+        feed_factory(feed_url="http://top.example.com/rss")
+        filed = feed_factory(feed_url="http://filed.example.com/rss")
+        filed.folder_id = folder.id
+        db_session.commit()
+
+        response = client.get("/api/v1/feeds/export/opml")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/x-opml")
+
+        from app.services.opml import parse_opml
+
+        entries = {entry.url: entry.folder for entry in parse_opml(response.content)}
+        assert entries == {
+            "http://top.example.com/rss": None,
+            "http://filed.example.com/rss": "News & Views",
+        }
+
+    def test_unknown_refresh_batch(self, client: TestClient):
+        response = client.get("/api/v1/feeds/refresh-batches/does-not-exist")
+        assert response.status_code == 404
+
+    def test_feed_icon_is_served_from_cache(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        feed_id = feed_factory(feed_url="http://icons.example.com/rss").id
+        with patch(
+            "app.services.favicons.discover_icon_url",
+            return_value="http://icons.example.com/favicon.ico",
+        ), patch(
+            "app.services.favicons.download_icon",
+            return_value=(b"png-bytes", "image/png"),
+        ) as download:
+            response = client.get(f"/api/v1/feeds/{feed_id}/icon")
+            assert response.status_code == 200
+            assert response.content == b"png-bytes"
+            assert response.headers["content-type"] == "image/png"
+            assert "max-age=" in response.headers["cache-control"]
+
+            revalidated = client.get(
+                f"/api/v1/feeds/{feed_id}/icon",
+                headers={"If-None-Match": response.headers["etag"]},
+            )
+            assert revalidated.status_code == 304
+            assert download.call_count == 1
+
+    def test_feed_icon_missing(
+        self, client: TestClient, db_session: Session, feed_factory
+    ):
+        feed_id = feed_factory(feed_url="http://noicon.example.com/rss").id
+        with patch(
+            "app.services.favicons.discover_icon_url",
+            return_value="http://noicon.example.com/favicon.ico",
+        ), patch("app.services.favicons.download_icon", return_value=None):
+            response = client.get(f"/api/v1/feeds/{feed_id}/icon")
+        assert response.status_code == 404
+
     @patch("app.services.feed_parser.fetch_feed_title_and_url")
     def test_fetch_feed_title_success(self, mock_fetch: MagicMock, client: TestClient):
         mocked_title = "Fetched Title"
@@ -1,10 +1,13 @@
 # backend/app/tests/api/v1/endpoints/test_folders.py
+from app.db import crud
 from app.db.models import Folder as FolderModel  # Alias to avoid name clash
+from app.schemas.article import ArticleCreate
 from app.schemas.folder import (  # FolderCreate/Update not directly used in these tests but good for context
     FolderCreate,
     FolderUpdate,
 )
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 
@@ -97,6 +100,67 @@ class TestFolderEndpoints:
         for item in data:
             assert item["feeds"] == []
 
+    def test_list_folders_includes_feeds_with_counts(
+        self, client: TestClient, db_session: Session, folder_factory, feed_factory
+    ):
+        folder_id = folder_factory(name="Folder With Feeds")
+        feed = feed_factory(feed_url="http://infolder.com/rss", folder_id=folder_id)
+        feed_id = feed.id
+        crud.bulk_create_articles(
+            db_session,
+            feed_id,
+            [
+                ArticleCreate(
+                    title="Unread",
+                    link="http://infolder.com/1",
+                    guid="infolder-1",
+                )
+            ],
+        )
+
+        response = client.get("/api/v1/folders/")
+        assert response.status_code == 200
+        (folder,) = response.json()
+        assert folder["id"] == str(folder_id)
+        assert folder["unread_count"] == 1
+        assert folder["total_count"] == 1
+        assert [f["id"] for f in folder["feeds"]] == [str(feed_id)]
+        assert folder["feeds"][0]["unread_count"] == 1
+        assert "articles" not in folder["feeds"][0]
+
+    def test_list_folders_query_count_is_constant(
+        self, client: TestClient, db_session: Session, folder_factory, feed_factory
+    ):
+        def count_queries() -> int:
+            statements = []
+
+            def record(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+
+            bind = db_session.get_bind()
+            event.listen(bind, "before_cursor_execute", record)
+            try:
+                response = client.get("/api/v1/folders/")
+            finally:
+                event.remove(bind, "before_cursor_execute", record)
+            assert response.status_code == 200
+            return len(statements)
+
+        def add_folders(start: int, count: int):
+            for i in range(start, start + count):
+                folder_id = folder_factory(name=f"Benchmark Folder {i}")
+                for j in range(2):
+                    feed_factory(
+                        feed_url=f"http://bench{i}-{j}.com/rss", folder_id=folder_id
+                    )
+
+        add_folders(0, 3)
+        small = count_queries()
+        add_folders(3, 30)
+        large = count_queries()
+
+        assert small == large
+
     def test_rename_folder_success(self, client: TestClient, db_session: Session):
         original_name = "Old Name"
         new_name = "New Name"
@@ -8,7 +8,9 @@ if backend_root not in sys.path:
     sys.path.insert(0, backend_root)
 
 import uuid  # For potential default UUIDs if needed
+from concurrent.futures import Future
 from typing import Callable  # For type hinting factories
+from unittest.mock import patch
 
 import pytest
 from app.db.database import Base, get_db
@@ -17,6 +19,10 @@ from app.db.database import Base, get_db
 from app.db.models import Feed as FeedModel
 from app.db.models import Folder as FolderModel
 from app.main import app
+from app.services import feed_stream
+from app.services.feed_import import feed_importer
+from app.services.feed_parser import host_limiter
+from app.services.seen_entries import seen_entries
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
@@ -64,6 +70,53 @@ def client(db_session):
     del app.dependency_overrides[get_db]
 
 
+@pytest.fixture(autouse=True)
+def reset_host_limiter():
+    """Requests made by one test must not rate limit the next"""
+    host_limiter.reset()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_seen_entries():
+    """Each test's database starts empty, so forget previously stored entries"""
+    seen_entries.forget()
+    yield
+
+
+@pytest.fixture(params=["lxml", "elementtree"])
+def xml_backend(request):
+    """Run a test under both pull parsers the fast feed path can use"""
+    if request.param == "lxml":
+        if feed_stream.lxml_etree is None:
+            pytest.skip("lxml is not installed")
+        yield request.param
+    else:
+        with patch.object(feed_stream, "lxml_etree", None):
+            yield request.param
+
+
+class InlineExecutor:
+    """Runs submitted work immediately instead of on a worker thread"""
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+@pytest.fixture(autouse=True)
+def inline_feed_import(db_session):
+    """Finish a new feed's background import before the request returns,
+    on the test database"""
+    with patch.object(feed_importer, "executor", InlineExecutor()), patch.object(
+        feed_importer,
+        "session_factory",
+        lambda: TestingSessionLocal(bind=db_session.get_bind()),
+    ):
+        yield
+
+
 @pytest.fixture
 def folder_factory(db_session: Session) -> Callable[..., int]:
     """Fixture to create Folder models directly in the database and return the folder id."""
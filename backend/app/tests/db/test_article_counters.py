@@ -0,0 +1,93 @@
+# backend/app/tests/db/test_article_counters.py
+from datetime import datetime, timedelta, timezone
+
+from app.db import crud
+from app.db.models import Article as ArticleModel
+from app.db.models import Feed as FeedModel
+from app.db.models import Folder as FolderModel
+from app.schemas.article import ArticleCreate
+from sqlalchemy.orm import Session
+
+
+def _articles(prefix: str, count: int, start: datetime) -> list[ArticleCreate]:
+    return [
+        ArticleCreate(
+            title=f"{prefix} {i}",
+            link=f"http://example.com/{prefix}/{i}",
+            guid=f"{prefix}-{i}",
+            published_at=start + timedelta(hours=i),
+        )
+        for i in range(count)
+    ]
+
+
+def _counters(db_session: Session, model, row_id: int):
+    row = db_session.get(model, row_id)
+    db_session.refresh(row)
+    return row.unread_count, row.total_count
+
+
+class TestArticleCounters:
+    def test_bulk_insert_increments_feed_and_folder(
+        self, db_session: Session, folder_factory, feed_factory
+    ):
+        folder_id = folder_factory(name="Counted")
+        feed = feed_factory(
+            feed_url="http://counted.example.com/rss", folder_id=folder_id
+        )
+        start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+        crud.bulk_create_articles(db_session, feed.id, _articles("a", 3, start))
+        # Duplicates are not counted twice
+        crud.bulk_create_articles(db_session, feed.id, _articles("a", 4, start))
+
+        assert _counters(db_session, FeedModel, feed.id) == (4, 4)
+        assert _counters(db_session, FolderModel, folder_id) == (4, 4)
+        assert feed.latest_article_at.replace(tzinfo=timezone.utc) == start + timedelta(
+            hours=3
+        )
+
+    def test_cleanup_keeps_counters_in_step(self, db_session: Session, feed_factory):
+        feed = feed_factory(feed_url="http://counted-cleanup.example.com/rss")
+        old = datetime.now(timezone.utc) - timedelta(days=30)
+        crud.bulk_create_articles(db_session, feed.id, _articles("old", 3, old))
+
+        crud.delete_old_articles(db_session, 7)
+
+        assert _counters(db_session, FeedModel, feed.id) == (0, 0)
+
+    def test_move_feed_moves_counters_between_folders(
+        self, db_session: Session, folder_factory, feed_factory
+    ):
+        source = folder_factory(name="Source")
+        target = folder_factory(name="Target")
+        feed = feed_factory(feed_url="http://moving.example.com/rss", folder_id=source)
+        start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        crud.bulk_create_articles(db_session, feed.id, _articles("m", 2, start))
+
+        crud.move_feed(db_session, feed, target)
+
+        assert _counters(db_session, FolderModel, source) == (0, 0)
+        assert _counters(db_session, FolderModel, target) == (2, 2)
+
+    def test_reconcile_repairs_drift(
+        self, db_session: Session, folder_factory, feed_factory
+    ):
+        folder_id = folder_factory(name="Drifted")
+        feed = feed_factory(
+            feed_url="http://drift.example.com/rss", folder_id=folder_id
+        )
+        untouched = feed_factory(feed_url="http://nodrift.example.com/rss")
+        start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        crud.bulk_create_articles(db_session, feed.id, _articles("d", 2, start))
+        # Writes that bypass crud leave the counters stale
+        db_session.query(ArticleModel).filter(ArticleModel.guid == "d-0").update(
+            {ArticleModel.is_read: True}
+        )
+        db_session.commit()
+
+        assert crud.reconcile_counters(db_session) == 1
+        assert _counters(db_session, FeedModel, feed.id) == (1, 2)
+        assert _counters(db_session, FolderModel, folder_id) == (1, 2)
+        assert _counters(db_session, FeedModel, untouched.id) == (0, 0)
+        assert crud.reconcile_counters(db_session) == 0
@@ -0,0 +1,65 @@
+# backend/app/tests/db/test_bulk_create_articles.py
+from datetime import datetime, timezone
+
+from app.db import crud
+from app.db.models import Article as ArticleModel
+from app.schemas.article import ArticleCreate
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+def _article(guid: str, link: str | None = None) -> ArticleCreate:
+    return ArticleCreate(
+        title=f"Article {guid}",
+        link=link or f"http://example.com/{guid}",
+        guid=guid,
+        published_at=datetime(2023, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+class TestBulkCreateArticles:
+    def test_inserts_only_unseen_articles(self, db_session: Session, feed_factory):
+        feed = feed_factory()
+        assert crud.bulk_create_articles(db_session, feed.id, [_article("a")]) == 1
+
+        inserted = crud.bulk_create_articles(
+            db_session,
+            feed.id,
+            [
+                _article("a"),  # same guid
+                _article("moved", link="http://example.com/a"),  # same link
+                _article("b"),
+                _article("b"),  # repeated within the document
+            ],
+        )
+
+        assert inserted == 1
+        guids = {
+            guid
+            for (guid,) in db_session.query(ArticleModel.guid).filter(
+                ArticleModel.feed_id == feed.id
+            )
+        }
+        assert guids == {"a", "b"}
+
+    def test_uses_constant_number_of_statements(
+        self, db_session: Session, feed_factory
+    ):
+        feed = feed_factory()
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        bind = db_session.get_bind()
+        event.listen(bind, "before_cursor_execute", record)
+        try:
+            inserted = crud.bulk_create_articles(
+                db_session, feed.id, [_article(f"guid-{i}") for i in range(50)]
+            )
+        finally:
+            event.remove(bind, "before_cursor_execute", record)
+
+        assert inserted == 50
+        assert len([s for s in statements if s.startswith("SELECT")]) == 1
+        assert len([s for s in statements if s.startswith("INSERT")]) == 1
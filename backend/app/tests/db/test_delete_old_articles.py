@@ -0,0 +1,48 @@
+# backend/app/tests/db/test_delete_old_articles.py
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from app.db import crud
+from app.db.models import Article as ArticleModel
+from sqlalchemy.orm import Session
+
+
+def _add_articles(db_session: Session, feed_id: int, ages_in_days: list[int]):
+    now = datetime.now(timezone.utc)
+    for i, age in enumerate(ages_in_days):
+        db_session.add(
+            ArticleModel(
+                feed_id=feed_id,
+                title=f"Article {i}",
+                link=f"http://example.com/cleanup/{i}",
+                guid=f"cleanup-{i}",
+                published_at=now - timedelta(days=age),
+            )
+        )
+    db_session.commit()
+
+
+class TestDeleteOldArticles:
+    def test_deletes_only_articles_older_than_cutoff(
+        self, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://cleanup.example.com/rss")
+        _add_articles(db_session, feed.id, [1, 6, 8, 30, 400])
+
+        deleted = crud.delete_old_articles(db_session, 7)
+
+        assert deleted == 3
+        remaining = {title for (title,) in db_session.query(ArticleModel.title).all()}
+        assert remaining == {"Article 0", "Article 1"}
+
+    def test_deletes_in_batches(self, db_session: Session, feed_factory):
+        feed = feed_factory(feed_url="http://batched-cleanup.example.com/rss")
+        _add_articles(db_session, feed.id, [30] * 5 + [1])
+
+        with patch.object(crud, "ARTICLE_DELETE_BATCH_SIZE", 2):
+            with patch.object(db_session, "commit", wraps=db_session.commit) as commit:
+                deleted = crud.delete_old_articles(db_session, 7)
+
+        assert deleted == 5
+        assert commit.call_count == 3
+        assert db_session.query(ArticleModel).count() == 1
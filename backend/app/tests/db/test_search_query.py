@@ -0,0 +1,31 @@
+# backend/app/tests/db/test_search_query.py
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.db import crud
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+
+def _postgres_search_query(db_session: Session, text: str):
+    bind = SimpleNamespace(dialect=postgresql.dialect())
+    with patch.object(db_session, "get_bind", return_value=bind):
+        return crud._search_query(db_session, text)
+
+
+def _sql(expression) -> str:
+    return str(expression.compile(dialect=postgresql.dialect()))
+
+
+def test_postgres_score_is_double_precision(db_session: Session):
+    # The cursor binds a float8, which never equals a float4 rank exactly
+    _, score, _ = _postgres_search_query(db_session, "python")
+    assert _sql(score).startswith("CAST(ts_rank_cd(")
+    assert _sql(score).endswith("AS FLOAT(53))")
+
+
+def test_postgres_snippet_covers_indexed_columns(db_session: Session):
+    _, _, snippet = _postgres_search_query(db_session, "python")
+    sql = _sql(snippet)
+    for column in ("articles.title", "articles.description", "articles.content"):
+        assert column in sql
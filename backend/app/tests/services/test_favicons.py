@@ -0,0 +1,82 @@
+# backend/app/tests/services/test_favicons.py
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import httpx
+import pytest
+from app.db.models import Favicon
+from app.services import favicons, http_client
+from sqlalchemy.orm import Session
+
+ICON = b"\x00\x00\x01\x00icon"
+
+
+@pytest.fixture
+def site():
+    """A mock site with an icon link in its head; records requested paths"""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/":
+            return httpx.Response(
+                200,
+                html="<html><head><title>Site</title>"
+                '<link rel="Shortcut Icon" href="/static/icon.ico"></head>'
+                "<body>" + "<p>never parsed</p>" * 10000 + "</body></html>",
+            )
+        if request.url.path == "/static/icon.ico":
+            return httpx.Response(
+                200, content=ICON, headers={"Content-Type": "image/x-icon"}
+            )
+        return httpx.Response(404)
+
+    client = http_client.create_client(transport=httpx.MockTransport(handler))
+    with patch.object(http_client, "get_client", return_value=client):
+        yield requests
+    client.close()
+
+
+def test_icon_link_parser_stops_at_head():
+    parser = favicons.IconLinkParser()
+    with pytest.raises(favicons._HeadParsed):
+        parser.feed('<head><meta charset="utf-8"></head><link rel="icon" href="x">')
+    assert parser.href is None
+
+
+def test_get_favicon_is_shared_per_domain(db_session: Session, site):
+    first = favicons.get_favicon(db_session, "http://blog.example.com/")
+    second = favicons.get_favicon(db_session, "http://blog.example.com/other/")
+
+    assert second.id == first.id
+    assert first.icon_url == "http://blog.example.com/static/icon.ico"
+    assert first.data == ICON
+    assert first.content_type == "image/x-icon"
+    assert site == ["/", "/static/icon.ico"]
+
+
+def test_stale_favicon_is_refreshed_and_kept_on_failure(db_session: Session, site):
+    favicon = favicons.get_favicon(db_session, "http://blog.example.com/")
+    favicon.fetched_at = datetime.now(timezone.utc) - timedelta(days=30)
+    db_session.commit()
+
+    with patch.object(favicons, "download_icon", return_value=None):
+        refreshed = favicons.get_favicon(db_session, "http://blog.example.com/")
+
+    assert refreshed.data == ICON
+    assert favicons._is_fresh(refreshed, datetime.now(timezone.utc))
+    assert db_session.query(Favicon).count() == 1
+
+
+def test_missing_icon_is_cached(db_session: Session):
+    client = http_client.create_client(
+        transport=httpx.MockTransport(lambda request: httpx.Response(404))
+    )
+    with patch.object(http_client, "get_client", return_value=client):
+        favicon = favicons.get_favicon(db_session, "http://bare.example.com/")
+
+    assert favicon.icon_url is None
+    assert favicon.data is None
+    with patch.object(favicons, "discover_icon_url") as discover:
+        favicons.get_favicon(db_session, "http://bare.example.com/")
+    discover.assert_not_called()
@@ -0,0 +1,67 @@
+# backend/app/tests/services/test_feed_dates.py
+import importlib.util
+import sys
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from app.services.feed_dates import parse_feed_date, standardize_date
+
+UTC = timezone.utc
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("Mon, 02 Jan 2023 10:00:00 GMT", datetime(2023, 1, 2, 10, tzinfo=UTC)),
+        ("2 Jan 2023 10:00 +0130", datetime(2023, 1, 2, 8, 30, tzinfo=UTC)),
+        ("Tue, 3 Jan 2023 23:59:59 -0800", datetime(2023, 1, 4, 7, 59, 59, tzinfo=UTC)),
+        ("Wed, 04 Jan 2023 12:00:00 EST", datetime(2023, 1, 4, 17, tzinfo=UTC)),
+        ("Fri, 06 Jan 2023 12:00:00", datetime(2023, 1, 6, 12, tzinfo=UTC)),
+        ("Mon, 02 Jan 23 10:00:00 GMT", datetime(2023, 1, 2, 10, tzinfo=UTC)),
+        ("2023-01-02T10:00:00Z", datetime(2023, 1, 2, 10, tzinfo=UTC)),
+        ("2023-01-02T10:00:00+05:30", datetime(2023, 1, 2, 4, 30, tzinfo=UTC)),
+        ("2023-01-02 10:00:00", datetime(2023, 1, 2, 10, tzinfo=UTC)),
+        ("Monday, 02-Jan-23 10:00:00 GMT", datetime(2023, 1, 2, 10, tzinfo=UTC)),
+    ],
+)
+def test_parse_feed_date_returns_aware_utc(value, expected):
+    parsed = parse_feed_date(value)
+    assert parsed == expected
+    assert parsed.tzinfo is UTC
+
+
+@pytest.mark.parametrize("value", ["", "not a date", "Mon, 31 Feb 2023 10:00:00 GMT"])
+def test_parse_feed_date_rejects_garbage(value):
+    assert parse_feed_date(value) is None
+
+
+def test_parse_feed_date_is_memoized():
+    parse_feed_date.cache_clear()
+    parse_feed_date("Mon, 02 Jan 2023 10:00:00 GMT")
+    parse_feed_date("Mon, 02 Jan 2023 10:00:00 GMT")
+    assert parse_feed_date.cache_info().hits == 1
+
+
+def test_standardize_date_falls_back_to_now():
+    for value in ("", None, "not a date"):
+        result = standardize_date(value)
+        assert result.tzinfo is UTC
+        assert datetime.now(UTC) - result < timedelta(seconds=5)
+
+
+def test_dates_parse_without_feedparser_helper():
+    # A fresh copy of the module, as imported after feedparser moved _parse_date
+    spec = importlib.util.find_spec("app.services.feed_dates")
+    feed_dates = importlib.util.module_from_spec(spec)
+    with patch.dict(sys.modules, {"feedparser.datetimes": None}):
+        spec.loader.exec_module(feed_dates)
+
+    assert feed_dates._parse_date is None
+    for value, expected in [
+        ("Mon, 02 Jan 2023 10:00:00 GMT", datetime(2023, 1, 2, 10, tzinfo=UTC)),
+        ("2023-01-02T10:00:00+05:30", datetime(2023, 1, 2, 4, 30, tzinfo=UTC)),
+        ("Monday, 02-Jan-23 10:00:00 GMT", datetime(2023, 1, 2, 10, tzinfo=UTC)),
+    ]:
+        assert feed_dates.parse_feed_date(value) == expected
+    assert feed_dates.parse_feed_date("not a date") is None
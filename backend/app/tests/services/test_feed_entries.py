@@ -0,0 +1,87 @@
+# backend/app/tests/services/test_feed_entries.py
+from app.services.feed_entries import extract_image_url
+from feedparser.util import FeedParserDict
+
+BASE_URL = "https://example.com"
+
+
+def entry(**fields) -> FeedParserDict:
+    return FeedParserDict(**fields)
+
+
+class TestExtractImageUrl:
+    def test_image_enclosure_wins(self):
+        item = entry(
+            links=[
+                FeedParserDict(
+                    rel="enclosure", type="audio/mpeg", href="https://e.com/a.mp3"
+                ),
+                FeedParserDict(
+                    rel="enclosure", type="image/jpeg", href="https://e.com/e.jpg"
+                ),
+            ],
+            summary='<img src="/body.jpg">',
+        )
+        assert extract_image_url(item, BASE_URL) == "https://e.com/e.jpg"
+
+    def test_media_content_plain_dicts(self):
+        item = entry(
+            media_content=[
+                {"url": "https://e.com/v.mp4", "type": "video/mp4"},
+                {"url": "https://e.com/m.png", "medium": "image"},
+            ],
+            media_thumbnail=[{"url": "https://e.com/t.jpg"}],
+        )
+        assert extract_image_url(item) == "https://e.com/m.png"
+
+    def test_thumbnail_before_body_images(self):
+        item = entry(
+            media_thumbnail=[{"url": "https://e.com/t.jpg"}],
+            summary='<img src="/body.jpg">',
+        )
+        assert extract_image_url(item) == "https://e.com/t.jpg"
+
+    def test_first_real_body_image_is_made_absolute(self):
+        item = entry(
+            content=[
+                FeedParserDict(
+                    value='<img src="data:image/gif;base64,R0l">'
+                    '<img class="a" src="/static/icon-share.png">'
+                    "<p>text</p><img alt='x' src='/img/hero.jpg'>"
+                )
+            ]
+        )
+        assert extract_image_url(item, BASE_URL) == "https://example.com/img/hero.jpg"
+
+    def test_body_image_in_any_blob_beats_meta_tags(self):
+        item = entry(
+            content=[FeedParserDict(value='<meta property="og:image" content="/og">')],
+            summary='<IMG SRC="https://e.com/s.jpg">',
+        )
+        assert extract_image_url(item, BASE_URL) == "https://e.com/s.jpg"
+
+    def test_entry_image_before_meta_tags(self):
+        item = entry(
+            image={"href": "https://e.com/itunes.jpg"},
+            summary='<meta property="og:image" content="/og.jpg">',
+        )
+        assert extract_image_url(item, BASE_URL) == "https://e.com/itunes.jpg"
+
+    def test_og_image_before_twitter_image(self):
+        item = entry(
+            content=[
+                FeedParserDict(
+                    value='<meta name="twitter:image" content="/tw.jpg">'
+                    '<meta property="og:image" content="/og.jpg">'
+                )
+            ]
+        )
+        assert extract_image_url(item, BASE_URL) == "https://example.com/og.jpg"
+
+    def test_twitter_image_fallback(self):
+        item = entry(summary='<meta name="twitter:image" content="/tw.jpg">')
+        assert extract_image_url(item, BASE_URL) == "https://example.com/tw.jpg"
+
+    def test_no_image(self):
+        assert extract_image_url(entry(summary="plain text, no markup")) is None
+        assert extract_image_url(entry()) is None
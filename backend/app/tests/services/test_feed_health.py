@@ -0,0 +1,62 @@
+# backend/app/tests/services/test_feed_health.py
+from datetime import datetime, timedelta, timezone
+
+from app.db.models import Feed as FeedModel
+from app.services.feed_health import (
+    BACKOFF_BASE_SECONDS,
+    BACKOFF_MAX_SECONDS,
+    CIRCUIT_CLOSED,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    begin_fetch_attempt,
+    record_fetch_failure,
+    record_fetch_success,
+    retry_delay_seconds,
+)
+
+NOW = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _feed() -> FeedModel:
+    return FeedModel(
+        url="http://failing.example.com/rss",
+        consecutive_failures=0,
+        circuit_state=CIRCUIT_CLOSED,
+    )
+
+
+class TestFeedHealth:
+    def test_retry_delay_grows_exponentially_up_to_max(self):
+        assert retry_delay_seconds(0) == 0
+        assert retry_delay_seconds(1) == BACKOFF_BASE_SECONDS
+        assert retry_delay_seconds(3) == BACKOFF_BASE_SECONDS * 4
+        assert retry_delay_seconds(100) == BACKOFF_MAX_SECONDS
+
+    def test_failures_back_off_and_open_circuit(self):
+        feed = _feed()
+        record_fetch_failure(feed, ValueError("timeout"), now=NOW)
+
+        assert feed.consecutive_failures == 1
+        assert feed.last_error == "timeout"
+        assert feed.next_retry_at == NOW + timedelta(seconds=BACKOFF_BASE_SECONDS)
+        assert feed.circuit_state == CIRCUIT_CLOSED
+
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD - 1):
+            record_fetch_failure(feed, "still failing", now=NOW)
+        assert feed.circuit_state == CIRCUIT_OPEN
+
+    def test_open_circuit_allows_single_trial_after_retry_time(self):
+        feed = _feed()
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+            record_fetch_failure(feed, "down", now=NOW)
+
+        assert begin_fetch_attempt(feed, now=NOW) is False
+        assert begin_fetch_attempt(feed, now=feed.next_retry_at) is True
+        assert feed.circuit_state == CIRCUIT_HALF_OPEN
+
+        record_fetch_success(feed)
+        assert feed.circuit_state == CIRCUIT_CLOSED
+        assert feed.consecutive_failures == 0
+        assert feed.next_retry_at is None
+        assert feed.last_error is None
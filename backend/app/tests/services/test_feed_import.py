@@ -0,0 +1,91 @@
+# backend/app/tests/services/test_feed_import.py
+import threading
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from app.db.database import Base
+from app.db.models import Article as ArticleModel
+from app.db.models import Favicon as FaviconModel
+from app.db.models import Feed as FeedModel
+from app.services.feed_import import FeedImporter
+from app.services.feed_parser import ArticleData, FeedData
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+PARSED = FeedData(
+    title="Import Feed",
+    link="http://import.example.com/rss",
+    site_url="http://import.example.com",
+    description="",
+    articles=[
+        ArticleData(
+            title=f"Article {n}",
+            link=f"http://import.example.com/{n}",
+            published_at=datetime(2023, 1, n, tzinfo=timezone.utc),
+            guid=f"import-{n}",
+            content="<p>Body</p>",
+        )
+        for n in range(1, 4)
+    ],
+)
+
+
+def test_articles_import_while_favicon_is_slow(tmp_path):
+    # A file database, so the importer's threads each get a real connection
+    engine = create_engine(f"sqlite:///{tmp_path / 'import.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        feed = FeedModel(url=PARSED.link, feed_url=PARSED.link, title=PARSED.title)
+        db.add(feed)
+        db.commit()
+        feed_id = feed.id
+
+    homepage_answered = threading.Event()
+
+    def slow_homepage(site_url):
+        homepage_answered.wait(timeout=5)
+        return f"{site_url}/favicon.ico"
+
+    importer = FeedImporter(session_factory=Session)
+    try:
+        with patch("app.services.favicons.discover_icon_url", slow_homepage), patch(
+            "app.services.favicons.download_icon",
+            return_value=(b"icon", "image/x-icon"),
+        ):
+            articles_job, favicon_job = importer.submit(feed_id, PARSED)
+            articles_job.result(timeout=5)
+
+            with Session() as db:
+                stored = db.query(ArticleModel).filter_by(feed_id=feed_id).count()
+                feed = db.get(FeedModel, feed_id)
+                assert stored == 3
+                assert feed.total_count == 3
+                assert feed.favicon is None
+            assert not favicon_job.done()
+
+            homepage_answered.set()
+            favicon_job.result(timeout=5)
+    finally:
+        importer.shutdown()
+
+    with Session() as db:
+        assert db.get(FeedModel, feed_id).favicon == f"/api/v1/feeds/{feed_id}/icon"
+        cached = db.query(FaviconModel).one()
+        assert cached.icon_url == "http://import.example.com/favicon.ico"
+
+
+def test_known_favicon_is_not_looked_up():
+    importer = FeedImporter()
+    try:
+        with patch.object(importer, "_import_articles"), patch.object(
+            importer, "_find_favicon"
+        ) as find_favicon:
+            jobs = importer.submit(1, PARSED, find_favicon=False)
+            for job in jobs:
+                job.result(timeout=5)
+    finally:
+        importer.shutdown()
+
+    assert len(jobs) == 1
+    find_favicon.assert_not_called()
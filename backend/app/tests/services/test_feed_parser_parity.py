@@ -0,0 +1,56 @@
+# backend/app/tests/services/test_feed_parser_parity.py
+from pathlib import Path
+
+import feedparser
+import pytest
+from app.services.feed_parser import articles_from_entries
+from app.services.feed_stream import IncrementalFeedParser, parse_document
+
+pytestmark = pytest.mark.usefixtures("xml_backend")
+
+CORPUS = sorted((Path(__file__).parent / "feed_corpus").glob("*.xml"))
+
+
+def _fast_parse(body: bytes):
+    parser = IncrementalFeedParser()
+    entries = parser.feed(body) + parser.close()
+    assert not parser.failed
+    return parser, entries
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=lambda path: path.name)
+def test_fast_parser_matches_feedparser(path: Path):
+    """The fast parser must produce the same articles feedparser would"""
+    body = path.read_bytes()
+    reference = feedparser.parse(body)
+    parser, entries = _fast_parse(body)
+
+    for key in ("title", "link", "description"):
+        assert parser.feed_info.get(key) == reference.feed.get(key)
+    assert len(entries) == len(reference.entries)
+    for fast, slow in zip(entries, reference.entries):
+        assert fast.get("published") == slow.get("published")
+        assert fast.get("updated") == slow.get("updated")
+
+    expected = articles_from_entries(1, reference.entries, reference.feed.get("link"))
+    actual = articles_from_entries(1, entries, parser.site_link)
+    assert [a.model_dump() for a in actual] == [a.model_dump() for a in expected]
+
+
+def test_corpus_is_not_empty():
+    assert CORPUS
+
+
+def test_parse_document_falls_back_on_malformed_xml():
+    """HTML entities are not XML; feedparser's loose parser still copes"""
+    body = b"""<rss version="2.0"><channel><title>Caf&eacute;</title>
+<item><title>Broken &amp entry</title><link>http://broken.example.com/1</link>
+</item></channel></rss>"""
+    parser = IncrementalFeedParser()
+    parser.feed(body)
+    parser.close()
+    assert parser.failed
+
+    result = parse_document(body)
+    assert result.feed.title == "Café"
+    assert result.entries[0].link == "http://broken.example.com/1"
@@ -0,0 +1,192 @@
+# backend/app/tests/services/test_feed_stream.py
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from app.db.models import Article as ArticleModel
+from app.services import feed_stream, http_client
+from app.services.feed_parser import (
+    fetch_and_save_articles_for_feed,
+    save_streamed_feed,
+)
+from app.services.feed_stream import (
+    FeedTooLargeError,
+    IncrementalFeedParser,
+    StreamedFeed,
+)
+from app.services.refresh_engine import RefreshEngine
+from sqlalchemy.orm import Session
+
+pytestmark = pytest.mark.usefixtures("xml_backend")
+
+RSS_BODY = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"
+     xmlns:media="http://search.yahoo.com/mrss/">
+<channel><title>Stream</title><link>http://stream.example.com/</link>
+<item><title>One</title><link>http://stream.example.com/1</link>
+<guid>stream-1</guid><pubDate>Mon, 02 Jan 2023 10:00:00 GMT</pubDate>
+<description>&lt;p&gt;Hello&lt;script&gt;alert(1)&lt;/script&gt;&lt;/p&gt;</description>
+<media:thumbnail url="http://stream.example.com/1.jpg"/></item>
+<item><title>Two</title><link>http://stream.example.com/2</link>
+<guid>stream-2</guid><pubDate>Tue, 03 Jan 2023 10:00:00 GMT</pubDate>
+<content:encoded><![CDATA[<p>Body <img src="/img/2.png"></p>]]></content:encoded></item>
+</channel></rss>"""
+
+ATOM_BODY = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+<title>Atom</title><link href="http://atom.example.com/"/>
+<entry><title type="html">A &lt;b&gt;bold&lt;/b&gt; title</title>
+<link href="http://atom.example.com/1"/><id>tag:atom,1</id>
+<published>2023-01-02T10:00:00Z</published>
+<content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml"><p>Hi</p></div></content>
+</entry></feed>"""
+
+
+def _chunks(body: bytes, size: int = 64):
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+class TestIncrementalFeedParser:
+    def test_yields_entries_as_they_arrive(self):
+        parser = IncrementalFeedParser()
+        first_item_end = RSS_BODY.index(b"</item>") + len(b"</item>")
+
+        early = parser.feed(RSS_BODY[:first_item_end])
+        rest = parser.feed(RSS_BODY[first_item_end:]) + parser.close()
+
+        assert [entry.id for entry in early] == ["stream-1"]
+        assert [entry.id for entry in rest] == ["stream-2"]
+        assert parser.site_link == "http://stream.example.com/"
+        assert not parser.failed
+
+    def test_entries_match_feedparser_shape(self):
+        parser = IncrementalFeedParser()
+        entries = []
+        for chunk in _chunks(RSS_BODY):
+            entries.extend(parser.feed(chunk))
+        entries.extend(parser.close())
+
+        first, second = entries
+        assert first.title == "One"
+        assert first.link == "http://stream.example.com/1"
+        assert first.published == "Mon, 02 Jan 2023 10:00:00 GMT"
+        # Content is sanitized just as feedparser would
+        assert first.summary == "<p>Hello</p>"
+        assert first.media_thumbnail[0]["url"] == "http://stream.example.com/1.jpg"
+        assert second.content[0].value == '<p>Body <img src="/img/2.png" /></p>'
+
+    def test_parses_atom(self):
+        parser = IncrementalFeedParser()
+        (entry,) = parser.feed(ATOM_BODY) + parser.close()
+
+        assert entry.id == "tag:atom,1"
+        assert entry.link == "http://atom.example.com/1"
+        assert entry.title == "A <b>bold</b> title"
+        assert entry.content[0].value == "<p>Hi</p>"
+        assert parser.site_link == "http://atom.example.com/"
+
+    def test_malformed_xml_marks_failure(self):
+        parser = IncrementalFeedParser()
+        parser.feed(b"<rss><channel><item><title>&nbsp;</title></item>")
+
+        assert parser.failed
+        assert parser.close() == []
+
+    def test_falls_back_without_feedparser_helpers(self):
+        # As if a feedparser upgrade had moved its private helpers
+        with patch.object(feed_stream, "_sanitize_html", None):
+            parser = IncrementalFeedParser()
+            assert parser.feed(RSS_BODY) == []
+            assert parser.failed
+
+            parsed = feed_stream.parse_document(RSS_BODY)
+        assert [entry.id for entry in parsed.entries] == ["stream-1", "stream-2"]
+        assert parsed.feed.title == "Stream"
+
+
+class TestStreamedFeed:
+    def test_enforces_size_limit_while_streaming(self):
+        body = StreamedFeed("http://big.example.com/rss", max_bytes=100)
+        body.add(b"x" * 60)
+
+        with pytest.raises(FeedTooLargeError):
+            body.add(b"x" * 60)
+
+    def test_rejects_large_content_length_up_front(self):
+        body = StreamedFeed("http://big.example.com/rss", max_bytes=100)
+
+        with pytest.raises(FeedTooLargeError):
+            body.check_headers(httpx.Headers({"Content-Length": "5000"}))
+
+    def test_hashes_and_keeps_body_for_fallback(self):
+        body = StreamedFeed("http://hash.example.com/rss")
+        for chunk in _chunks(RSS_BODY):
+            body.add(chunk)
+        body.finish()
+
+        assert body.read_body() == RSS_BODY
+        assert len(body.content_hash) == 64
+        assert len(body.entries) == 2
+        body.close()
+
+    def test_malformed_feed_falls_back_to_feedparser(
+        self, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://fallback.example.com/rss")
+        malformed = RSS_BODY.replace(b"<title>One</title>", b"<title>One&nbsp;</title>")
+        body = StreamedFeed(feed.url)
+        for chunk in _chunks(malformed):
+            body.add(chunk)
+        body.finish()
+
+        assert body.parser.failed
+        assert save_streamed_feed(feed, body, db_session) == 2
+        titles = {title for (title,) in db_session.query(ArticleModel.title)}
+        assert titles == {"One", "Two"}
+        body.close()
+
+
+class TestStreamingRefresh:
+    def test_identical_body_is_hashed_before_parsing(
+        self, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://samebody.example.com/rss")
+        client = http_client.create_client(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, content=RSS_BODY)
+            )
+        )
+        with patch.object(http_client, "get_client", return_value=client), patch.object(
+            feed_stream, "_pull_parser", wraps=feed_stream._pull_parser
+        ) as xml_parse:
+            first = fetch_and_save_articles_for_feed(feed, db_session)
+            assert xml_parse.call_count == 1
+            second = fetch_and_save_articles_for_feed(feed, db_session)
+
+        assert first == "Fetched and saved 2 new articles."
+        assert second == "Feed not modified."
+        assert xml_parse.call_count == 1
+
+    def test_oversized_feed_is_aborted_and_recorded(
+        self, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://huge.example.com/rss")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=RSS_BODY * 10)
+
+        engine = RefreshEngine(transport=httpx.MockTransport(handler))
+
+        async def run():
+            try:
+                return await engine.refresh_feeds([feed], db_session)
+            finally:
+                await engine.aclose()
+
+        with patch.object(feed_stream, "max_feed_bytes", return_value=1024):
+            stats = asyncio.run(run())
+
+        assert stats.failed == 1
+        assert "limit" in feed.last_error
+        assert db_session.query(ArticleModel).count() == 0
@@ -0,0 +1,97 @@
+# backend/app/tests/services/test_host_rate_limiter.py
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+from app.services.feed_parser import (
+    HostDeferredError,
+    HostRateLimiter,
+    retry_after_seconds,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestHostRateLimiter:
+    def test_allows_burst_then_spaces_requests(self):
+        clock = FakeClock()
+        limiter = HostRateLimiter(rate=2.0, burst=3, clock=clock)
+        url = "http://busy.example.com/feed"
+
+        waits = [limiter.reserve(url) for _ in range(5)]
+
+        assert waits == [0.0, 0.0, 0.0, 0.5, 1.0]
+
+    def test_hosts_are_independent(self):
+        limiter = HostRateLimiter(rate=1.0, burst=1, clock=FakeClock())
+
+        assert limiter.reserve("http://a.example.com/1") == 0.0
+        assert limiter.reserve("http://b.example.com/1") == 0.0
+        assert limiter.reserve("http://a.example.com/2") == 1.0
+
+    def test_tokens_refill_over_time(self):
+        clock = FakeClock()
+        limiter = HostRateLimiter(rate=1.0, burst=2, clock=clock)
+        url = "http://refill.example.com/feed"
+        limiter.reserve(url)
+        limiter.reserve(url)
+
+        clock.now += 10
+
+        assert limiter.reserve(url) == 0.0
+        assert limiter.reserve(url) == 0.0
+
+    def test_throttled_response_defers_the_host(self):
+        clock = FakeClock()
+        limiter = HostRateLimiter(rate=10.0, burst=5, clock=clock)
+        url = "http://throttled.example.com/feed"
+
+        limiter.observe(url, httpx.Response(429, headers={"Retry-After": "120"}))
+
+        assert limiter.blocked_for(url) == 120.0
+        assert limiter.reserve(url) == 120.0
+        assert limiter.reserve("http://other.example.com/feed") == 0.0
+
+    def test_wait_fails_fast_for_a_deferred_host(self):
+        limiter = HostRateLimiter(rate=10.0, burst=5, clock=FakeClock())
+        url = "http://throttled.example.com/feed"
+        limiter.defer(url, 3600)
+
+        with pytest.raises(HostDeferredError) as raised:
+            limiter.wait(url)
+        assert raised.value.retry_after == 3600.0
+
+    def test_successful_response_does_not_defer(self):
+        limiter = HostRateLimiter(rate=10.0, burst=5, clock=FakeClock())
+        url = "http://fine.example.com/feed"
+
+        limiter.observe(url, httpx.Response(200))
+
+        assert limiter.blocked_for(url) == 0.0
+
+
+class TestRetryAfter:
+    def test_seconds(self):
+        response = httpx.Response(503, headers={"Retry-After": "30"})
+        assert retry_after_seconds(response) == 30.0
+
+    def test_http_date(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+        response = httpx.Response(
+            429, headers={"Retry-After": format_datetime(retry_at, usegmt=True)}
+        )
+        assert 290 <= retry_after_seconds(response) <= 300
+
+    def test_missing_or_invalid_uses_default_and_is_capped(self):
+        assert retry_after_seconds(httpx.Response(429)) == 60
+        invalid = httpx.Response(429, headers={"Retry-After": "soon"})
+        assert retry_after_seconds(invalid) == 60
+        huge = httpx.Response(429, headers={"Retry-After": "999999"})
+        assert retry_after_seconds(huge) == 3600
@@ -0,0 +1,130 @@
+# backend/app/tests/services/test_http_client.py
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+from app.services import http_client
+
+
+class TestSharedClient:
+    def test_client_is_shared_until_shutdown(self):
+        http_client.shutdown()
+        first = http_client.get_client()
+        assert http_client.get_client() is first
+
+        http_client.shutdown()
+        assert first.is_closed
+        assert http_client.get_client() is not first
+        http_client.shutdown()
+
+    def test_http2_falls_back_without_h2(self):
+        with patch.dict("sys.modules", {"h2": None}):
+            assert http_client.http2_enabled() is False
+
+    def test_host_key_ignores_path_and_case(self):
+        assert http_client.host_key("https://Feeds.Example.com/a.xml") == (
+            http_client.host_key("https://feeds.example.com/b.xml")
+        )
+        assert http_client.host_key("https://example.com/") != (
+            http_client.host_key("http://example.com/")
+        )
+
+
+class TestRedirects:
+    RSS = "<rss><channel><title>Moved</title></channel></rss>"
+
+    def _handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.scheme == "http":
+            return httpx.Response(
+                301, headers={"Location": str(request.url.copy_with(scheme="https"))}
+            )
+        if request.url.path == "/loop":
+            return httpx.Response(302, headers={"Location": "/loop"})
+        return httpx.Response(200, text=self.RSS)
+
+    def test_follows_moved_feed(self):
+        client = http_client.create_client(transport=httpx.MockTransport(self._handler))
+        with patch.object(http_client, "get_client", return_value=client):
+            with http_client.stream("http://moved.example.com/rss") as response:
+                response.read()
+        assert response.status_code == 200
+        assert str(response.url) == "https://moved.example.com/rss"
+        assert response.text == self.RSS
+
+    def test_redirect_loops_are_bounded(self):
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.url.path)
+            return self._handler(request)
+
+        client = http_client.create_async_client(transport=httpx.MockTransport(handler))
+
+        async def fetch():
+            try:
+                return await client.get("https://loop.example.com/loop")
+            finally:
+                await client.aclose()
+
+        with pytest.raises(httpx.TooManyRedirects):
+            asyncio.run(fetch())
+        assert len(seen) == http_client.MAX_REDIRECTS + 1
+
+
+class TestPerHostCaps:
+    def test_sync_requests_to_one_host_are_capped(self):
+        in_flight = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            with lock:
+                in_flight["now"] += 1
+                in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            time.sleep(0.02)
+            with lock:
+                in_flight["now"] -= 1
+            return httpx.Response(200)
+
+        client = http_client.create_client(transport=httpx.MockTransport(handler))
+        with (
+            patch.object(http_client, "get_client", return_value=client),
+            patch.object(http_client, "max_connections_per_host", return_value=2),
+            patch.dict(http_client._host_semaphores, clear=True),
+        ):
+            threads = [
+                threading.Thread(
+                    target=http_client.get, args=(f"http://capped.example.com/{i}",)
+                )
+                for i in range(6)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert in_flight["peak"] == 2
+
+    def test_async_limiter_caps_each_host_separately(self):
+        in_flight: dict[str, int] = {}
+        peaks: dict[str, int] = {}
+        limiter = http_client.AsyncHostLimiter(per_host=1)
+
+        async def fetch(url: str):
+            host = http_client.host_key(url)
+            async with limiter.slot(url):
+                in_flight[host] = in_flight.get(host, 0) + 1
+                peaks[host] = max(peaks.get(host, 0), in_flight[host])
+                await asyncio.sleep(0.01)
+                in_flight[host] -= 1
+
+        async def run():
+            await asyncio.gather(
+                *(fetch(f"http://a.example.com/{i}") for i in range(3)),
+                *(fetch(f"http://b.example.com/{i}") for i in range(3)),
+            )
+
+        asyncio.run(run())
+        assert peaks == {"http://a.example.com": 1, "http://b.example.com": 1}
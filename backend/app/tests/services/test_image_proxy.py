@@ -0,0 +1,84 @@
+# backend/app/tests/services/test_image_proxy.py
+import io
+import os
+from unittest.mock import patch
+
+import httpx
+import pytest
+from app.services import http_client, image_proxy
+from app.services.image_proxy import ImageProxyError, ThumbnailCache
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(out, "JPEG")
+    return out.getvalue()
+
+
+@pytest.fixture
+def origin():
+    """A mock image host; records requested paths"""
+    requests = []
+    images = {"/hero.jpg": _jpeg(2000, 1000)}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/page.html":
+            return httpx.Response(200, html="<html></html>")
+        if request.url.path in images:
+            return httpx.Response(
+                200,
+                content=images[request.url.path],
+                headers={"Content-Type": "image/jpeg"},
+            )
+        return httpx.Response(404)
+
+    client = http_client.create_client(transport=httpx.MockTransport(handler))
+    with patch.object(http_client, "get_client", return_value=client):
+        yield requests
+    client.close()
+
+
+def test_snap_width():
+    assert image_proxy.snap_width(1) == 160
+    assert image_proxy.snap_width(320) == 320
+    assert image_proxy.snap_width(321) == 640
+    assert image_proxy.snap_width(4000) == 1280
+
+
+def test_thumbnail_is_bounded_and_cached(tmp_path, origin):
+    cache = ThumbnailCache(directory=str(tmp_path))
+    data = cache.thumbnail("http://img.example.com/hero.jpg", 320)
+
+    with Image.open(io.BytesIO(data)) as thumbnail:
+        assert thumbnail.format == "WEBP"
+        assert thumbnail.size == (320, 160)
+    assert cache.thumbnail("http://img.example.com/hero.jpg", 320) == data
+    assert origin == ["/hero.jpg"]
+
+    # A new process finds the cached file on disk
+    key = image_proxy.cache_key("http://img.example.com/hero.jpg", 320)
+    assert ThumbnailCache(directory=str(tmp_path)).get(key) == data
+
+
+@pytest.mark.parametrize("path", ["/missing.jpg", "/page.html"])
+def test_thumbnail_of_non_image_fails(tmp_path, origin, path):
+    cache = ThumbnailCache(directory=str(tmp_path))
+    with pytest.raises(ImageProxyError):
+        cache.thumbnail(f"http://img.example.com{path}", 320)
+    assert cache.total_bytes == 0
+
+
+def test_least_recently_used_thumbnails_are_evicted(tmp_path):
+    cache = ThumbnailCache(directory=str(tmp_path), max_bytes=250)
+    cache.put("a" * 64, b"x" * 100)
+    cache.put("b" * 64, b"x" * 100)
+    cache.get("a" * 64)
+    cache.put("c" * 64, b"x" * 100)
+
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) is not None
+    assert cache.total_bytes == 200
+    assert not os.path.exists(cache._path("b" * 64))
@@ -0,0 +1,44 @@
+# backend/app/tests/services/test_opml.py
+import pytest
+from app.services.opml import OpmlFeed, parse_opml, write_opml
+
+
+def test_parse_opml_flattens_nested_folders_and_skips_other_urls():
+    opml = b"""<opml version="1.0"><body>
+      <outline title="Top">
+        <outline text="Sub">
+          <outline text="Deep" xmlurl="https://deep.example.com/feed"/>
+        </outline>
+        <outline text="Mail" xmlUrl="mailto:someone@example.com"/>
+      </outline>
+      <outline xmlUrl="http://untitled.example.com/rss" htmlUrl="javascript:x"/>
+    </body></opml>"""
+
+    assert parse_opml(opml) == [
+        OpmlFeed(url="https://deep.example.com/feed", title="Deep", folder="Top"),
+        OpmlFeed(url="http://untitled.example.com/rss"),
+    ]
+
+
+@pytest.mark.parametrize("document", [b"", b"<opml>", b"<rss><channel/></rss>"])
+def test_parse_opml_rejects_other_documents(document):
+    with pytest.raises(ValueError):
+        parse_opml(document)
+
+
+def test_write_opml_escapes_attributes():
+    rows = [
+        (None, 'Say "hi" <now>', "http://a.example.com/rss?x=1&y=2", None),
+        ("R&D", None, "http://b.example.com/rss", "http://b.example.com"),
+    ]
+    document = "".join(write_opml(rows)).encode()
+
+    assert parse_opml(document) == [
+        OpmlFeed(url="http://a.example.com/rss?x=1&y=2", title='Say "hi" <now>'),
+        OpmlFeed(
+            url="http://b.example.com/rss",
+            title="http://b.example.com/rss",
+            site_url="http://b.example.com",
+            folder="R&D",
+        ),
+    ]
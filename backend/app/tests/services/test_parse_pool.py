@@ -0,0 +1,113 @@
+# backend/app/tests/services/test_parse_pool.py
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import httpx
+from app.db.models import Article as ArticleModel
+from app.services.feed_entries import parse_articles
+from app.services.feed_stream import StreamedFeed
+from app.services.parse_pool import ParsePool
+from app.services.refresh_engine import RefreshEngine
+from sqlalchemy.orm import Session
+
+RSS_BODY = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel>
+<title>Pool Feed</title><link>http://pool.example.com</link>
+<item><title>First</title><link>http://pool.example.com/1</link>
+<guid>pool-1</guid><pubDate>Mon, 02 Jan 2023 10:00:00 GMT</pubDate>
+<description>&lt;img src="/1.jpg"&gt;</description></item>
+<item><title>Second</title><link>http://pool.example.com/2</link>
+<guid>pool-2</guid><pubDate>Tue, 03 Jan 2023 10:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+def _streamed(body: bytes) -> StreamedFeed:
+    streamed = StreamedFeed("http://pool.example.com/rss", parse=False)
+    streamed.add(body)
+    streamed.finish()
+    return streamed
+
+
+def _parse(pool: ParsePool, body: bytes):
+    async def run():
+        try:
+            return await pool.parse(7, _streamed(body))
+        finally:
+            pool.shutdown()
+
+    return asyncio.run(run())
+
+
+class TestParsePool:
+    def test_worker_results_match_in_process_parse(self):
+        pool = ParsePool(workers=2, min_body_bytes=0)
+        articles = _parse(pool, RSS_BODY)
+
+        expected = parse_articles(7, RSS_BODY)
+        assert [a.model_dump() for a in articles] == [a.model_dump() for a in expected]
+        assert articles[0].image_url == "http://pool.example.com/1.jpg"
+
+    def test_workers_are_not_forked_from_the_server(self):
+        pool = ParsePool(workers=1, min_body_bytes=0)
+        try:
+            executor = pool._get_executor()
+            assert executor._mp_context.get_start_method() in ("forkserver", "spawn")
+            articles = _parse(pool, RSS_BODY)
+        finally:
+            pool.shutdown()
+
+        assert [a.guid for a in articles] == ["pool-1", "pool-2"]
+
+    def test_small_bodies_and_disabled_pool_parse_in_process(self):
+        for pool in (ParsePool(workers=0), ParsePool(workers=2)):
+            with patch.object(pool, "_get_executor") as get_executor:
+                articles = _parse(pool, RSS_BODY)
+            get_executor.assert_not_called()
+            assert [a.guid for a in articles] == ["pool-1", "pool-2"]
+
+    def test_broken_pool_falls_back_to_in_process_parse(self):
+        pool = ParsePool(workers=1, min_body_bytes=0)
+
+        class BrokenExecutor:
+            def submit(self, *args, **kwargs):
+                raise BrokenProcessPool("worker died")
+
+            def shutdown(self, **kwargs):
+                pass
+
+        pool._executor = BrokenExecutor()
+        articles = _parse(pool, RSS_BODY)
+
+        assert [a.guid for a in articles] == ["pool-1", "pool-2"]
+        assert pool._executor is None
+
+    def test_refresh_engine_saves_articles_parsed_in_workers(
+        self, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://pool.example.com/rss")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=RSS_BODY)
+
+        engine = RefreshEngine(
+            transport=httpx.MockTransport(handler),
+            parse_pool=ParsePool(workers=1, min_body_bytes=0),
+        )
+
+        async def run():
+            try:
+                return await engine.refresh_feeds([feed], db_session)
+            finally:
+                await engine.aclose()
+
+        stats = asyncio.run(run())
+
+        assert stats.succeeded == 1
+        assert stats.new_articles == 2
+        saved = (
+            db_session.query(ArticleModel)
+            .filter(ArticleModel.feed_id == feed.id)
+            .count()
+        )
+        assert saved == 2
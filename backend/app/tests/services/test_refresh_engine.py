@@ -0,0 +1,290 @@
+# backend/app/tests/services/test_refresh_engine.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import httpx
+from app.db import crud
+from app.db.models import Article as ArticleModel
+from app.services import feed_stream
+from app.services.feed_parser import HostRateLimiter
+from app.services.parse_pool import ParsePool
+from app.services.refresh_engine import RefreshEngine
+from sqlalchemy.orm import Session
+
+RSS_BODY = """<?xml version="1.0"?>
+<rss version="2.0"><channel>
+<title>Engine Feed</title><link>http://engine.example.com</link>
+<item><title>First</title><link>http://engine.example.com/1</link>
+<guid>engine-1</guid><pubDate>Mon, 02 Jan 2023 10:00:00 GMT</pubDate></item>
+<item><title>Second</title><link>http://engine.example.com/2</link>
+<guid>engine-2</guid><pubDate>Tue, 03 Jan 2023 10:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+class TestRefreshEngine:
+    def test_refresh_feeds_saves_articles_and_counts_failures(
+        self, db_session: Session, feed_factory
+    ):
+        good_feed = feed_factory(feed_url="http://good.example.com/rss")
+        bad_feed = feed_factory(feed_url="http://bad.example.com/rss")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "bad.example.com":
+                return httpx.Response(500)
+            return httpx.Response(200, text=RSS_BODY)
+
+        engine = RefreshEngine(concurrency=4, transport=httpx.MockTransport(handler))
+
+        async def run():
+            try:
+                return await engine.refresh_feeds([good_feed, bad_feed], db_session)
+            finally:
+                await engine.aclose()
+
+        stats = asyncio.run(run())
+
+        assert stats.feeds == 2
+        assert stats.succeeded == 1
+        assert stats.failed == 1
+        assert stats.new_articles == 2
+        assert stats.feeds_per_second > 0
+        assert engine.last_cycle is stats
+        saved = (
+            db_session.query(ArticleModel)
+            .filter(ArticleModel.feed_id == good_feed.id)
+            .count()
+        )
+        assert saved == 2
+        assert bad_feed.consecutive_failures == 1
+        assert bad_feed.next_retry_at is not None
+        assert good_feed.consecutive_failures == 0
+
+    def test_refresh_follows_moved_feed(self, db_session: Session, feed_factory):
+        feed = feed_factory(feed_url="http://moved.example.com/rss")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.scheme == "http":
+                return httpx.Response(
+                    301, headers={"Location": "https://moved.example.com/feed.xml"}
+                )
+            return httpx.Response(200, text=RSS_BODY)
+
+        engine = RefreshEngine(transport=httpx.MockTransport(handler))
+
+        async def run():
+            try:
+                return await engine.refresh_feeds([feed], db_session)
+            finally:
+                await engine.aclose()
+
+        stats = asyncio.run(run())
+
+        assert stats.succeeded == 1
+        assert stats.new_articles == 2
+        assert feed.consecutive_failures == 0
+
+    def test_throttled_host_is_deferred(self, db_session: Session, feed_factory):
+        feed = feed_factory(feed_url="http://throttled.example.com/rss")
+        limiter = HostRateLimiter(rate=100.0, burst=10)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(429, headers={"Retry-After": "120"})
+
+        engine = RefreshEngine(
+            transport=httpx.MockTransport(handler), rate_limiter=limiter
+        )
+
+        async def run():
+            try:
+                return await engine.refresh_feeds([feed], db_session)
+            finally:
+                await engine.aclose()
+
+        stats = asyncio.run(run())
+
+        assert stats.failed == 1
+        assert feed.consecutive_failures == 1
+        assert 119 <= limiter.blocked_for(feed.url) <= 120
+
+    def test_deferred_host_is_skipped_without_waiting(
+        self, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://paused.example.com/rss")
+        limiter = HostRateLimiter(rate=100.0, burst=10)
+        limiter.defer(feed.url, 3600)
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, text=RSS_BODY)
+
+        engine = RefreshEngine(
+            transport=httpx.MockTransport(handler), rate_limiter=limiter
+        )
+
+        async def run():
+            try:
+                return await engine.refresh_feeds([feed], db_session, force=True)
+            finally:
+                await engine.aclose()
+
+        stats = asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+        assert stats.deferred == 1
+        assert stats.failed == 0
+        assert "slow down" in stats.errors[feed.id]
+        assert requests == []
+        # Not a failure, but the scheduler leaves the feed alone until then
+        assert feed.consecutive_failures == 0
+        retry_in = feed.next_retry_at.replace(tzinfo=timezone.utc) - datetime.now(
+            timezone.utc
+        )
+        assert timedelta(minutes=59) < retry_in <= timedelta(hours=1)
+
+    def test_refresh_feeds_skips_feeds_backing_off(
+        self, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://backoff.example.com/rss")
+        feed.consecutive_failures = 1
+        feed.next_retry_at = datetime.now(timezone.utc) + timedelta(hours=1)
+        db_session.commit()
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, text=RSS_BODY)
+
+        engine = RefreshEngine(transport=httpx.MockTransport(handler))
+
+        async def run():
+            try:
+                return await engine.refresh_feeds([feed], db_session)
+            finally:
+                await engine.aclose()
+
+        stats = asyncio.run(run())
+
+        assert stats.skipped == 1
+        assert requests == []
+
+    def test_refresh_feeds_respects_concurrency_limit(
+        self, db_session: Session, feed_factory
+    ):
+        feeds = [
+            feed_factory(feed_url=f"http://slow{i}.example.com/rss") for i in range(6)
+        ]
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, text=RSS_BODY)
+
+        engine = RefreshEngine(concurrency=2, transport=httpx.MockTransport(handler))
+
+        async def run():
+            try:
+                return await engine.refresh_feeds(feeds, db_session)
+            finally:
+                await engine.aclose()
+
+        stats = asyncio.run(run())
+
+        assert stats.succeeded == 6
+        assert peak == 2
+
+    def test_refresh_feeds_sends_conditional_headers(
+        self, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://etag.example.com/rss")
+        seen_headers = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(dict(request.headers))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                text=RSS_BODY,
+                headers={"ETag": '"v1"', "Last-Modified": "Tue, 03 Jan 2023"},
+            )
+
+        engine = RefreshEngine(transport=httpx.MockTransport(handler))
+
+        async def run():
+            try:
+                first = await engine.refresh_feeds([feed], db_session)
+                second = await engine.refresh_feeds([feed], db_session)
+                return first, second
+            finally:
+                await engine.aclose()
+
+        first, second = asyncio.run(run())
+
+        assert first.new_articles == 2
+        assert first.unchanged == 0
+        assert second.unchanged == 1
+        assert second.new_articles == 0
+        assert seen_headers[1]["if-none-match"] == '"v1"'
+        assert seen_headers[1]["if-modified-since"] == "Tue, 03 Jan 2023"
+        assert feed.content_hash is not None
+
+    def test_refresh_feeds_skips_identical_body(
+        self, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://nohash.example.com/rss")
+        engine = RefreshEngine(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, text=RSS_BODY)
+            )
+        )
+
+        async def run():
+            try:
+                await engine.refresh_feeds([feed], db_session)
+                return await engine.refresh_feeds([feed], db_session)
+            finally:
+                await engine.aclose()
+
+        with patch.object(
+            crud, "bulk_create_articles", wraps=crud.bulk_create_articles
+        ) as save:
+            stats = asyncio.run(run())
+
+        assert stats.unchanged == 1
+        assert save.call_count == 1
+
+    def test_identical_body_is_not_parsed_without_parse_pool(
+        self, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://inprocess.example.com/rss")
+        engine = RefreshEngine(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, text=RSS_BODY)
+            ),
+            parse_pool=ParsePool(workers=0),
+        )
+
+        async def run():
+            try:
+                return [
+                    await engine.refresh_feeds([feed], db_session) for _ in range(2)
+                ]
+            finally:
+                await engine.aclose()
+
+        with patch.object(
+            feed_stream, "_pull_parser", wraps=feed_stream._pull_parser
+        ) as xml_parse:
+            first, second = asyncio.run(run())
+            # The first download has no stored hash and parses as it streams
+            assert first.new_articles == 2
+            assert xml_parse.call_count == 1
+
+        assert second.unchanged == 1
+        assert xml_parse.call_count == 1
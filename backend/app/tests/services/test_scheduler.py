@@ -0,0 +1,98 @@
+# backend/app/tests/services/test_scheduler.py
+from datetime import datetime, timedelta, timezone
+
+from app.db import crud
+from app.db.models import Article as ArticleModel
+from app.services.scheduler import FeedScheduler, estimate_refresh_interval
+from sqlalchemy.orm import Session
+
+NOW = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+MIN_INTERVAL = 5 * 60
+MAX_INTERVAL = 24 * 60 * 60
+DEFAULT_INTERVAL = 60 * 60
+
+
+def _every(gap: timedelta, count: int, last: datetime = NOW) -> list[datetime]:
+    return [last - gap * i for i in range(count)]
+
+
+class TestEstimateRefreshInterval:
+    def _estimate(self, times):
+        return estimate_refresh_interval(
+            times, DEFAULT_INTERVAL, MIN_INTERVAL, MAX_INTERVAL, now=NOW
+        )
+
+    def test_busy_feed_is_polled_often(self):
+        assert self._estimate(_every(timedelta(minutes=30), 10)) == 15 * 60
+
+    def test_interval_is_clamped_to_bounds(self):
+        assert self._estimate(_every(timedelta(minutes=1), 10)) == MIN_INTERVAL
+        assert self._estimate(_every(timedelta(days=7), 10)) == MAX_INTERVAL
+
+    def test_feed_without_history_uses_default(self):
+        assert self._estimate([]) == DEFAULT_INTERVAL
+        assert self._estimate([NOW]) == DEFAULT_INTERVAL
+
+    def test_dormant_feed_backs_off(self):
+        burst = _every(timedelta(minutes=10), 10, last=NOW - timedelta(hours=10))
+        assert self._estimate(burst) == 5 * 60 * 60
+
+    def test_naive_timestamps_are_treated_as_utc(self):
+        naive = [t.replace(tzinfo=None) for t in _every(timedelta(hours=2), 5)]
+        assert self._estimate(naive) == 60 * 60
+
+
+class TestFeedScheduler:
+    def test_pop_due_returns_due_feeds_in_order(self):
+        scheduler = FeedScheduler(MIN_INTERVAL, MAX_INTERVAL)
+        scheduler.schedule(1, 300)
+        scheduler.schedule(2, 100)
+        scheduler.schedule(3, 900)
+
+        assert scheduler.pop_due(500) == [2, 1]
+        assert scheduler.seconds_until_next_due(500) == 400
+        assert len(scheduler) == 1
+
+    def test_rescheduled_and_removed_feeds_skip_stale_entries(self):
+        scheduler = FeedScheduler(MIN_INTERVAL, MAX_INTERVAL)
+        scheduler.sync([1, 2], now=0)
+        scheduler.schedule(1, 1000)
+        scheduler.sync([1], now=0)
+
+        assert scheduler.pop_due(10) == []
+        assert scheduler.next_due(1) == 1000
+        assert scheduler.pop_due(1000) == [1]
+        assert scheduler.seconds_until_next_due(1000) is None
+
+    def test_reschedule_uses_publishing_cadence(self):
+        scheduler = FeedScheduler(MIN_INTERVAL, MAX_INTERVAL)
+        now = NOW.timestamp()
+        interval = scheduler.reschedule(
+            7, _every(timedelta(hours=1), 6), DEFAULT_INTERVAL, now
+        )
+
+        assert interval == 30 * 60
+        assert scheduler.next_due(7) == now + interval
+
+
+def test_get_recent_publication_times(db_session: Session, feed_factory):
+    busy = feed_factory(feed_url="http://busy.example.com/rss")
+    quiet = feed_factory(feed_url="http://quiet.example.com/rss")
+    for i in range(5):
+        db_session.add(
+            ArticleModel(
+                feed_id=busy.id,
+                title=f"Busy {i}",
+                link=f"http://busy.example.com/{i}",
+                guid=f"busy-{i}",
+                published_at=NOW - timedelta(hours=i),
+            )
+        )
+    db_session.commit()
+
+    times = crud.get_recent_publication_times(
+        db_session, [busy.id, quiet.id], per_feed=3
+    )
+
+    assert len(times[busy.id]) == 3
+    assert times[quiet.id] == []
@@ -0,0 +1,114 @@
+# backend/app/tests/services/test_seen_entries.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import httpx
+from app.db import crud
+from app.schemas.article import ArticleCreate
+from app.services.feed_stream import IncrementalFeedParser
+from app.services.refresh_engine import RefreshEngine
+from app.services.seen_entries import SeenEntries, seen_entries
+from sqlalchemy.orm import Session
+
+
+def _item(n: int) -> str:
+    return (
+        f"<item><title>Item {n}</title><link>http://seen.example.com/{n}</link>"
+        f"<guid>seen-{n}</guid><pubDate>Mon, 02 Jan 2023 10:{n:02d}:00 GMT</pubDate>"
+        "</item>"
+    )
+
+
+def _rss(*numbers: int) -> str:
+    items = "".join(_item(n) for n in numbers)
+    return f'<rss version="2.0"><channel><title>Seen</title>{items}</channel></rss>'
+
+
+def _article(n: int, published_at=None) -> ArticleCreate:
+    return ArticleCreate(
+        title=f"Item {n}",
+        link=f"http://seen.example.com/{n}",
+        guid=f"seen-{n}",
+        published_at=published_at or datetime(2023, 1, 2, tzinfo=timezone.utc),
+    )
+
+
+class TestSeenEntries:
+    def test_warm_starts_from_stored_articles(self, db_session: Session, feed_factory):
+        feed = feed_factory()
+        crud.bulk_create_articles(db_session, feed.id, [_article(1), _article(2)])
+
+        keys = SeenEntries().get(db_session, feed.id)
+
+        assert keys == {
+            "seen-1",
+            "seen-2",
+            "http://seen.example.com/1",
+            "http://seen.example.com/2",
+        }
+
+    def test_remember_trims_oldest_keys_and_evicts_feeds(
+        self, db_session: Session, feed_factory
+    ):
+        cache = SeenEntries(max_feeds=1, keys_per_feed=4)
+        first = feed_factory(feed_url="http://seen.example.com/a")
+        second = feed_factory(feed_url="http://seen.example.com/b")
+        cache.get(db_session, first.id)
+        cache.remember(first.id, [_article(1), _article(2), _article(3)])
+
+        assert cache.get(db_session, first.id) == {
+            "seen-2",
+            "seen-3",
+            "http://seen.example.com/2",
+            "http://seen.example.com/3",
+        }
+
+        cache.get(db_session, second.id)
+        cache.remember(first.id, [_article(4)])  # Evicted; reloaded from the db
+        assert "seen-4" not in cache.get(db_session, first.id)
+
+    def test_parser_skips_seen_entries_without_building_them(self):
+        parser = IncrementalFeedParser(seen={"seen-1", "http://seen.example.com/2"})
+        entries = parser.feed(_rss(1, 2, 3).encode()) + parser.close()
+
+        assert [entry.id for entry in entries] == ["seen-3"]
+        assert parser.skipped == 2
+
+    def test_refresh_only_processes_new_entries(
+        self, db_session: Session, feed_factory
+    ):
+        feed = feed_factory(feed_url="http://seen.example.com/rss")
+        bodies = iter([_rss(1, 2, 3), _rss(1, 2, 3, 4)])
+        engine = RefreshEngine(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, text=next(bodies))
+            )
+        )
+
+        async def run():
+            try:
+                first = await engine.refresh_feeds([feed], db_session)
+                with patch(
+                    "app.services.feed_entries.extract_image_url", return_value=None
+                ) as extract:
+                    second = await engine.refresh_feeds([feed], db_session)
+                return first, second, extract.call_count
+            finally:
+                await engine.aclose()
+
+        first, second, extracted = asyncio.run(run())
+
+        assert first.new_articles == 3
+        assert second.new_articles == 1
+        assert extracted == 1
+
+    def test_cleanup_forgets_deleted_entries(self, db_session: Session, feed_factory):
+        feed = feed_factory()
+        old = datetime.now(timezone.utc) - timedelta(days=60)
+        crud.bulk_create_articles(db_session, feed.id, [_article(1, old), _article(2)])
+        assert "seen-1" in seen_entries.get(db_session, feed.id)
+
+        crud.delete_old_articles(db_session, days_older_than=28)
+
+        assert "seen-1" not in seen_entries.get(db_session, feed.id)
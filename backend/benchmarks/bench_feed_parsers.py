@@ -0,0 +1,73 @@
+# Compare feedparser with the fast incremental parser on a synthetic feed.
+#
+# Run from backend/:  python -m benchmarks.bench_feed_parsers [items] [rounds]
+import sys
+import time
+
+import feedparser
+from app.services.feed_stream import IncrementalFeedParser, lxml_etree
+
+ITEM = """<item>
+<title>Article {n}: a reasonably long headline about something</title>
+<link>https://bench.example.com/posts/{n}</link>
+<guid isPermaLink="false">bench-{n}</guid>
+<pubDate>Mon, 02 Jan 2023 10:{minute:02d}:00 GMT</pubDate>
+<description>&lt;p&gt;Summary paragraph {n} with &lt;a href="/x"&gt;a link&lt;/a&gt;.&lt;/p&gt;</description>
+<content:encoded><![CDATA[<p>Body of article {n}.</p><img src="https://bench.example.com/{n}.jpg">]]></content:encoded>
+<media:thumbnail url="https://bench.example.com/{n}-thumb.jpg"/>
+</item>
+"""
+
+
+def build_feed(items: int) -> bytes:
+    body = "".join(ITEM.format(n=n, minute=n % 60) for n in range(items))
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"'
+        ' xmlns:media="http://search.yahoo.com/mrss/">\n'
+        "<channel><title>Bench</title><link>https://bench.example.com/</link>\n"
+        f"{body}</channel></rss>"
+    ).encode()
+
+
+def parse_with_feedparser(body: bytes) -> int:
+    return len(feedparser.parse(body).entries)
+
+
+def parse_with_fast_parser(body: bytes) -> int:
+    parser = IncrementalFeedParser()
+    # Feed 64 KiB chunks, as a streamed download would
+    entries = 0
+    for start in range(0, len(body), 65536):
+        entries += len(parser.feed(body[start : start + 65536]))
+    entries += len(parser.close())
+    assert not parser.failed
+    return entries
+
+
+def measure(parse, body: bytes, rounds: int) -> float:
+    """Best entries/second over ``rounds`` runs"""
+    best = float("inf")
+    entries = 0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        entries = parse(body)
+        best = min(best, time.perf_counter() - started)
+    return entries / best
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    body = build_feed(items)
+    backend = "lxml" if lxml_etree is not None else "ElementTree"
+    print(f"{items} items, {len(body) / 1024:.0f} KiB, best of {rounds}")
+
+    slow = measure(parse_with_feedparser, body, rounds)
+    fast = measure(parse_with_fast_parser, body, rounds)
+    print(f"feedparser        {slow:10.0f} entries/s")
+    print(f"fast ({backend:11}) {fast:10.0f} entries/s  ({fast / slow:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
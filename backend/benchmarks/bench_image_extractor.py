@@ -0,0 +1,71 @@
+# Time extract_image_url over a mix of realistic entry shapes.
+#
+# Run from backend/:  python -m benchmarks.bench_image_extractor [copies] [rounds]
+import sys
+import time
+from pathlib import Path
+
+import feedparser
+from app.services.feed_entries import extract_image_url
+
+CORPUS = Path(__file__).resolve().parent.parent / "app/tests/services/feed_corpus"
+
+PARAGRAPH = (
+    "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8 + "</p>"
+)
+
+# Each item takes a different path through the extractor
+ITEMS = [
+    # Image in the body after a tracking pixel, an icon and a few paragraphs
+    """<item><title>Body image</title><link>https://ex.com/1</link>
+<content:encoded><![CDATA[{p}<img src="data:image/gif;base64,R0lGOD" width="1">
+<img class="x" src="/icons/share.png">{p}<img alt="hero" src="/img/hero.jpg">{p}]]>
+</content:encoded></item>""",
+    # Only an og:image meta tag, deep in a long body
+    """<item><title>Meta image</title><link>https://ex.com/2</link>
+<description><![CDATA[{p}{p}{p}<meta property="og:image" content="/og.jpg">]]>
+</description></item>""",
+    # Thumbnail, the common case for news feeds
+    """<item><title>Thumb</title><link>https://ex.com/3</link>
+<description><![CDATA[{p}]]></description>
+<media:thumbnail url="https://ex.com/thumb.jpg"/></item>""",
+    # Image enclosure
+    """<item><title>Enclosure</title><link>https://ex.com/4</link>
+<enclosure url="https://ex.com/e.jpg" type="image/jpeg" length="1"/>
+<description><![CDATA[{p}]]></description></item>""",
+    # Text only: every method is tried and fails
+    """<item><title>No image</title><link>https://ex.com/5</link>
+<description><![CDATA[{p}{p}{p}{p}]]></description></item>""",
+]
+
+
+def build_entries(copies: int) -> list:
+    items = "".join(item.format(p=PARAGRAPH) for item in ITEMS)
+    body = (
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"'
+        ' xmlns:media="http://search.yahoo.com/mrss/"><channel><title>Bench</title>'
+        f"<link>https://ex.com/</link>{items}</channel></rss>"
+    )
+    entries = list(feedparser.parse(body).entries)
+    for path in sorted(CORPUS.glob("*.xml")):
+        entries.extend(feedparser.parse(path.read_bytes()).entries)
+    return entries * copies
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    entries = build_entries(copies)
+
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for entry in entries:
+            extract_image_url(entry, "https://ex.com")
+        best = min(best, time.perf_counter() - started)
+    print(f"{len(entries)} entries, best of {rounds}")
+    print(f"extract_image_url {len(entries) / best:10.0f} entries/s")
+
+
+if __name__ == "__main__":
+    main()
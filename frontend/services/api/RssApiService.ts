@@ -2,6 +2,7 @@ import { BaseApiService } from "./BaseApiService";
 import type {
   Feed,
   Article,
+  ArticlePage,
   Folder,
   AppSettings,
   SettingsUpdate,
@@ -12,10 +13,13 @@ import type {
  * Provides RSS-specific API methods with consistent error handling and data transformation
  */
 class RssApiService extends BaseApiService {
+  private apiOrigin: string;
+
   constructor() {
     const apiUrl = import.meta.env.VITE_API_URL;
     console.log(`🔧 RssApiService initialized with API URL: ${apiUrl}`);
     super(apiUrl);
+    this.apiOrigin = new URL(apiUrl ?? "", window.location.href).origin;
   }
 
   /**
@@ -61,6 +65,17 @@ class RssApiService extends BaseApiService {
       delete transformed.image_url;
     }
 
+    // Cached feed icons come as server-relative API paths
+    if (
+      typeof transformed.favicon === "string" &&
+      transformed.favicon.startsWith("/")
+    ) {
+      transformed.favicon = new URL(
+        transformed.favicon,
+        this.apiOrigin
+      ).toString();
+    }
+
     // Convert published_at to pubDate for articles
     if (transformed.published_at !== undefined) {
       transformed.pubDate = transformed.published_at;
@@ -165,11 +180,39 @@ class RssApiService extends BaseApiService {
     return transformed;
   }
   /**
-   * Fetches articles for a specific feed
+   * Fetches one page of a feed's articles, newest first
+   */
+  async getArticlesPage(
+    feedId: string,
+    cursor?: string | null,
+    limit: number = 200
+  ): Promise<ArticlePage> {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (cursor) {
+      params.set("cursor", cursor);
+    }
+    // Use trailing slash to avoid 307 redirect
+    const data = await this.get<any>(
+      `/feeds/${feedId}/articles/?${params.toString()}`
+    );
+    return {
+      articles: this.transformResponse<Article[]>(data.items),
+      nextCursor: data.next_cursor ?? null,
+    };
+  }
+
+  /**
+   * Fetches all articles for a specific feed, following the page cursors
    */
   async getArticles(feedId: string): Promise<Article[]> {
-    const data = await this.get<any[]>(`/feeds/${feedId}/articles/`); // Use trailing slash to avoid 307 redirect
-    return this.transformResponse<Article[]>(data);
+    const articles: Article[] = [];
+    let cursor: string | null = null;
+    do {
+      const page = await this.getArticlesPage(feedId, cursor);
+      articles.push(...page.articles);
+      cursor = page.nextCursor;
+    } while (cursor);
+    return articles;
   }
 
   /**
@@ -1,5 +1,7 @@
 // API request/response types and settings
 
+import type { Article } from "./entities";
+
 export interface AppSettings {
   id: number;
   auto_cleanup_enabled: boolean;
@@ -26,6 +28,12 @@ export interface ApiError {
   code?: string;
 }
 
+// One page of a cursor-paginated article list
+export interface ArticlePage {
+  articles: Article[];
+  nextCursor: string | null; // Pass back as `cursor` for the next page
+}
+
 // Feed parsing response
 export interface FeedParseResponse {
   title: string;
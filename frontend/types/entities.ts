@@ -21,7 +21,7 @@ export interface Feed {
   description?: string;
   link?: string; // Link to the website
   lastFetched?: string; // ISO date string
-  favicon?: string; // URL to favicon
+  favicon?: string; // URL to favicon, usually the API's cached copy
   category?: string; // Optional category for organizing feeds
   folderId?: string | null; // ID of the folder this feed belongs to
 }
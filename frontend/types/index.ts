@@ -19,6 +19,7 @@ export type {
   SettingsUpdate,
   ApiResponse,
   ApiError,
+  ArticlePage,
   FeedParseResponse,
 } from "./api";
 